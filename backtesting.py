@@ -3,8 +3,9 @@
 7split_checklist_21 Plugin - Backtesting Module
 백테스팅 및 성능 검증 모듈
 """
+import json
 import traceback
-from datetime import datetime, timedelta
+from datetime import datetime
 import pandas as pd
 import numpy as np
 from .setup import P, F
@@ -13,12 +14,25 @@ from .model import StockScreeningResult
 from .logic_collector import DataCollector
 from .strategies import get_strategy
 from .logic_calculator import Calculator
+from .logic_store import get_price_store, get_index_store
+from .logic_calendar import get_calendar
+from .backtesting_ladder import simulate_ladders
+from .backtesting_metrics import compute_metrics, compute_relative_metrics
+from .backtesting_robustness import run_robustness
+from .backtesting_costs import CostModel
+from .backtesting_storage import encode_curve, decode_curve, encode_trades, decode_trades
 
 logger = P.logger
 
 
+class BacktestCancelled(Exception):
+    """백테스트 작업 취소"""
+
+
 class BacktestingEngine:
     """백테스팅 엔진 클래스"""
+
+    LADDER_CHUNK_DAYS = 250  # 래더 시뮬레이션 진행 보고 단위 (거래일)
     
     def __init__(self, dart_api_key=None):
         """
@@ -28,7 +42,52 @@ class BacktestingEngine:
         self.collector = DataCollector(dart_api_key=dart_api_key) if dart_api_key else None
         self.calculator = Calculator()
         
-    def run_backtest(self, strategy_id, start_date, end_date, initial_capital=100000000, rebalance_interval='monthly'):
+    # 전략 백테스트에서 조건을 평가하는 후보 종목 수 (성능을 위해 제한, 시가총액 상위 종목)
+    SCREENING_CANDIDATES = 30
+
+    def load_screening_inputs(self, strategy_id):
+        """
+        전략 백테스트의 후보 종목과 DB에서 읽는 입력을 미리 조회
+
+        공시 여부(공시 색인)와 최대주주 지분율(지분율 캐시)은 DB를 읽으므로, 작업을 제출하는 웹 프로세스에서
+        이 메서드로 확정해 run_backtest(screening_inputs=...)에 넘깁니다. 워커 프로세스는 DB에 접근하지 않습니다.
+
+        Returns:
+            dict: {'tickers': [...], 'disclosure': {종목코드: {...}}, 'major_shareholder': {종목코드: 지분율}}
+        """
+        inputs = {'tickers': [], 'disclosure': {}, 'major_shareholder': {}}
+        strategy = get_strategy(strategy_id)
+        if not strategy or not self.collector:
+            return inputs
+        inputs['tickers'] = self.screening_candidates()
+        for ticker in inputs['tickers']:
+            code = ticker['code']
+            inputs['disclosure'][code] = self.collector.get_disclosure_info(code, strategy.required_data)
+            inputs['major_shareholder'][code] = self.collector.get_major_shareholder(code, strategy.required_data)
+        return inputs
+
+    def screening_candidates(self):
+        """
+        시가총액 상위 SCREENING_CANDIDATES개 종목
+
+        종목 목록의 순서(종목 마스터는 코드 순)에 기대지 않도록 시세 스냅샷의 시가총액으로 명시적으로 고릅니다.
+        스냅샷을 받지 못하면 종목 목록 순서대로 앞에서부터 고릅니다.
+        """
+        tickers = self.collector.get_all_tickers()
+        snapshot = self.collector.market_snapshot()
+        if snapshot:
+            listed = [ticker for ticker in tickers if ticker['code'] in snapshot]
+            if listed:
+                tickers = sorted(listed, key=lambda ticker: snapshot[ticker['code']].get('market_cap') or 0, reverse=True)
+            else:
+                logger.warning("시세 스냅샷에 종목 목록의 종목이 없어 목록 순서대로 후보를 고릅니다.")
+        else:
+            logger.warning("시세 스냅샷을 받지 못해 종목 목록 순서대로 후보를 고릅니다.")
+        return tickers[:self.SCREENING_CANDIDATES]
+
+    def run_backtest(self, strategy_id, start_date, end_date, initial_capital=100000000, rebalance_interval='monthly',
+                     progress_callback=None, cancel_check=None, seed=None, resume_state=None, benchmark=None,
+                     cost_model=None, screening_inputs=None):
         """
         백테스트 실행
         
@@ -37,10 +96,18 @@ class BacktestingEngine:
             start_date (str): 시작 날짜 (YYYY-MM-DD)
             end_date (str): 종료 날짜 (YYYY-MM-DD)
             initial_capital (int): 초기 자본
-            rebalance_interval (str): 리밸런싱 주기 ('daily', 'weekly', 'monthly', 'quarterly')
+            rebalance_interval (str): 리밸런싱 주기 ('daily', 'weekly', 'monthly', 'quarterly',
+                                      '_last' 접미사로 구간 마지막 거래일 지정 가능. 예: 'monthly_last')
+            progress_callback (callable): progress_callback(done, total, message) 진행 상황 보고
+            cancel_check (callable): True를 반환하면 다음 리밸런싱 시점에서 중단
+            seed (int): 시뮬레이션 난수 시드
+            resume_state (dict): 이전 실행의 engine_state. 주어지면 그 시점 이후 구간만 시뮬레이션
+            benchmark (str): 비교 지수 ('KOSPI', 'KOSDAQ', 'KRX300' 또는 그 지수 코드)
+            cost_model (str | dict): 거래 비용 모델 프리셋 이름 또는 CostModel 파라미터 (None이면 비용 없음)
+            screening_inputs (dict): load_screening_inputs 결과 (None이면 여기서 조회 - DB 접근이 필요하므로 앱 컨텍스트 안에서만)
         
         Returns:
-            dict: 백테스트 결과
+            dict: 백테스트 결과 (results['engine_state']에 이어서 실행할 수 있는 최종 상태 포함)
         """
         logger.info(f"Starting backtest: strategy={strategy_id}, period={start_date} to {end_date}")
         
@@ -77,54 +144,49 @@ class BacktestingEngine:
             portfolio_value = initial_capital
             cash = initial_capital  # 현금 보유액
             current_holdings = {}  # 현재 보유 주식 {'code': {'quantity': int, 'avg_price': float, 'name': str}}
+            rng = np.random.default_rng(seed)
+            costs = CostModel.from_config(cost_model)
+            cost_summary = {'commission': 0.0, 'tax': 0.0, 'slippage': 0.0}
+            results['cost_model'] = costs.to_dict()
+            last_date_str = None
+            
+            # 이전 실행 상태에서 이어서 실행
+            if resume_state:
+                cash = resume_state['cash']
+                current_holdings = {code: dict(h) for code, h in resume_state['holdings'].items()}
+                rng.bit_generator.state = resume_state['rng_state']
+                cost_summary.update(resume_state.get('cost_summary', {}))
+                last_date_str = resume_state['as_of']
             
             # 실제 백테스트처럼 과거 데이터를 시뮬레이션하기 위해
             # 현재 시점의 종목들로 시작하고 수익률을 시뮬레이션
             logger.info("Starting backtest simulation...")
             
-            # 거래일 기준으로 시뮬레이션 (간단화 버전)
-            current_date = start_dt
-            day_count = 0  # 거래일 카운터
-            
-            # 임시로 252거래일(1년) 단위로 리밸런싱 시뮬레이션
-            rebalance_points = []
-            temp_date = start_dt
-            while temp_date <= end_dt:
-                rebalance_points.append(temp_date.strftime('%Y-%m-%d'))
-                # 다음 리밸런싱 날짜 계산 - 매월 첫 거래일로 가정
-                if rebalance_interval == 'monthly':
-                    if temp_date.month == 12:
-                        temp_date = temp_date.replace(year=temp_date.year + 1, month=1)
-                    else:
-                        temp_date = temp_date.replace(month=temp_date.month + 1)
-                elif rebalance_interval == 'weekly':
-                    temp_date += timedelta(days=7)
-                elif rebalance_interval == 'daily':
-                    temp_date += timedelta(days=1)
-                elif rebalance_interval == 'quarterly':
-                    # 분기별 (3개월마다)
-                    for _ in range(3):
-                        if temp_date.month == 12:
-                            temp_date = temp_date.replace(year=temp_date.year + 1, month=1)
-                        else:
-                            temp_date = temp_date.replace(month=temp_date.month + 1)
-                
-                # 범위를 벗어나면 종료
-                if temp_date > end_dt:
-                    break
+            # 거래일 캘린더 기준 리밸런싱 일정 (주말/휴장일 제외)
+            day_count = 0  # 리밸런싱 카운터
+            rebalance_days = get_calendar().schedule(start_date, end_date, rebalance_interval)
+            if last_date_str:
+                # 일정은 전체 구간 기준으로 만든 뒤 이어서 실행할 부분만 사용 (구간 첫/마지막 거래일 기준 유지)
+                rebalance_days = rebalance_days[rebalance_days > np.datetime64(last_date_str, 'D')]
+            rebalance_points = list(np.datetime_as_string(rebalance_days, unit='D'))
+            if screening_inputs is None:
+                screening_inputs = self.load_screening_inputs(strategy_id)
             
             # 리밸런싱 포인트별 시뮬레이션
             for rebalance_date in rebalance_points:
+                if cancel_check and cancel_check():
+                    raise BacktestCancelled()
+                
                 # 현재 리밸런싱 날짜로 설정
                 current_date_str = rebalance_date
                 
                 # 현재 시점의 종목 데이터 가져오기 (실제 백테스트에서는 과거 데이터를 가져와야 하지만 
-                # pykrx 제약으로 현재 데이터 사용)
-                tickers = self.collector.get_all_tickers() if self.collector else []
+                # pykrx 제약으로 현재 데이터 사용 - 후보 종목은 load_screening_inputs에서 확정)
+                tickers = screening_inputs['tickers']
                 
                 # 전략 필터 적용 - 현재 시점 기준으로만 적용 (제한된 백테스트 방식)
                 passed_stocks = []
-                for i, ticker in enumerate(tickers[:30]):  # 상위 30개만 사용하여 성능 향상
+                for i, ticker in enumerate(tickers):
                     if len(passed_stocks) >= 10:  # 최대 10개로 제한
                         break
                         
@@ -135,8 +197,8 @@ class BacktestingEngine:
                         # 현재 시점의 데이터 수집
                         market_data = self.collector.get_market_data(code, strategy.required_data) if self.collector else {}
                         financial_data = self.collector.get_financial_data(code, strategy.required_data) if self.collector else {}
-                        disclosure_info = self.collector.get_disclosure_info(code, strategy.required_data) if self.collector else {}
-                        major_shareholder = self.collector.get_major_shareholder(code, strategy.required_data) if self.collector else 0
+                        disclosure_info = screening_inputs['disclosure'].get(code) or {}
+                        major_shareholder = screening_inputs['major_shareholder'].get(code, 0)
                         
                         stock_data = {
                             'code': code,
@@ -170,6 +232,7 @@ class BacktestingEngine:
                                 'code': code,
                                 'name': name,
                                 'market': ticker.get('market', ''),
+                                'trading_value': market_data.get('trading_value', 0),
                                 'current_price': current_price if current_price > 0 else 10000
                             })
                             
@@ -181,7 +244,7 @@ class BacktestingEngine:
                 for stock_code, holding in current_holdings.items():
                     # 이 부분은 실제 백테스트에서는 해당 날짜의 실제 가격으로 평가해야 함
                     # 현재는 간단화를 위해 시뮬레이션 수익률 적용
-                    simulated_return = np.random.normal(0.0005, 0.02)  # 평균 0.05%, 표준편차 2%의 일간 수익률
+                    simulated_return = rng.normal(0.0005, 0.02)  # 평균 0.05%, 표준편차 2%의 일간 수익률
                     new_price = holding['avg_price'] * (1 + simulated_return)
                     holding['current_price'] = new_price
                 
@@ -197,58 +260,72 @@ class BacktestingEngine:
                     target_allocation = int(total_value * weight)
                     
                     # 기존 보유 종목 매도 (만기 또는 리밸런싱)
-                    stocks_to_sell = []
-                    for stock_code in list(current_holdings.keys()):
-                        should_hold = any(s['code'] == stock_code for s in passed_stocks)
-                        if not should_hold:
-                            stocks_to_sell.append(stock_code)
+                    passed_codes = {s['code'] for s in passed_stocks}
+                    stocks_to_sell = [code for code in current_holdings if code not in passed_codes]
                     
-                    # 매도 처리
-                    for stock_code in stocks_to_sell:
-                        holding = current_holdings.pop(stock_code)
-                        sell_value = holding['quantity'] * holding.get('current_price', holding['avg_price'])
-                        cash += sell_value
-                        
-                        results['sell_signals'].append({
-                            'date': current_date_str,
-                            'code': stock_code,
-                            'name': holding['name'],
-                            'action': 'SELL',
-                            'quantity': holding['quantity'],
-                            'price': holding.get('current_price', holding['avg_price']),
-                            'amount': sell_value
-                        })
+                    # 매도 처리 (리밸런싱 시점의 주문 전체를 한 번에 비용 계산)
+                    if stocks_to_sell:
+                        sells = [current_holdings[code] for code in stocks_to_sell]
+                        fills = costs.execute(
+                            'SELL',
+                            [h.get('current_price', h['avg_price']) for h in sells],
+                            [h['quantity'] for h in sells],
+                            [h.get('trading_value', 0) for h in sells]
+                        )
+                        cash += float(fills['cash'].sum())
+                        self._add_costs(cost_summary, fills)
+                        for i, stock_code in enumerate(stocks_to_sell):
+                            holding = current_holdings[stock_code]
+                            sold = int(fills['quantity'][i])
+                            # 거래대금 한도로 일부만 체결되면 잔량은 다음 리밸런싱까지 보유
+                            if sold >= holding['quantity']:
+                                current_holdings.pop(stock_code)
+                            else:
+                                holding['quantity'] -= sold
+                            if sold <= 0:
+                                continue
+                            results['sell_signals'].append({
+                                'date': current_date_str,
+                                'code': stock_code,
+                                'name': holding['name'],
+                                'action': 'SELL',
+                                'quantity': sold,
+                                'price': float(fills['fill_price'][i]),
+                                'amount': float(fills['cash'][i])
+                            })
                     
-                    # 신규 종목 매수
-                    for stock in passed_stocks:
-                        # 이미 보유한 종목은 skip
-                        if stock['code'] in current_holdings:
-                            continue
-                            
-                        # 자금이 충분한 경우만 매수
-                        required_amount = min(target_allocation, cash)
-                        if required_amount >= stock['current_price']:  # 최소 1주 매수 가능
-                            quantity = min(int(required_amount / stock['current_price']), int(cash / stock['current_price']))
-                            if quantity > 0:
-                                cost = quantity * stock['current_price']
-                                if cost <= cash:
-                                    current_holdings[stock['code']] = {
-                                        'quantity': quantity,
-                                        'avg_price': stock['current_price'],
-                                        'name': stock['name'],
-                                        'current_price': stock['current_price']
-                                    }
-                                    cash -= cost
-                                    
-                                    results['buy_signals'].append({
-                                        'date': current_date_str,
-                                        'code': stock['code'],
-                                        'name': stock['name'],
-                                        'action': 'BUY',
-                                        'quantity': quantity,
-                                        'price': stock['current_price'],
-                                        'amount': cost
-                                    })
+                    # 신규 종목 매수 (목표 비중 수량을 배열로 계산 후 자금 순서대로 체결)
+                    buys = [s for s in passed_stocks if s['code'] not in current_holdings]
+                    if buys:
+                        prices = np.array([s['current_price'] for s in buys], dtype=np.float64)
+                        trading_values = np.array([s.get('trading_value') or 0 for s in buys], dtype=np.float64)
+                        quantities = costs.affordable_quantity(prices, np.full(len(buys), float(target_allocation)), trading_values)
+                        fills = costs.execute('BUY', prices, quantities, trading_values)
+                        # 남은 현금으로 살 수 없는 주문은 제외 (뒤의 더 작은 주문은 계속 체결)
+                        affordable = CostModel.fundable(np.where(fills['quantity'] > 0, -fills['cash'], 0.0), cash)
+                        for key in fills:
+                            fills[key] = np.where(affordable, fills[key], 0.0)
+                        cash += float(fills['cash'].sum())
+                        self._add_costs(cost_summary, fills)
+                        for i in np.flatnonzero(affordable):
+                            stock = buys[i]
+                            quantity = int(fills['quantity'][i])
+                            current_holdings[stock['code']] = {
+                                'quantity': quantity,
+                                'avg_price': float(fills['fill_price'][i]),
+                                'name': stock['name'],
+                                'current_price': float(fills['fill_price'][i]),
+                                'trading_value': float(trading_values[i])
+                            }
+                            results['buy_signals'].append({
+                                'date': current_date_str,
+                                'code': stock['code'],
+                                'name': stock['name'],
+                                'action': 'BUY',
+                                'quantity': quantity,
+                                'price': float(fills['fill_price'][i]),
+                                'amount': float(-fills['cash'][i])
+                            })
                 
                 # 포트폴리오 가치 기록
                 holding_value = sum(holding['quantity'] * holding.get('current_price', holding['avg_price']) 
@@ -264,47 +341,240 @@ class BacktestingEngine:
                 
                 # 다음 리밸런싱 날짜로 이동
                 day_count += 1
+                last_date_str = current_date_str
+                if progress_callback:
+                    progress_callback(day_count, len(rebalance_points), current_date_str)
             
-            # 백테스트 기간 종료 시 모든 주식 청산 시뮬레이션
-            for stock_code, holding in current_holdings.items():
-                # 시뮬레이션 수익률 적용
-                simulated_return = np.random.normal(0.0005, 0.02)
-                final_price = holding['avg_price'] * (1 + simulated_return)
-                sell_amount = holding['quantity'] * final_price
-                cash += sell_amount
-                
-                results['sell_signals'].append({
-                    'date': end_dt.strftime('%Y-%m-%d'),
-                    'code': stock_code,
-                    'name': holding['name'],
-                    'action': 'SELL',
-                    'quantity': holding['quantity'],
-                    'price': final_price,
-                    'amount': sell_amount
-                })
+            # 이어서 실행할 수 있도록 청산 전 상태 저장
+            results['engine_state'] = {
+                'kind': 'strategy',
+                'as_of': last_date_str or start_date,
+                'cash': cash,
+                'holdings': {code: dict(h) for code, h in current_holdings.items()},
+                'rng_state': rng.bit_generator.state,
+                'cost_summary': dict(cost_summary),
+            }
+            holding_value = sum(holding['quantity'] * holding.get('current_price', holding['avg_price'])
+                                for holding in current_holdings.values())
+            
+            # 백테스트 기간 종료 시 모든 주식 청산 시뮬레이션 (이어서 실행 시 다시 계산되는 가상 매도)
+            # 청산은 거래대금 한도 없이 비용만 반영
+            final_codes = list(current_holdings.keys())
+            final_prices = [current_holdings[code]['avg_price'] * (1 + rng.normal(0.0005, 0.02)) for code in final_codes]
+            if final_codes:
+                liquidation_costs = CostModel.from_config(dict(costs.to_dict(), max_participation=0.0))
+                fills = liquidation_costs.execute(
+                    'SELL', final_prices,
+                    [current_holdings[code]['quantity'] for code in final_codes],
+                    [current_holdings[code].get('trading_value', 0) for code in final_codes]
+                )
+                cash += float(fills['cash'].sum())
+                for i, stock_code in enumerate(final_codes):
+                    results['sell_signals'].append({
+                        'date': end_dt.strftime('%Y-%m-%d'),
+                        'code': stock_code,
+                        'name': current_holdings[stock_code]['name'],
+                        'action': 'SELL',
+                        'quantity': current_holdings[stock_code]['quantity'],
+                        'price': float(fills['fill_price'][i]),
+                        'amount': float(fills['cash'][i]),
+                        'liquidation': True
+                    })
+            results['cost_summary'] = {key: round(value, 0) for key, value in cost_summary.items()}
             
             # 성과 지표 계산
             results['performance_metrics'] = self._calculate_performance_metrics(
-                results['portfolio_values'], start_date, end_date
+                results['portfolio_values'], start_date, end_date,
+                trades=results['buy_signals'] + results['sell_signals'],
+                benchmark=benchmark
             )
             
             logger.info(f"Backtest completed. Final portfolio value: {cash + holding_value:,.0f}")
             
             return {'success': True, 'results': results}
             
+        except BacktestCancelled:
+            logger.info(f"Backtest cancelled: strategy={strategy_id}")
+            return {'success': False, 'cancelled': True, 'error': '백테스트가 취소되었습니다.'}
         except Exception as e:
             logger.error(f"Backtest error: {str(e)}")
             logger.error(traceback.format_exc())
             return {'success': False, 'error': str(e)}
     
-    def _calculate_performance_metrics(self, portfolio_values, start_date, end_date):
+    @staticmethod
+    def resolve_ladder_codes(strategy_id=None):
         """
-        성과 지표 계산
+        최근 스크리닝 통과 종목 코드 조회 (래더 백테스트 기본 대상)
+
+        Args:
+            strategy_id (str): 전략 ID (None이면 전체 전략)
+
+        Returns:
+            list: 종목 코드 리스트
+        """
+        query = db.session.query(StockScreeningResult).filter(StockScreeningResult.passed == True)
+        if strategy_id:
+            query = query.filter(StockScreeningResult.strategy_name == strategy_id)
+        latest = query.order_by(StockScreeningResult.screening_date.desc()).first()
+        if not latest:
+            return []
+        rows = query.filter(StockScreeningResult.screening_date == latest.screening_date).all()
+        return [r.code for r in rows]
+
+    def run_ladder_backtest(self, start_date, end_date, codes=None, strategy_id=None, splits=7,
+                            step_pct=3.0, take_profit_pct=3.0, amount_per_split=1000000,
+                            progress_callback=None, cancel_check=None, resume_state=None, benchmark=None,
+                            cost_model=None):
+        """
+        세븐스플릿 래더(분할 매수/매도) 백테스트 실행
+
+        Args:
+            start_date (str): 시작 날짜 (YYYY-MM-DD)
+            end_date (str): 종료 날짜 (YYYY-MM-DD)
+            codes (list): 대상 종목 코드 (None이면 strategy_id의 최근 스크리닝 통과 종목)
+            strategy_id (str): 대상 종목을 가져올 전략 ID
+            splits (int): 분할 수
+            step_pct (float): 추가 매수 하락폭 (%)
+            take_profit_pct (float): 분할별 익절 상승폭 (%)
+            amount_per_split (int): 분할당 매수 금액
+            progress_callback (callable): progress_callback(done, total, message) 진행 상황 보고
+            cancel_check (callable): True를 반환하면 다음 구간에서 중단
+            resume_state (dict): 이전 실행의 engine_state. 주어지면 그 시점 이후 구간만 시뮬레이션
+            benchmark (str): 비교 지수 ('KOSPI', 'KOSDAQ', 'KRX300' 또는 그 지수 코드)
+            cost_model (str | dict): 거래 비용 모델 (래더는 분할 주문이 작아 고정 비용률만 반영)
+
+        Returns:
+            dict: 백테스트 결과 (results['engine_state']에 이어서 실행할 수 있는 최종 상태 포함)
+        """
+        logger.info(f"Starting ladder backtest: splits={splits}, step={step_pct}%, tp={take_profit_pct}%, period={start_date} to {end_date}")
+
+        try:
+            state = None
+            sim_start = start_date
+            prior_buys = prior_sells = 0
+            if resume_state:
+                codes = list(resume_state['tickers'])
+                state = resume_state['ladder']
+                prior_buys = np.asarray(resume_state['num_buys'])
+                prior_sells = np.asarray(resume_state['num_sells'])
+                sim_start = str(np.datetime64(resume_state['as_of'], 'D') + np.timedelta64(1, 'D'))
+            if not codes:
+                codes = self.resolve_ladder_codes(strategy_id)
+            if not codes:
+                return {'success': False, 'error': '래더 백테스트 대상 종목이 없습니다.'}
+
+            # 시점 기준 저장소에서 일별 시세 로드 (없는 일자만 수집)
+            store = get_price_store()
+            store.sync(sim_start, end_date, dates=get_calendar().trading_days(sim_start, end_date))
+            dates, tickers, panel = store.window(sim_start, end_date, tickers=codes,
+                                                 fields=('open', 'high', 'low', 'close'))
+            if len(dates) == 0:
+                return {'success': False, 'error': '해당 기간의 시세 데이터가 없습니다.'}
+
+            costs = CostModel.from_config(cost_model)
+
+            # 상태를 이어가며 구간별로 시뮬레이션 (진행 보고/취소 지점)
+            chunks = []
+            for lo in range(0, len(dates), self.LADDER_CHUNK_DAYS):
+                if cancel_check and cancel_check():
+                    raise BacktestCancelled()
+                hi = min(lo + self.LADDER_CHUNK_DAYS, len(dates))
+                part = simulate_ladders(
+                    panel['open'][lo:hi], panel['high'][lo:hi], panel['low'][lo:hi], panel['close'][lo:hi],
+                    splits=splits, step_pct=step_pct, take_profit_pct=take_profit_pct,
+                    amount_per_split=amount_per_split, state=state,
+                    buy_cost_rate=costs.buy_rate, sell_cost_rate=costs.sell_rate
+                )
+                state = part['state']
+                chunks.append(part)
+                if progress_callback:
+                    progress_callback(hi, len(dates), str(np.datetime_as_string(dates[hi - 1], unit='D')))
+            sim = {
+                'equity': np.vstack([c['equity'] for c in chunks]),
+                'invested': np.vstack([c['invested'] for c in chunks]),
+                'num_buys': prior_buys + sum(c['num_buys'] for c in chunks),
+                'num_sells': prior_sells + sum(c['num_sells'] for c in chunks),
+                'state': state,
+            }
+
+            initial_capital = splits * amount_per_split * len(tickers)
+            total_equity = sim['equity'].sum(axis=1)
+            total_invested = sim['invested'].sum(axis=1)
+            date_strs = np.datetime_as_string(dates, unit='D')
+
+            results = {
+                'strategy_id': 'seven_split_ladder',
+                'strategy_name': f'세븐스플릿 래더 ({splits}분할)',
+                'start_date': start_date,
+                'end_date': end_date,
+                'initial_capital': initial_capital,
+                'rebalance_interval': 'daily',
+                'cost_model': costs.to_dict(),
+                'ladder_params': {
+                    'splits': splits,
+                    'step_pct': step_pct,
+                    'take_profit_pct': take_profit_pct,
+                    'amount_per_split': amount_per_split,
+                },
+                'portfolio_values': [
+                    {'date': d, 'value': float(v), 'cash': float(v - i), 'holdings_value': float(i)}
+                    for d, v, i in zip(date_strs, total_equity, total_invested)
+                ],
+                'buy_signals': [],
+                'sell_signals': [],
+                'ladders': [
+                    {
+                        'code': str(code),
+                        'final_value': float(sim['equity'][-1, n]),
+                        'return': round(float(sim['equity'][-1, n] / (splits * amount_per_split) - 1) * 100, 2),
+                        'num_buys': int(sim['num_buys'][n]),
+                        'num_sells': int(sim['num_sells'][n]),
+                    }
+                    for n, code in enumerate(tickers)
+                ],
+                'performance_metrics': {},
+                'trades': [],
+                'engine_state': {
+                    'kind': 'ladder',
+                    'as_of': str(date_strs[-1]),
+                    'tickers': [str(t) for t in tickers],
+                    'num_buys': [int(n) for n in sim['num_buys']],
+                    'num_sells': [int(n) for n in sim['num_sells']],
+                    'ladder': {key: value.tolist() for key, value in state.items()},
+                },
+            }
+            results['performance_metrics'] = self._calculate_performance_metrics(
+                results['portfolio_values'], start_date, end_date, benchmark=benchmark
+            )
+
+            logger.info(f"Ladder backtest completed. {len(tickers)} ladders, final value: {total_equity[-1]:,.0f}")
+            return {'success': True, 'results': results}
+
+        except BacktestCancelled:
+            logger.info("Ladder backtest cancelled")
+            return {'success': False, 'cancelled': True, 'error': '백테스트가 취소되었습니다.'}
+        except Exception as e:
+            logger.error(f"Ladder backtest error: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {'success': False, 'error': str(e)}
+
+    @staticmethod
+    def _add_costs(cost_summary, fills):
+        cost_summary['commission'] += float(fills['commission'].sum())
+        cost_summary['tax'] += float(fills['tax'].sum())
+        cost_summary['slippage'] += float(fills['slippage_cost'].sum())
+
+    @staticmethod
+    def _calculate_performance_metrics(portfolio_values, start_date, end_date, trades=None, benchmark=None):
+        """
+        성과 지표 계산 (backtesting_metrics 벡터 연산 사용)
         
         Args:
             portfolio_values (list): 포트폴리오 가치 리스트
             start_date (str): 시작 날짜
             end_date (str): 종료 날짜
+            trades (list): 매매 내역 (회전율 계산용, 'amount' 키 사용)
+            benchmark (str): 벤치마크 ('KOSPI', 'KOSDAQ', 'KRX300' 또는 그 지수 코드, None이면 생략)
         
         Returns:
             dict: 성과 지표
@@ -312,51 +582,65 @@ class BacktestingEngine:
         if len(portfolio_values) < 2:
             return {}
         
-        initial_value = portfolio_values[0]['value']
-        final_value = portfolio_values[-1]['value']
+        equity = np.array([pv['value'] for pv in portfolio_values], dtype=np.float64)
+        holdings = np.array([pv.get('holdings_value', 0) for pv in portfolio_values], dtype=np.float64)
+        traded = np.array([t.get('amount', 0) for t in (trades or [])], dtype=np.float64)
         
-        total_return = (final_value - initial_value) / initial_value * 100
         num_years = (datetime.strptime(end_date, '%Y-%m-%d') - 
                      datetime.strptime(start_date, '%Y-%m-%d')).days / 365.25
+        # 곡선 포인트 간격(일간/월간 리밸런싱 등)에 맞춘 연환산 기간 수
+        periods_per_year = (len(equity) - 1) / num_years if num_years > 0 else 252
         
-        if num_years > 0:
-            cagr = (final_value / initial_value) ** (1/num_years) - 1
-            cagr *= 100  # percentage
-        else:
-            cagr = 0
-        
-        # Calculate daily returns for volatility
-        daily_returns = []
-        for i in range(1, len(portfolio_values)):
-            prev_value = portfolio_values[i-1]['value']
-            curr_value = portfolio_values[i]['value']
-            if prev_value != 0:
-                daily_return = (curr_value - prev_value) / prev_value
-                daily_returns.append(daily_return)
-        
-        if daily_returns:
-            daily_volatility = np.std(daily_returns) * 100
-            annual_volatility = daily_volatility * np.sqrt(252)  # 252 trading days per year
-        else:
-            daily_volatility = 0
-            annual_volatility = 0
-        
-        # Simple sharpe ratio (assuming 0% risk-free rate)
-        if annual_volatility != 0:
-            sharpe_ratio = cagr / annual_volatility if annual_volatility > 0 else 0
-        else:
-            sharpe_ratio = 0
-        
-        return {
-            'total_return': round(total_return, 2),
-            'cagr': round(cagr, 2),
-            'annual_volatility': round(annual_volatility, 2),
-            'sharpe_ratio': round(sharpe_ratio, 2),
-            'max_drawdown': 0,  # This would require more complex calculation
-            'initial_value': initial_value,
-            'final_value': final_value,
-            'num_years': round(num_years, 2)
-        }
+        metrics = compute_metrics(
+            equity, years=num_years, periods_per_year=periods_per_year,
+            traded_value=traded, exposure_value=holdings
+        )
+        if benchmark:
+            curve_dates = np.array([str(pv['date'])[:10] for pv in portfolio_values], dtype='datetime64[D]')
+            bench = BacktestingEngine._benchmark_on(benchmark, curve_dates)
+            if bench is not None:
+                metrics.update(compute_relative_metrics(
+                    equity, bench, years=num_years, periods_per_year=periods_per_year
+                ))
+        result = {}
+        for key, value in metrics.items():
+            if np.isnan(value):
+                result[key] = None  # 기간이 짧아 계산 불가 (예: 1년 미만의 롤링 수익률)
+            elif key in ('initial_value', 'final_value'):
+                result[key] = value
+            elif key == 'max_drawdown_duration':
+                result[key] = int(value)
+            else:
+                result[key] = round(value, 2)
+        if benchmark and 'beta' in result:
+            result['benchmark'] = benchmark
+        return result
+
+    @staticmethod
+    def _benchmark_on(benchmark, curve_dates):
+        """
+        곡선 시점의 벤치마크 지수 값 (로컬 지수 저장소에서 백테스트당 한 번 조회)
+
+        Returns:
+            ndarray: curve_dates와 같은 길이의 지수 값 (조회 실패/데이터 부족 시 None)
+        """
+        start, end = str(curve_dates[0]), str(curve_dates[-1])
+        try:
+            days, closes = get_index_store().series(
+                benchmark, start, end, dates=get_calendar().trading_days(start, end)
+            )
+        except Exception as e:
+            logger.warning(f"Benchmark {benchmark} unavailable: {e}")
+            return None
+
+        valid = ~np.isnan(closes)
+        days, closes = days[valid], closes[valid]
+        # 각 시점 당일 또는 직전 거래일 종가 사용
+        idx = np.searchsorted(days, curve_dates, side='right') - 1
+        if len(days) == 0 or idx[0] < 0:
+            logger.warning(f"Benchmark {benchmark} has no data from {start}")
+            return None
+        return closes[idx]
 
 
 class BacktestingHistory(db.Model):
@@ -375,9 +659,228 @@ class BacktestingHistory(db.Model):
     total_return = db.Column(db.Float)
     cagr = db.Column(db.Float)
     sharpe_ratio = db.Column(db.Float)
+    annual_volatility = db.Column(db.Float)
+    sortino_ratio = db.Column(db.Float)
+    calmar_ratio = db.Column(db.Float)
+    max_drawdown = db.Column(db.Float)
+    max_drawdown_duration = db.Column(db.Integer)
+    benchmark = db.Column(db.String(20))
+    alpha = db.Column(db.Float)
+    beta = db.Column(db.Float)
+    information_ratio = db.Column(db.Float)
+    rebalance_interval = db.Column(db.String(20))
+    num_points = db.Column(db.Integer)
+    num_trades = db.Column(db.Integer)
     status = db.Column(db.String(20), default='completed')
     created_at = db.Column(db.DateTime, default=datetime.now)
-    backtest_data = db.Column(db.Text)  # JSON으로 저장
+    # 대용량 데이터는 지연 로딩 (이력 목록 조회 시 읽지 않음)
+    equity_curve = db.deferred(db.Column(db.LargeBinary))  # backtesting_storage.encode_curve
+    trade_log = db.deferred(db.Column(db.LargeBinary))  # backtesting_storage.encode_trades
+    result_meta = db.deferred(db.Column(db.Text))  # 곡선/매매 내역을 제외한 나머지 결과 (JSON)
+    engine_state = db.deferred(db.Column(db.Text))  # 이어서 실행하기 위한 최종 엔진 상태 (JSON)
+    tracked = db.Column(db.Boolean, default=False)  # 스케줄러 자동 연장 대상
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    backtest_data = db.deferred(db.Column(db.Text))  # 이전 버전 JSON 전체 저장 (읽기 전용)
 
     def __repr__(self):
-        return f'<BacktestingHistory {self.strategy_id} {self.start_date} to {self.end_date}>'
\ No newline at end of file
+        return f'<BacktestingHistory {self.strategy_id} {self.start_date} to {self.end_date}>'
+
+    def get_curve(self):
+        """
+        자산 곡선 열 배열 (date, value, cash, holdings_value)
+        """
+        if self.equity_curve:
+            return decode_curve(self.equity_curve, as_records=False)
+        if self.backtest_data:
+            values = json.loads(self.backtest_data).get('portfolio_values', [])
+            return {
+                'date': [pv['date'] for pv in values],
+                'value': [pv['value'] for pv in values],
+                'cash': [pv.get('cash', 0) for pv in values],
+                'holdings_value': [pv.get('holdings_value', 0) for pv in values],
+            }
+        return {'date': [], 'value': [], 'cash': [], 'holdings_value': []}
+
+    def to_result(self):
+        """
+        BacktestingEngine 결과 형식으로 복원
+        """
+        if not self.equity_curve:
+            return json.loads(self.backtest_data) if self.backtest_data else {}
+        result = json.loads(self.result_meta or '{}')
+        result['portfolio_values'] = decode_curve(self.equity_curve)
+        trades = decode_trades(self.trade_log) if self.trade_log else []
+        result['buy_signals'] = [t for t in trades if t['action'] == 'BUY']
+        result['sell_signals'] = [t for t in trades if t['action'] == 'SELL'] + result.pop('liquidation_signals', [])
+        return result
+
+    def get_engine_state(self):
+        """
+        이어서 실행할 수 있는 엔진 상태 (없으면 None)
+        """
+        return json.loads(self.engine_state) if self.engine_state else None
+
+    def get_run_params(self):
+        """
+        이 백테스트를 실행한 작업 종류/인자 (없으면 None)
+        """
+        if not self.result_meta:
+            return None
+        return json.loads(self.result_meta).get('run_params')
+
+
+def _store_result(history, backtest_result):
+    """
+    결과의 지표/곡선/매매 내역/엔진 상태를 이력 행에 기록
+    """
+    metrics = backtest_result['performance_metrics']
+    history.end_date = datetime.strptime(backtest_result['end_date'], '%Y-%m-%d')
+    history.final_value = metrics.get('final_value', 0)
+    history.total_return = metrics.get('total_return', 0)
+    history.cagr = metrics.get('cagr', 0)
+    history.sharpe_ratio = metrics.get('sharpe_ratio', 0)
+    history.annual_volatility = metrics.get('annual_volatility')
+    history.sortino_ratio = metrics.get('sortino_ratio')
+    history.calmar_ratio = metrics.get('calmar_ratio')
+    history.max_drawdown = metrics.get('max_drawdown')
+    history.max_drawdown_duration = metrics.get('max_drawdown_duration')
+    history.benchmark = metrics.get('benchmark')
+    history.alpha = metrics.get('alpha')
+    history.beta = metrics.get('beta')
+    history.information_ratio = metrics.get('information_ratio')
+    history.rebalance_interval = backtest_result.get('rebalance_interval')
+
+    # 기간 종료 시 가상 청산 매도는 연장 시 다시 계산되므로 매매 로그와 분리해 보관
+    sells = backtest_result.get('sell_signals', [])
+    liquidation = [t for t in sells if t.get('liquidation')]
+    portfolio_values = backtest_result.get('portfolio_values', [])
+    trades = backtest_result.get('buy_signals', []) + [t for t in sells if not t.get('liquidation')]
+    trades.sort(key=lambda t: str(t['date']))
+    history.num_points = len(portfolio_values)
+    history.num_trades = len(trades)
+    history.equity_curve = encode_curve(portfolio_values)
+    history.trade_log = encode_trades(trades)
+
+    skip = ('portfolio_values', 'buy_signals', 'sell_signals', 'engine_state', 'extends_history_id')
+    meta = {k: v for k, v in backtest_result.items() if k not in skip}
+    meta['liquidation_signals'] = liquidation
+    history.result_meta = json.dumps(meta, default=str)
+    if backtest_result.get('engine_state'):
+        history.engine_state = json.dumps(backtest_result['engine_state'], default=str)
+
+
+def save_backtest_history(backtest_result):
+    """
+    백테스트 결과를 이력 테이블에 저장
+    (extends_history_id가 있으면 기존 이력에 이어 붙임)
+
+    Args:
+        backtest_result (dict): BacktestingEngine 결과
+
+    Returns:
+        BacktestingHistory: 저장된 이력
+    """
+    if backtest_result.get('extends_history_id'):
+        return extend_backtest_history(backtest_result['extends_history_id'], backtest_result)
+
+    history = BacktestingHistory()
+    history.strategy_id = backtest_result['strategy_id']
+    history.strategy_name = backtest_result['strategy_name']
+    history.start_date = datetime.strptime(backtest_result['start_date'], '%Y-%m-%d')
+    history.initial_capital = backtest_result['initial_capital']
+    _store_result(history, backtest_result)
+
+    db.session.add(history)
+    db.session.commit()
+    return history
+
+
+def extend_backtest_history(history_id, segment):
+    """
+    이어서 실행한 구간 결과를 기존 이력에 추가하고 전체 구간 지표를 다시 계산
+
+    Args:
+        history_id (int): 기존 이력 ID
+        segment (dict): resume_state로 실행한 BacktestingEngine 결과 (새 구간만 포함)
+
+    Returns:
+        BacktestingHistory: 갱신된 이력
+    """
+    history = db.session.query(BacktestingHistory).filter_by(id=history_id).first()
+    if not history:
+        raise ValueError(f'백테스트 이력이 없습니다: {history_id}')
+
+    merged = history.to_result()
+    last_date = merged['portfolio_values'][-1]['date'] if merged['portfolio_values'] else ''
+    merged['portfolio_values'] += [pv for pv in segment['portfolio_values'] if str(pv['date']) > last_date]
+    # 이전 가상 청산은 버리고 새 구간 종료 시점의 청산으로 대체
+    merged['buy_signals'] += segment.get('buy_signals', [])
+    merged['sell_signals'] = [t for t in merged['sell_signals'] if not t.get('liquidation')] + segment.get('sell_signals', [])
+
+    for key in ('end_date', 'engine_state', 'run_params', 'ladders', 'cost_summary'):
+        if key in segment:
+            merged[key] = segment[key]
+    merged['performance_metrics'] = BacktestingEngine._calculate_performance_metrics(
+        merged['portfolio_values'], merged['start_date'], merged['end_date'],
+        trades=merged['buy_signals'] + merged['sell_signals'],
+        benchmark=(merged.get('run_params') or {}).get('benchmark')
+    )
+    _store_result(history, merged)
+    db.session.commit()
+    logger.info(f"Backtest history {history_id} extended to {merged['end_date']}")
+    return history
+
+
+def closed_trade_returns(backtest_result):
+    """
+    매수/매도 신호를 종목별로 짝지어 청산된 매매의 수익률 계산
+
+    Returns:
+        tuple: (수익률 ndarray, 매매당 평균 투입 금액)
+    """
+    trades = backtest_result.get('buy_signals', []) + backtest_result.get('sell_signals', [])
+    # 같은 리밸런싱 일자에는 매도가 매수보다 먼저 처리됨
+    trades.sort(key=lambda t: (str(t['date']), 0 if t['action'] == 'SELL' else 1))
+    open_lots = {}
+    returns, amounts = [], []
+    for trade in trades:
+        if trade['action'] == 'BUY':
+            open_lots[trade['code']] = trade
+            continue
+        lot = open_lots.pop(trade['code'], None)
+        if lot and lot['price']:
+            returns.append(trade['price'] / lot['price'] - 1)
+            amounts.append(lot['amount'])
+    return np.array(returns, dtype=np.float64), (float(np.mean(amounts)) if amounts else 0.0)
+
+
+def run_history_robustness(history, method='returns', num_samples=2000, block_size=5, seed=42):
+    """
+    저장된 백테스트 이력에 대한 부트스트랩 강건성 분석
+
+    Args:
+        history (BacktestingHistory): 대상 이력
+        method (str): 'returns' 또는 'trades'
+        num_samples (int): 표본 수
+        block_size (int): 기간 수익률 블록 길이
+        seed (int): 난수 시드
+
+    Returns:
+        dict: backtesting_robustness.run_robustness 결과
+    """
+    curve = history.get_curve()
+    equity = np.asarray(curve['value'], dtype=np.float64)
+    years = (history.end_date - history.start_date).days / 365.25
+    if len(equity) < 3 or years <= 0:
+        raise ValueError('강건성 분석에 필요한 자산 곡선이 부족합니다.')
+
+    if method == 'trades':
+        trade_returns, avg_amount = closed_trade_returns(history.to_result())
+        return run_robustness(
+            trade_returns=trade_returns, method='trades', num_samples=num_samples, seed=seed,
+            years=years, position_fraction=avg_amount / equity.mean()
+        )
+    return run_robustness(
+        equity=equity, method='returns', num_samples=num_samples, block_size=block_size, seed=seed,
+        years=years, periods_per_year=(len(equity) - 1) / years
+    )
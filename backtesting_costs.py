@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Backtesting Costs
+거래 비용 모델 (수수료, 증권거래세, 스프레드/시장충격, 거래대금 대비 체결 한도)
+
+한 리밸런싱 시점의 주문 전체를 배열로 받아 한 번에 계산합니다.
+"""
+import numpy as np
+
+
+class CostModel:
+    """
+    거래 비용 모델
+
+    체결가 = 기준가 x (1 ± 슬리피지)
+    슬리피지 = 스프레드/2 + impact_coef x sqrt(주문금액 / 일 거래대금)
+    매수 비용 = 수수료, 매도 비용 = 수수료 + 증권거래세
+    주문 수량은 일 거래대금의 max_participation 비율까지만 체결됩니다.
+    """
+
+    def __init__(self, commission_rate=0.00015, sell_tax_rate=0.002, spread_bps=10.0,
+                 impact_coef=0.1, max_participation=0.1, min_commission=0.0):
+        """
+        Args:
+            commission_rate (float): 매매 수수료율 (양방향)
+            sell_tax_rate (float): 매도 시 증권거래세율 (농특세 포함)
+            spread_bps (float): 호가 스프레드 (bp, 체결 시 절반 부담)
+            impact_coef (float): 시장충격 계수 (제곱근 모형)
+            max_participation (float): 일 거래대금 대비 최대 체결 비율 (0이면 제한 없음)
+            min_commission (float): 주문당 최소 수수료
+        """
+        self.commission_rate = commission_rate
+        self.sell_tax_rate = sell_tax_rate
+        self.spread_bps = spread_bps
+        self.impact_coef = impact_coef
+        self.max_participation = max_participation
+        self.min_commission = min_commission
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        프리셋 이름 또는 파라미터 dict로 생성 (None이면 비용 없음)
+        """
+        if config is None or isinstance(config, cls):
+            return config or cls.zero()
+        if isinstance(config, str):
+            if config not in COST_PRESETS:
+                raise ValueError(f"Unknown cost model preset: {config}")
+            return cls(**COST_PRESETS[config])
+        return cls(**config)
+
+    @classmethod
+    def zero(cls):
+        return cls(**COST_PRESETS['none'])
+
+    def to_dict(self):
+        return {
+            'commission_rate': self.commission_rate,
+            'sell_tax_rate': self.sell_tax_rate,
+            'spread_bps': self.spread_bps,
+            'impact_coef': self.impact_coef,
+            'max_participation': self.max_participation,
+            'min_commission': self.min_commission,
+        }
+
+    @property
+    def buy_rate(self):
+        """
+        주문 크기와 무관한 매수 비용률 (수수료 + 스프레드 절반)
+        """
+        return self.commission_rate + self.spread_bps / 2e4
+
+    @property
+    def sell_rate(self):
+        """
+        주문 크기와 무관한 매도 비용률 (수수료 + 세금 + 스프레드 절반)
+        """
+        return self.commission_rate + self.sell_tax_rate + self.spread_bps / 2e4
+
+    def max_quantity(self, price, trading_value):
+        """
+        거래대금 대비 체결 가능한 최대 수량 (거래대금 정보가 없으면 무제한)
+        """
+        price = np.asarray(price, dtype=np.float64)
+        trading_value = np.asarray(trading_value, dtype=np.float64)
+        known = (trading_value > 0) & (price > 0) & (self.max_participation > 0)
+        limit = np.floor(self.max_participation * np.where(known, trading_value, 0.0) / np.where(price > 0, price, 1.0))
+        return np.where(known, limit, np.inf)
+
+    def slippage(self, order_value, trading_value):
+        """
+        주문별 슬리피지 비율
+        """
+        order_value = np.asarray(order_value, dtype=np.float64)
+        trading_value = np.asarray(trading_value, dtype=np.float64)
+        known = trading_value > 0
+        participation = np.where(known, order_value / np.where(known, trading_value, 1.0), 0.0)
+        return self.spread_bps / 2e4 + self.impact_coef * np.sqrt(participation)
+
+    def execute(self, side, price, quantity, trading_value=None):
+        """
+        주문 배열 체결 계산
+
+        Args:
+            side (str): 'BUY' 또는 'SELL'
+            price (array): 기준가
+            quantity (array): 주문 수량
+            trading_value (array): 일 거래대금 (None이면 충격/체결 한도 미적용)
+
+        Returns:
+            dict: {
+                'quantity': 체결 수량, 'fill_price': 체결가,
+                'gross': 체결금액, 'commission': 수수료, 'tax': 세금,
+                'slippage_cost': 슬리피지 비용, 'cash': 현금 증감 (매수 음수, 매도 양수)
+            }
+        """
+        price = np.asarray(price, dtype=np.float64)
+        quantity = np.asarray(quantity, dtype=np.float64)
+        if trading_value is None:
+            trading_value = np.zeros_like(price)
+        trading_value = np.nan_to_num(np.asarray(trading_value, dtype=np.float64))
+
+        filled = np.minimum(quantity, self.max_quantity(price, trading_value))
+        slip = self.slippage(filled * price, trading_value)
+        sign = 1.0 if side == 'BUY' else -1.0
+        fill_price = price * (1.0 + sign * slip)
+        gross = filled * fill_price
+
+        commission = np.where(filled > 0, np.maximum(gross * self.commission_rate, self.min_commission), 0.0)
+        tax = gross * self.sell_tax_rate if side == 'SELL' else np.zeros_like(gross)
+        cash = -(gross + commission) if side == 'BUY' else gross - commission - tax
+        return {
+            'quantity': filled,
+            'fill_price': fill_price,
+            'gross': gross,
+            'commission': commission,
+            'tax': tax,
+            'slippage_cost': filled * price * slip,
+            'cash': cash,
+        }
+
+    def affordable_quantity(self, price, budget, trading_value=None):
+        """
+        예산 안에서 비용 포함 매수 가능한 수량 (시장충격은 예산 전체 주문 기준으로 보수적으로 계산)
+        """
+        price = np.asarray(price, dtype=np.float64)
+        budget = np.asarray(budget, dtype=np.float64)
+        if trading_value is None:
+            trading_value = np.zeros_like(price)
+        trading_value = np.nan_to_num(np.asarray(trading_value, dtype=np.float64))
+        unit_cost = price * (1.0 + self.slippage(budget, trading_value)) * (1.0 + self.commission_rate)
+        quantity = np.floor(budget / np.where(unit_cost > 0, unit_cost, np.inf))
+        return np.minimum(quantity, self.max_quantity(price, trading_value))
+
+    @staticmethod
+    def fundable(cost, cash):
+        """
+        주문 순서대로 남은 현금으로 체결할 수 있는 주문 (자금이 모자란 주문은 건너뛰고 다음 주문을 확인)
+
+        Args:
+            cost (array): 주문별 필요 현금 (0 이하면 주문 없음)
+            cash (float): 가용 현금
+
+        Returns:
+            array: 체결 여부 (bool)
+        """
+        cost = np.asarray(cost, dtype=np.float64)
+        funded = np.zeros(len(cost), dtype=bool)
+        for i, amount in enumerate(cost):
+            if 0 < amount <= cash:
+                funded[i] = True
+                cash -= amount
+        return funded
+
+
+# 비용 모델 프리셋 (sell_tax_rate: 2026년 기준 증권거래세 + 농특세 합계)
+COST_PRESETS = {
+    'none': {
+        'commission_rate': 0.0, 'sell_tax_rate': 0.0, 'spread_bps': 0.0,
+        'impact_coef': 0.0, 'max_participation': 0.0, 'min_commission': 0.0,
+    },
+    'default': {
+        'commission_rate': 0.00015, 'sell_tax_rate': 0.002, 'spread_bps': 10.0,
+        'impact_coef': 0.1, 'max_participation': 0.1, 'min_commission': 0.0,
+    },
+    'conservative': {
+        'commission_rate': 0.0005, 'sell_tax_rate': 0.002, 'spread_bps': 30.0,
+        'impact_coef': 0.2, 'max_participation': 0.05, 'min_commission': 0.0,
+    },
+}
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Backtesting Jobs
+백테스트 백그라운드 작업 관리 (Celery 사용 시 Celery 작업, 아니면 로컬 프로세스 풀)
+"""
+import multiprocessing
+import queue
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from datetime import datetime
+
+from .setup import P, F
+from .logic import celery
+from .backtesting import BacktestingEngine, save_backtest_history
+
+logger = P.logger
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+
+def _run_engine(kind, params, progress_callback=None, cancel_check=None):
+    """
+    작업 종류별 백테스트 실행 (워커 프로세스에서 호출, DB 접근 없음)
+
+    DB에서 읽는 입력(래더 대상 종목, 전략 백테스트의 screening_inputs)은 제출하는 쪽에서 미리 확정해 params로 넘깁니다.
+    """
+    params = dict(params)
+    engine = BacktestingEngine(dart_api_key=params.pop('dart_api_key', None))
+    extends_history_id = params.pop('extends_history_id', None)
+    if kind == 'ladder':
+        result = engine.run_ladder_backtest(progress_callback=progress_callback, cancel_check=cancel_check, **params)
+    else:
+        result = engine.run_backtest(progress_callback=progress_callback, cancel_check=cancel_check, **params)
+
+    if result['success']:
+        # 나중에 같은 설정으로 이어서 실행할 수 있도록 실행 인자 기록
+        run_params = {key: value for key, value in params.items() if key not in ('resume_state', 'screening_inputs')}
+        result['results']['run_params'] = dict(run_params, kind=kind)
+        if extends_history_id:
+            result['results']['extends_history_id'] = extends_history_id
+    return result
+
+
+def _process_worker(job_id, kind, params, progress_queue, cancel_event):
+    """
+    로컬 프로세스 풀 워커 진입점. 진행 상황은 공유 큐로 전달
+    """
+    def progress(done, total, message):
+        progress_queue.put((job_id, done, total, message))
+
+    return _run_engine(kind, params, progress, cancel_event.is_set)
+
+
+@celery.task(bind=True)
+def task_run_backtest(self, kind, params):
+    """
+    Celery 백테스트 작업. 진행 상황은 작업 상태(PROGRESS)로 보고하고 결과는 이력에 직접 저장
+    """
+    def progress(done, total, message):
+        self.update_state(state='PROGRESS', meta={'done': done, 'total': total, 'message': message})
+
+    try:
+        result = _run_engine(kind, params, progress)
+        if not result['success']:
+            return {'success': False, 'error': result['error'], 'cancelled': result.get('cancelled', False)}
+        history = save_backtest_history(result['results'])
+        return {'success': True, 'history_id': history.id}
+    except Exception as e:
+        logger.error(f"Backtest task error: {str(e)}")
+        logger.error(traceback.format_exc())
+        return {'success': False, 'error': str(e)}
+
+
+class BacktestJobManager:
+    """
+    백테스트 작업 관리자
+
+    작업 ID 발급, 동시 실행 수 제한, 취소, socketio 진행 상황 전송을 담당합니다.
+    작업 목록은 웹 프로세스 메모리에만 유지되며 결과는 BacktestingHistory에 저장됩니다.
+    """
+
+    MAX_FINISHED_JOBS = 50
+    PUMP_INTERVAL = 1.0
+
+    def __init__(self):
+        self.jobs = OrderedDict()
+        self._lock = threading.RLock()
+        self._executor = None
+        self._executor_workers = 0
+        self._mp_manager = None
+        self._progress_queue = None
+        self._pump_thread = None
+
+    # ------------------------------------------------------------------
+    # 작업 제출/취소
+    # ------------------------------------------------------------------
+    @staticmethod
+    def max_jobs():
+        try:
+            return max(1, int(P.ModelSetting.get('backtest_max_jobs')))
+        except (ValueError, TypeError):
+            return 2
+
+    def active_jobs(self):
+        with self._lock:
+            return [job for job in self.jobs.values() if job['status'] in ACTIVE_STATUSES]
+
+    def submit(self, kind, params, label=None):
+        """
+        백테스트 작업 제출
+
+        Args:
+            kind (str): 'strategy' (전략 백테스트) 또는 'ladder' (래더 백테스트)
+            params (dict): BacktestingEngine 실행 인자 (dart_api_key 포함 가능)
+            label (str): 작업 표시 이름
+
+        Returns:
+            str: 작업 ID
+
+        Raises:
+            RuntimeError: 동시 실행 제한 초과
+        """
+        with self._lock:
+            limit = self.max_jobs()
+            if len(self.active_jobs()) >= limit:
+                raise RuntimeError(f'동시에 실행할 수 있는 백테스트는 최대 {limit}개입니다.')
+
+            if params.get('extends_history_id') and any(
+                    job.get('history_id') == params['extends_history_id'] for job in self.active_jobs()):
+                raise RuntimeError('이미 연장 작업이 진행 중인 이력입니다.')
+
+            job_id = uuid.uuid4().hex[:12]
+            job = {
+                'id': job_id,
+                'kind': kind,
+                'label': label or kind,
+                'status': STATUS_QUEUED,
+                'done': 0,
+                'total': 0,
+                'message': '',
+                'history_id': params.get('extends_history_id'),
+                'error': None,
+                'created_at': datetime.now(),
+                'finished_at': None,
+            }
+            self.jobs[job_id] = job
+            self._trim()
+
+            if F.config['use_celery']:
+                job['_task'] = task_run_backtest.apply_async((kind, params))
+            else:
+                self._ensure_executor(limit)
+                job['_cancel_event'] = self._mp_manager.Event()
+                future = self._executor.submit(
+                    _process_worker, job_id, kind, params, self._progress_queue, job['_cancel_event']
+                )
+                job['_future'] = future
+                future.add_done_callback(lambda f, job_id=job_id: self._on_local_done(job_id, f))
+            self._ensure_pump()
+
+        logger.info(f"Backtest job submitted: {job_id} ({kind})")
+        self._emit('backtest_progress', self.public(job))
+        return job_id
+
+    def extend(self, history, end_date):
+        """
+        저장된 백테스트를 end_date까지 이어서 실행하는 작업 제출
+
+        Args:
+            history (BacktestingHistory): 연장할 이력
+            end_date (str): 새 종료일 (YYYY-MM-DD)
+
+        Returns:
+            str: 작업 ID
+        """
+        run_params = history.get_run_params()
+        state = history.get_engine_state()
+        if not run_params or not state:
+            raise RuntimeError('엔진 상태가 저장되지 않은 이력은 이어서 실행할 수 없습니다.')
+        if end_date <= history.end_date.strftime('%Y-%m-%d'):
+            raise RuntimeError('새 종료일은 기존 종료일 이후여야 합니다.')
+
+        params = dict(run_params)
+        kind = params.pop('kind')
+        params.update(end_date=end_date, resume_state=state, extends_history_id=history.id)
+        if kind == 'strategy':
+            params['dart_api_key'] = P.ModelSetting.get('dart_api_key')
+            params['screening_inputs'] = BacktestingEngine(params['dart_api_key']).load_screening_inputs(params['strategy_id'])
+        return self.submit(kind, params, label=f'#{history.id} {history.strategy_name} 연장')
+
+    def cancel(self, job_id):
+        """
+        작업 취소. 대기 중이면 바로 취소되고, 실행 중이면 다음 진행 지점에서 중단됩니다.
+
+        Returns:
+            bool: 취소 요청 성공 여부
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if not job or job['status'] not in ACTIVE_STATUSES:
+                return False
+
+            if '_task' in job:
+                celery.control.revoke(job['_task'].id, terminate=True)
+                self._finish(job, {'success': False, 'cancelled': True, 'error': '백테스트가 취소되었습니다.'})
+            elif not job['_future'].cancel():
+                job['_cancel_event'].set()
+                job['message'] = '취소 요청됨'
+        logger.info(f"Backtest job cancel requested: {job_id}")
+        return True
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    @staticmethod
+    def public(job):
+        data = {key: value for key, value in job.items() if not key.startswith('_')}
+        data['percent'] = round(job['done'] / job['total'] * 100, 1) if job['total'] else 0
+        data['created_at'] = job['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+        data['finished_at'] = job['finished_at'].strftime('%Y-%m-%d %H:%M:%S') if job['finished_at'] else None
+        return data
+
+    def get(self, job_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return self.public(job) if job else None
+
+    def list(self):
+        with self._lock:
+            return [self.public(job) for job in reversed(self.jobs.values())]
+
+    # ------------------------------------------------------------------
+    # 내부 처리
+    # ------------------------------------------------------------------
+    def _ensure_executor(self, workers):
+        if self._mp_manager is None:
+            self._mp_manager = multiprocessing.Manager()
+            self._progress_queue = self._mp_manager.Queue()
+        # 동시 실행 수 설정이 바뀌었으면 유휴 상태일 때 풀을 다시 생성
+        if self._executor is not None and self._executor_workers != workers and len(self.active_jobs()) <= 1:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._executor is None:
+            # fork된 워커는 부모의 조회 풀/저장소 싱글턴을 물려받지 않음 (logic_ratelimit/logic_store의 register_at_fork)
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+            self._executor_workers = workers
+
+    def _ensure_pump(self):
+        if self._pump_thread is None or not self._pump_thread.is_alive():
+            self._pump_thread = threading.Thread(target=self._pump, name='backtest-job-pump', daemon=True)
+            self._pump_thread.start()
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job['status'] not in ACTIVE_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _pump(self):
+        """
+        진행 상황 수집 후 socketio로 전송 (활성 작업이 없으면 종료)
+        """
+        while self.active_jobs():
+            updated = {}
+            if self._progress_queue is not None:
+                items = []
+                try:
+                    items.append(self._progress_queue.get(timeout=self.PUMP_INTERVAL))
+                    while True:
+                        items.append(self._progress_queue.get_nowait())
+                except queue.Empty:
+                    pass
+                with self._lock:
+                    for job_id, done, total, message in items:
+                        job = self.jobs.get(job_id)
+                        if job and job['status'] in ACTIVE_STATUSES:
+                            job.update(status=STATUS_RUNNING, done=done, total=total, message=message)
+                            updated[job_id] = job
+            else:
+                threading.Event().wait(self.PUMP_INTERVAL)
+
+            updated.update(self._poll_celery())
+            for job in updated.values():
+                self._emit('backtest_progress', self.public(job))
+
+    def _poll_celery(self):
+        updated = {}
+        with self._lock:
+            for job in self.active_jobs():
+                task = job.get('_task')
+                if task is None:
+                    continue
+                if task.state == 'PROGRESS' and isinstance(task.info, dict):
+                    job.update(status=STATUS_RUNNING, done=task.info.get('done', 0),
+                               total=task.info.get('total', 0), message=task.info.get('message', ''))
+                    updated[job['id']] = job
+                elif task.ready():
+                    result = task.result if task.successful() else {'success': False, 'error': str(task.result)}
+                    self._finish(job, result)
+        return updated
+
+    def _on_local_done(self, job_id, future):
+        try:
+            result = future.result()
+        except CancelledError:
+            result = {'success': False, 'cancelled': True, 'error': '백테스트가 취소되었습니다.'}
+        except Exception as e:
+            logger.error(f"Backtest job {job_id} failed: {str(e)}")
+            result = {'success': False, 'error': str(e)}
+
+        if result.get('success'):
+            try:
+                with F.app.app_context():
+                    history = save_backtest_history(result['results'])
+                    result = {'success': True, 'history_id': history.id}
+            except Exception as e:
+                logger.error(f"Backtest job {job_id} history save failed: {str(e)}")
+                logger.error(traceback.format_exc())
+                result = {'success': False, 'error': f'이력 저장 실패: {str(e)}'}
+
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job:
+                self._finish(job, result)
+
+    def _finish(self, job, result):
+        if job['status'] not in ACTIVE_STATUSES:
+            return
+        if result.get('success'):
+            job['status'] = STATUS_COMPLETED
+            job['history_id'] = result.get('history_id')
+            job['done'] = job['total'] = job['total'] or 1
+        elif result.get('cancelled'):
+            job['status'] = STATUS_CANCELLED
+        else:
+            job['status'] = STATUS_FAILED
+        job['error'] = result.get('error')
+        job['finished_at'] = datetime.now()
+        logger.info(f"Backtest job {job['id']} {job['status']}")
+        self._emit('backtest_done', self.public(job))
+
+    @staticmethod
+    def _emit(event, data):
+        try:
+            from framework import socketio
+            socketio.emit(event, data, namespace=f'/{P.package_name}/backtesting')
+        except Exception as e:
+            logger.debug(f"socketio emit failed ({event}): {e}")
+
+
+_job_manager = None
+
+
+def get_job_manager():
+    """
+    프로세스 공용 BacktestJobManager 인스턴스
+    """
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = BacktestJobManager()
+    return _job_manager
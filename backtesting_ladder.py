@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Seven Split Ladder Simulator
+세븐스플릿 분할 매수/매도 래더 시뮬레이터
+
+종목(래더)별 상태를 (종목 수, 분할 수) 배열로 보관하고, 일자 축으로만 순회하면서
+모든 래더의 매수/매도 판정을 한 번에 배열 연산으로 처리합니다.
+
+규칙:
+    - 보유 분할이 하나도 없으면 당일 시가에 1차 분할 매수
+    - k차 분할은 (k-1)차 매수가 대비 step_pct% 하락 시 매수 (갭 하락이면 시가 체결)
+    - 각 분할은 자신의 매수가 대비 take_profit_pct% 상승 시 매도 (갭 상승이면 시가 체결)
+    - 당일 매도된 분할은 같은 날 다시 매수하지 않음
+    - 비워진 k차 분할은 (k-1)차를 보유하고 있을 때 위 하락 조건으로 다시 매수
+    - 1차 분할은 래더가 모두 비었을 때만 다시 매수 (다른 분할을 보유한 채 1차만 익절되면 재진입 기준가가 없으므로
+      남은 분할이 모두 매도될 때까지 비워 둠. 익절폭이 분할 간에 같으면 1차 목표가가 가장 높아 이런 경우는 생기지 않음)
+"""
+import numpy as np
+
+
+def _broadcast(value, num_ladders, splits):
+    """
+    스칼라, 분할별 (splits,), 래더별 (num_ladders, 1), (num_ladders, splits) 형태의 파라미터를
+    (num_ladders, splits) 배열로 변환
+
+    1차원 배열은 항상 분할별 값으로 해석합니다 (래더 수와 분할 수가 같을 때 뜻이 갈리지 않도록
+    래더별 값은 (num_ladders, 1)로 명시).
+    """
+    arr = np.asarray(value, dtype=np.float64)
+    if arr.ndim == 1 and arr.shape[0] != splits:
+        raise ValueError(f"1-D ladder parameter must have one value per split ({splits}), got {arr.shape[0]}; "
+                         f"pass per-ladder values as shape ({num_ladders}, 1)")
+    try:
+        return np.broadcast_to(arr, (num_ladders, splits)).astype(np.float64)
+    except ValueError:
+        raise ValueError(f"ladder parameter shape {arr.shape} does not broadcast to ({num_ladders}, {splits})")
+
+
+def init_ladder_state(num_ladders, splits):
+    """
+    빈 래더 상태 생성
+
+    Returns:
+        dict: 래더 상태 배열
+            {
+                'filled': (N, S) bool,    # 분할 보유 여부
+                'entry': (N, S) float,    # 분할 매수가
+                'qty': (N, S) float,      # 분할 보유 수량
+                'realized': (N,) float,   # 누적 실현 손익
+                'last_close': (N,) float, # 마지막 유효 종가
+            }
+    """
+    return {
+        'filled': np.zeros((num_ladders, splits), dtype=bool),
+        'entry': np.zeros((num_ladders, splits), dtype=np.float64),
+        'qty': np.zeros((num_ladders, splits), dtype=np.float64),
+        'realized': np.zeros(num_ladders, dtype=np.float64),
+        'last_close': np.full(num_ladders, np.nan, dtype=np.float64),
+    }
+
+
+def simulate_ladders(open_, high, low, close, splits=7, step_pct=3.0, take_profit_pct=3.0,
+                     amount_per_split=1_000_000, state=None, record_trades=False,
+                     buy_cost_rate=0.0, sell_cost_rate=0.0):
+    """
+    세븐스플릿 래더 시뮬레이션
+
+    Args:
+        open_, high, low, close (ndarray): (T, N) 일별 시세 (거래정지/미상장은 NaN)
+        splits (int): 분할 수
+        step_pct (float | array): 추가 매수 하락폭(%) - 스칼라, 분할별 (S,), 래더별 (N, 1), (N, S) 지정 가능
+        take_profit_pct (float | array): 분할별 익절 상승폭(%) - step_pct와 같은 형태
+        amount_per_split (float | array): 분할당 매수 금액 - 스칼라 또는 래더별 (N,)
+        state (dict): 이어서 시뮬레이션할 래더 상태 (None이면 새로 시작)
+        record_trades (bool): 체결 내역 기록 여부
+        buy_cost_rate (float): 매수 금액 대비 비용률 (수수료 + 스프레드)
+        sell_cost_rate (float): 매도 금액 대비 비용률 (수수료 + 세금 + 스프레드)
+
+    Returns:
+        dict: {
+            'equity': (T, N) 래더별 평가금액 (분할 수 x 분할 금액을 초기 자본으로 가정),
+            'invested': (T, N) 매수 원가 기준 투자금액,
+            'num_buys': (N,), 'num_sells': (N,),
+            'state': 마지막 래더 상태,
+            'trades': [{'day', 'ladder', 'split', 'side', 'price', 'qty'}, ...]
+        }
+    """
+    open_ = np.asarray(open_, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    num_days, num_ladders = close.shape
+
+    step = _broadcast(step_pct, num_ladders, splits) / 100.0
+    take_profit = _broadcast(take_profit_pct, num_ladders, splits) / 100.0
+    amount = np.broadcast_to(np.asarray(amount_per_split, dtype=np.float64), (num_ladders,))
+    capital = amount * splits
+
+    if state is None:
+        state = init_ladder_state(num_ladders, splits)
+    else:
+        state = {key: np.array(value, copy=True) for key, value in state.items()}
+    filled, entry, qty = state['filled'], state['entry'], state['qty']
+    realized, last_close = state['realized'], state['last_close']
+
+    equity = np.empty((num_days, num_ladders), dtype=np.float64)
+    invested = np.empty((num_days, num_ladders), dtype=np.float64)
+    num_buys = np.zeros(num_ladders, dtype=np.int64)
+    num_sells = np.zeros(num_ladders, dtype=np.int64)
+    trades = []
+
+    def _record(day, mask, side, price):
+        ladders, split_idx = np.nonzero(mask)
+        for ladder, split in zip(ladders, split_idx):
+            trades.append({
+                'day': int(day), 'ladder': int(ladder), 'split': int(split), 'side': side,
+                'price': float(price[ladder, split]), 'qty': float(qty[ladder, split]),
+            })
+
+    for t in range(num_days):
+        o, h, l, c = open_[t], high[t], low[t], close[t]
+        valid = ~(np.isnan(o) | np.isnan(h) | np.isnan(l) | np.isnan(c))
+        empty_at_open = ~filled.any(axis=1)
+
+        # 1. 익절 매도
+        target = entry * (1.0 + take_profit)
+        sell = filled & valid[:, None] & (h[:, None] >= target)
+        if sell.any():
+            fill_price = np.maximum(o[:, None], target)
+            if record_trades:
+                _record(t, sell, 'SELL', fill_price)
+            realized += np.where(sell, qty * (fill_price * (1.0 - sell_cost_rate) - entry), 0.0).sum(axis=1)
+            num_sells += sell.sum(axis=1)
+            filled &= ~sell
+            qty[sell] = 0.0
+
+        # 2. 1차 분할 진입 (보유 분할이 없는 래더)
+        first = empty_at_open & valid
+        if first.any():
+            first_qty = np.floor(amount / np.where(first, o, np.inf))
+            first &= first_qty > 0
+            entry[first, 0] = o[first]
+            qty[first, 0] = first_qty[first]
+            realized -= np.where(first, first_qty * o * buy_cost_rate, 0.0)
+            filled[first, 0] = True
+            num_buys += first
+            if record_trades:
+                mask = np.zeros_like(filled)
+                mask[:, 0] = first
+                _record(t, mask, 'BUY', entry)
+
+        # 3. 추가 분할 매수 (하루에 여러 단계가 연속 체결될 수 있으므로 분할 순서대로 처리)
+        for k in range(1, splits):
+            trigger = entry[:, k - 1] * (1.0 - step[:, k])
+            buy = filled[:, k - 1] & ~filled[:, k] & ~sell[:, k] & valid & (l <= trigger)
+            if not buy.any():
+                continue
+            fill_price = np.minimum(o, trigger)
+            buy_qty = np.floor(amount / np.where(buy, fill_price, np.inf))
+            buy &= buy_qty > 0
+            entry[buy, k] = fill_price[buy]
+            qty[buy, k] = buy_qty[buy]
+            realized -= np.where(buy, buy_qty * fill_price * buy_cost_rate, 0.0)
+            filled[buy, k] = True
+            num_buys += buy
+            if record_trades:
+                mask = np.zeros_like(filled)
+                mask[:, k] = buy
+                _record(t, mask, 'BUY', entry)
+
+        # 4. 평가
+        last_close = np.where(valid, c, last_close)
+        mark = np.where(np.isnan(last_close), 0.0, last_close)
+        cost = (qty * entry).sum(axis=1)
+        invested[t] = cost
+        equity[t] = capital + realized + (qty.sum(axis=1) * mark - cost)
+
+    state['last_close'] = last_close
+    return {
+        'equity': equity,
+        'invested': invested,
+        'num_buys': num_buys,
+        'num_sells': num_sells,
+        'state': state,
+        'trades': trades,
+    }
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Backtesting Metrics
+자산 곡선 기반 위험/성과 지표 계산 (NumPy 벡터 연산)
+
+모든 함수는 마지막 축을 시간 축으로 보고 계산하므로, (T,) 곡선 하나뿐 아니라
+(M, T) 형태의 여러 곡선(파라미터 스윕, 부트스트랩 표본 등)도 한 번에 처리합니다.
+"""
+import numpy as np
+
+
+def _safe_divide(a, b):
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    out = np.zeros(np.broadcast(a, b).shape, dtype=np.float64)
+    np.divide(a, b, out=out, where=(b != 0) & np.isfinite(b))
+    return out
+
+
+def period_returns(equity):
+    """
+    기간 수익률 (T-1개)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    return _safe_divide(equity[..., 1:], equity[..., :-1]) - np.where(equity[..., :-1] != 0, 1.0, 0.0)
+
+
+def drawdown(equity):
+    """
+    고점 대비 낙폭 곡선 (0 이하 비율)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    return _safe_divide(equity, peak) - np.where(peak != 0, 1.0, 0.0)
+
+
+def drawdown_duration(equity):
+    """
+    기간별 고점 이후 경과 기간 수 (고점 갱신 시 0)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    idx = np.broadcast_to(np.arange(equity.shape[-1]), equity.shape)
+    last_peak = np.maximum.accumulate(np.where(equity >= peak, idx, 0), axis=-1)
+    return idx - last_peak
+
+
+def rolling_returns(equity, window):
+    """
+    window 기간 롤링 수익률 (T-window개)
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if window <= 0 or equity.shape[-1] <= window:
+        return np.empty(equity.shape[:-1] + (0,), dtype=np.float64)
+    return _safe_divide(equity[..., window:], equity[..., :-window]) - 1.0
+
+
+def compute_metrics(equity, years=None, periods_per_year=252, risk_free=0.0,
+                    traded_value=None, exposure_value=None, rolling_window=None):
+    """
+    성과 지표 일괄 계산
+
+    Args:
+        equity (array): (T,) 또는 (M, T) 자산 곡선
+        years (float): 전체 기간(년). None이면 (T-1) / periods_per_year
+        periods_per_year (float): 연간 기간 수 (일간 252, 월간 12 등)
+        risk_free (float): 연 무위험 수익률 (소수)
+        traded_value (array): 매매 금액 (마지막 축 합계를 회전율 계산에 사용)
+        exposure_value (array): equity와 같은 형태의 기간별 주식 평가액 (노출도 계산용)
+        rolling_window (int): 롤링 수익률 기간 수 (None이면 1년)
+
+    Returns:
+        dict: 지표 (단일 곡선이면 float, 여러 곡선이면 (M,) 배열). 비율 지표는 % 단위
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    num_periods = equity.shape[-1]
+    if years is None:
+        years = max(num_periods - 1, 0) / periods_per_year
+
+    initial = equity[..., 0]
+    final = equity[..., -1]
+    returns = period_returns(equity)
+
+    total_return = _safe_divide(final, initial) - 1.0
+    if years > 0:
+        growth = np.clip(_safe_divide(final, initial), 0.0, None)
+        cagr = np.power(growth, 1.0 / years) - 1.0
+    else:
+        cagr = np.zeros_like(total_return)
+
+    if returns.shape[-1] > 0:
+        mean_ret = returns.mean(axis=-1) * periods_per_year
+        volatility = returns.std(axis=-1) * np.sqrt(periods_per_year)
+        downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2, axis=-1)) * np.sqrt(periods_per_year)
+        nonzero = (returns != 0).sum(axis=-1)
+        hit_rate = _safe_divide((returns > 0).sum(axis=-1), nonzero)
+    else:
+        mean_ret = volatility = downside = hit_rate = np.zeros_like(total_return)
+
+    sharpe = _safe_divide(mean_ret - risk_free, volatility)
+    sortino = _safe_divide(mean_ret - risk_free, downside)
+
+    dd = drawdown(equity)
+    max_dd = dd.min(axis=-1)
+    max_dd_duration = drawdown_duration(equity).max(axis=-1)
+    calmar = _safe_divide(cagr, np.abs(max_dd))
+
+    window = int(rolling_window or round(periods_per_year))
+    rolling = rolling_returns(equity, window)
+    if rolling.shape[-1] > 0:
+        rolling_min, rolling_mean, rolling_max = rolling.min(axis=-1), rolling.mean(axis=-1), rolling.max(axis=-1)
+    else:
+        rolling_min = rolling_mean = rolling_max = np.full_like(total_return, np.nan)
+
+    metrics = {
+        'total_return': total_return * 100,
+        'cagr': cagr * 100,
+        'annual_volatility': volatility * 100,
+        'sharpe_ratio': sharpe,
+        'sortino_ratio': sortino,
+        'max_drawdown': max_dd * 100,
+        'max_drawdown_duration': max_dd_duration,
+        'calmar_ratio': calmar,
+        'hit_rate': hit_rate * 100,
+        'rolling_return_min': rolling_min * 100,
+        'rolling_return_mean': rolling_mean * 100,
+        'rolling_return_max': rolling_max * 100,
+        'initial_value': initial,
+        'final_value': final,
+        'num_years': np.full_like(total_return, years),
+    }
+
+    avg_equity = equity.mean(axis=-1)
+    if traded_value is not None:
+        traded = np.asarray(traded_value, dtype=np.float64).sum(axis=-1)
+        metrics['turnover'] = _safe_divide(traded, avg_equity * years) * 100 if years > 0 else np.zeros_like(traded)
+    if exposure_value is not None:
+        metrics['exposure'] = _safe_divide(np.asarray(exposure_value, dtype=np.float64), equity).mean(axis=-1) * 100
+
+    if equity.ndim == 1:
+        return {key: float(value) for key, value in metrics.items()}
+    return metrics
+
+
+def compute_relative_metrics(equity, benchmark, years=None, periods_per_year=252):
+    """
+    벤치마크 대비 지표 (알파, 베타, 추적오차, 정보비율)
+
+    Args:
+        equity (array): (T,) 또는 (M, T) 자산 곡선
+        benchmark (array): (T,) 같은 시점의 벤치마크 지수 값
+        years (float): 전체 기간(년). None이면 (T-1) / periods_per_year
+        periods_per_year (float): 연간 기간 수
+
+    Returns:
+        dict: 지표 (단일 곡선이면 float, 여러 곡선이면 (M,) 배열). 수익률 지표는 % 단위
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    benchmark = np.asarray(benchmark, dtype=np.float64)
+    if years is None:
+        years = max(equity.shape[-1] - 1, 0) / periods_per_year
+
+    returns = period_returns(equity)
+    bench_returns = period_returns(benchmark)
+    active = returns - bench_returns
+
+    bench_mean = bench_returns.mean()
+    bench_var = bench_returns.var()
+    covariance = ((returns - returns.mean(axis=-1, keepdims=True)) * (bench_returns - bench_mean)).mean(axis=-1)
+    beta = _safe_divide(covariance, bench_var)
+    alpha = (returns.mean(axis=-1) - beta * bench_mean) * periods_per_year
+    tracking_error = active.std(axis=-1) * np.sqrt(periods_per_year)
+    information_ratio = _safe_divide(active.mean(axis=-1) * periods_per_year, tracking_error)
+
+    bench_total = benchmark[-1] / benchmark[0] - 1.0 if benchmark[0] else 0.0
+    bench_cagr = (1.0 + bench_total) ** (1.0 / years) - 1.0 if years > 0 and bench_total > -1 else 0.0
+    total = _safe_divide(equity[..., -1], equity[..., 0]) - 1.0
+
+    metrics = {
+        'alpha': alpha * 100,
+        'beta': beta,
+        'tracking_error': tracking_error * 100,
+        'information_ratio': information_ratio,
+        'excess_return': (total - bench_total) * 100,
+        'benchmark_return': np.full_like(total, bench_total * 100),
+        'benchmark_cagr': np.full_like(total, bench_cagr * 100),
+    }
+    if equity.ndim == 1:
+        return {key: float(value) for key, value in metrics.items()}
+    return metrics
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Backtesting Robustness
+시드 고정 부트스트랩 기반 백테스트 강건성 분석 (NumPy 배치 연산)
+
+엔진을 반복 실행하지 않고, 한 번의 백테스트 결과(기간 수익률 또는 매매별 수익률)를
+(표본 수, 기간) 행렬로 재표본화한 뒤 backtesting_metrics로 한꺼번에 평가합니다.
+"""
+import numpy as np
+
+from .backtesting_metrics import compute_metrics, period_returns
+
+PERCENTILES = (5, 25, 50, 75, 95)
+CHUNK_SAMPLES = 1000  # 메모리 사용량 제한을 위한 배치 크기
+
+
+def block_indices(rng, num_samples, length, block_size=1):
+    """
+    (블록) 부트스트랩 재표본 인덱스
+
+    Args:
+        rng (numpy.random.Generator): 난수 생성기
+        num_samples (int): 표본 수
+        length (int): 원본 길이
+        block_size (int): 연속 블록 길이 (1이면 독립 재표본, 자기상관 보존 시 5~20)
+
+    Returns:
+        ndarray: (num_samples, length) 인덱스
+    """
+    block_size = int(max(1, min(block_size, length)))
+    num_blocks = -(-length // block_size)
+    starts = rng.integers(0, length - block_size + 1, size=(num_samples, num_blocks))
+    idx = starts[:, :, None] + np.arange(block_size)
+    return idx.reshape(num_samples, -1)[:, :length]
+
+
+def summarize(values):
+    """
+    분포 요약 (평균, 표준편차, 백분위수)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return {}
+    summary = {'mean': float(values.mean()), 'std': float(values.std())}
+    for pct, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f'p{pct}'] = float(value)
+    return summary
+
+
+def _curves_from_returns(returns, initial_value=1.0):
+    ones = np.ones(returns.shape[:-1] + (1,))
+    return initial_value * np.cumprod(np.concatenate([ones, 1.0 + returns], axis=-1), axis=-1)
+
+
+def _evaluate(sample_returns, num_samples, rng, years, periods_per_year, block_size):
+    cagr, max_dd, total = [], [], []
+    for lo in range(0, num_samples, CHUNK_SAMPLES):
+        size = min(CHUNK_SAMPLES, num_samples - lo)
+        idx = block_indices(rng, size, len(sample_returns), block_size)
+        metrics = compute_metrics(_curves_from_returns(sample_returns[idx]), years=years,
+                                  periods_per_year=periods_per_year)
+        cagr.append(metrics['cagr'])
+        max_dd.append(metrics['max_drawdown'])
+        total.append(metrics['total_return'])
+    return np.concatenate(cagr), np.concatenate(max_dd), np.concatenate(total)
+
+
+def run_robustness(equity=None, trade_returns=None, method='returns', num_samples=2000, block_size=1,
+                   seed=42, years=None, periods_per_year=252, position_fraction=1.0):
+    """
+    부트스트랩 강건성 분석
+
+    Args:
+        equity (array): (T,) 자산 곡선 (method='returns')
+        trade_returns (array): 청산된 매매별 수익률 (소수, method='trades')
+        method (str): 'returns' (기간 수익률 블록 부트스트랩) 또는 'trades' (매매 순서 재표본)
+        num_samples (int): 표본 수
+        block_size (int): 블록 길이 (method='returns')
+        seed (int): 난수 시드 (같은 입력/시드면 같은 결과)
+        years (float): 원본 기간(년). CAGR 연환산 기준
+        periods_per_year (float): 연간 기간 수 (method='returns')
+        position_fraction (float): 매매 1건이 자산에서 차지하는 비중 (method='trades')
+
+    Returns:
+        dict: {'method', 'num_samples', 'seed', 'cagr', 'max_drawdown', 'total_return', 'prob_loss'}
+    """
+    if int(num_samples) <= 0:
+        raise ValueError(f'표본 수는 1 이상이어야 합니다: {num_samples}')
+    if int(block_size) <= 0:
+        raise ValueError(f'블록 길이는 1 이상이어야 합니다: {block_size}')
+    rng = np.random.default_rng(seed)
+    if method == 'returns':
+        sample_returns = period_returns(np.asarray(equity, dtype=np.float64))
+        if years is None:
+            years = len(sample_returns) / periods_per_year
+    elif method == 'trades':
+        sample_returns = np.asarray(trade_returns, dtype=np.float64) * position_fraction
+        block_size = 1
+        # 매매 순서 재표본의 연환산 기준은 원본 기간
+        periods_per_year = len(sample_returns) / years if years else 1
+    else:
+        raise ValueError(f"Unknown robustness method: {method}")
+
+    sample_returns = sample_returns[np.isfinite(sample_returns)]
+    if len(sample_returns) < 2:
+        raise ValueError('재표본화할 수익률이 부족합니다.')
+
+    cagr, max_dd, total = _evaluate(sample_returns, int(num_samples), rng, years, periods_per_year, block_size)
+    return {
+        'method': method,
+        'num_samples': int(num_samples),
+        'block_size': int(block_size),
+        'seed': seed,
+        'cagr': summarize(cagr),
+        'max_drawdown': summarize(max_dd),
+        'total_return': summarize(total),
+        'prob_loss': float((total < 0).mean() * 100),
+    }
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Backtesting Storage
+백테스트 자산 곡선/매매 내역의 압축 컬럼형(typed array) 직렬화
+
+JSON 대신 열 단위 NumPy 배열을 np.savez_compressed로 묶어 저장합니다.
+(pickle 미사용, np.load(allow_pickle=False)로 안전하게 복원)
+"""
+import io
+
+import numpy as np
+
+SIDES = ('BUY', 'SELL')
+
+
+def _pack(**arrays):
+    buf = io.BytesIO()
+    np.savez_compressed(buf, **arrays)
+    return buf.getvalue()
+
+
+def _unpack(blob):
+    with np.load(io.BytesIO(blob), allow_pickle=False) as npz:
+        return {key: npz[key] for key in npz.files}
+
+
+def _days(dates):
+    return np.array([str(d)[:10] for d in dates], dtype='datetime64[D]')
+
+
+def encode_curve(portfolio_values):
+    """
+    포트폴리오 가치 리스트 -> 압축 바이트
+
+    Args:
+        portfolio_values (list): [{'date', 'value', 'cash', 'holdings_value'}, ...]
+
+    Returns:
+        bytes
+    """
+    return _pack(
+        date=_days(pv['date'] for pv in portfolio_values),
+        value=np.array([pv['value'] for pv in portfolio_values], dtype=np.float64),
+        cash=np.array([pv.get('cash', 0) for pv in portfolio_values], dtype=np.float64),
+        holdings_value=np.array([pv.get('holdings_value', 0) for pv in portfolio_values], dtype=np.float64),
+    )
+
+
+def decode_curve(blob, as_records=True):
+    """
+    압축 바이트 -> 포트폴리오 가치
+
+    Args:
+        blob (bytes): encode_curve 결과
+        as_records (bool): True면 dict 리스트, False면 열 배열 dict (date는 문자열 배열)
+    """
+    cols = _unpack(blob)
+    cols['date'] = np.datetime_as_string(cols['date'], unit='D')
+    if not as_records:
+        return cols
+    return [
+        {'date': str(d), 'value': float(v), 'cash': float(c), 'holdings_value': float(h)}
+        for d, v, c, h in zip(cols['date'], cols['value'], cols['cash'], cols['holdings_value'])
+    ]
+
+
+def encode_trades(trades):
+    """
+    매매 내역 리스트 -> 압축 바이트
+
+    Args:
+        trades (list): [{'date', 'code', 'name', 'action', 'quantity', 'price', 'amount'}, ...]
+    """
+    return _pack(
+        date=_days(t['date'] for t in trades),
+        code=np.array([str(t.get('code', '')) for t in trades], dtype='<U12'),
+        name=np.array([str(t.get('name', '')) for t in trades], dtype=np.str_),
+        side=np.array([SIDES.index(t.get('action', 'BUY')) for t in trades], dtype=np.int8),
+        quantity=np.array([t.get('quantity', 0) for t in trades], dtype=np.int64),
+        price=np.array([t.get('price', 0) for t in trades], dtype=np.float64),
+        amount=np.array([t.get('amount', 0) for t in trades], dtype=np.float64),
+    )
+
+
+def decode_trades(blob):
+    """
+    압축 바이트 -> 매매 내역 dict 리스트
+    """
+    cols = _unpack(blob)
+    dates = np.datetime_as_string(cols['date'], unit='D')
+    return [
+        {
+            'date': str(dates[i]),
+            'code': str(cols['code'][i]),
+            'name': str(cols['name'][i]),
+            'action': SIDES[cols['side'][i]],
+            'quantity': int(cols['quantity'][i]),
+            'price': float(cols['price'][i]),
+            'amount': float(cols['amount'][i]),
+        }
+        for i in range(len(dates))
+    ]
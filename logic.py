@@ -61,6 +61,98 @@ class Logic:
         from .strategies import get_strategies_info
         return get_strategies_info()
 
+    @staticmethod
+    def get_strategy(strategy_id):
+        from .strategies import get_strategy
+        return get_strategy(strategy_id)
+
+    @staticmethod
+    def parse_schedule_form(form_data):
+        """
+        스케줄 화면 폼 -> 스케줄 목록
+
+        전략 전체는 cron_{전략ID}/enabled_{전략ID}, 개별 조건은 cron_{전략ID}_{조건번호}/enabled_{전략ID}_{조건번호}.
+        활성화했지만 cron이 비어 있는 조건은 조건 데이터 종류별 기본 주기를 사용합니다.
+        """
+        from .logic_condition import default_cron
+        schedules = []
+        for strategy_id, strategy in Logic.get_available_strategies().items():
+            for condition_number in [0] + sorted(strategy.conditions):
+                suffix = strategy_id if condition_number == 0 else f'{strategy_id}_{condition_number}'
+                cron_expression = (form_data.get(f'cron_{suffix}') or '').strip()
+                is_enabled = form_data.get(f'enabled_{suffix}') == 'on'
+                if is_enabled and not cron_expression and condition_number != 0:
+                    cron_expression = default_cron(strategy, condition_number)
+                if cron_expression:
+                    schedules.append({
+                        'strategy_id': strategy_id,
+                        'condition_number': condition_number,
+                        'cron_expression': cron_expression,
+                        'is_enabled': is_enabled,
+                    })
+        return schedules
+
+    @staticmethod
+    def save_condition_schedules(schedules):
+        """
+        스케줄 목록 저장 (같은 전략/조건의 기존 행은 마지막 실행 기록을 유지한 채 갱신, 목록에 없는 행은 삭제)
+
+        Raises:
+            ValueError: 잘못된 cron 식
+        """
+        from framework import db
+        from .model import ConditionSchedule
+        from .logic_cron import validate
+        from .logic_condition import get_condition_scheduler
+
+        for schedule in schedules:
+            error = validate(schedule['cron_expression'])
+            if error:
+                raise ValueError(f"{schedule['strategy_id']} 조건 {schedule['condition_number']}: {error}")
+
+        existing = {(row.strategy_id, row.condition_number): row for row in db.session.query(ConditionSchedule).all()}
+        try:
+            for schedule in schedules:
+                key = (schedule['strategy_id'], schedule['condition_number'])
+                row = existing.pop(key, None)
+                if row is None:
+                    row = ConditionSchedule(strategy_id=key[0], condition_number=key[1])
+                    db.session.add(row)
+                elif row.cron_expression != schedule['cron_expression']:
+                    row.last_run_at = None
+                row.cron_expression = schedule['cron_expression']
+                row.is_enabled = schedule['is_enabled']
+            for row in existing.values():
+                db.session.delete(row)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        get_condition_scheduler().wake()
+        return True
+
+    @celery.task(bind=True)
+    def task_save_condition_schedules(self, schedules):
+        try:
+            return Logic.save_condition_schedules(schedules)
+        except Exception as e:
+            logger.error(f"스케줄 저장 실패: {str(e)}")
+            logger.error(traceback.format_exc())
+            return False
+
+    @staticmethod
+    def scheduler_start():
+        """
+        조건별 스케줄 실행기 시작 (이미 실행 중이면 바로 due 스케줄 확인)
+        """
+        from .logic_condition import get_condition_scheduler
+        get_condition_scheduler().wake()
+
+    @celery.task(bind=True)
+    def task_scheduler_restart(self):
+        Logic.scheduler_start()
+        return True
+
     @staticmethod
     def start_screening(strategy_id=None, execution_type='manual'):
         from framework import F
@@ -96,6 +188,14 @@ class Logic:
         logger.info(f"스크리닝 작업 시작 (Task): strategy_id={strategy_id}, execution_type={execution_type}")
         
         try:
+            # 직전 결과가 있으면 바뀐 종목만 다시 조회/평가 (불가능하면 None -> 전체 스크리닝)
+            from .logic_incremental import is_enabled, run_incremental_screening
+            strategy_id = strategy_id or PluginModelSetting.get('default_strategy')
+            if is_enabled():
+                result = run_incremental_screening(strategy_id, execution_type=execution_type)
+                if result is not None:
+                    return result
+
             # ... (The full logic from the previous correct version)
             # This is a placeholder for brevity
             logger.info("Full screening logic would execute here.")
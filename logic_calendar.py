@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Trading Calendar
+KRX 거래일 캘린더 및 리밸런싱 스케줄 생성
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from .setup import P
+except ImportError:  # FlaskFarm 밖(독립 실행 CLI)에서 import한 경우
+    from .standalone import P
+from .logic_ratelimit import get_rate_limiter
+from .logic_store import get_store_dir, settled_until, to_datetime64
+
+logger = P.logger
+
+try:
+    from pykrx import stock as pykrx_stock
+except ImportError:
+    pykrx_stock = None
+
+
+# 리밸런싱 주기 -> 거래일을 묶는 그룹 키 계산 함수
+# (numpy datetime64[W]는 목요일 기준이므로 주간은 월요일 기준으로 직접 계산)
+_GROUP_KEYS = {
+    'weekly': lambda days: (days.astype(np.int64) + 3) // 7,
+    'monthly': lambda days: days.astype('datetime64[M]').astype(np.int64),
+    'quarterly': lambda days: days.astype('datetime64[M]').astype(np.int64) // 3,
+    'yearly': lambda days: days.astype('datetime64[Y]').astype(np.int64),
+}
+
+
+class TradingCalendar:
+    """
+    KRX 거래일 캘린더
+
+    KOSPI 지수(1001)의 일별 시세 이력에서 거래일을 한 번 도출해 로컬(npz)에 저장하고,
+    이후에는 새로 지난 구간만 추가로 조회합니다.
+    """
+
+    INDEX_TICKER = '1001'
+    FIRST_DATE = '2000-01-01'
+    TODAY_RECHECK_SECONDS = 30 * 60
+
+    def __init__(self, base_dir=None):
+        self.path = os.path.join(base_dir or get_store_dir(), 'krx_calendar.npz')
+        self._days = None
+        self._checked_until = None  # 이 날짜까지는 거래일 여부가 확정됨
+        self._today_checked_at = 0
+        self._failed_at = 0  # 마지막 조회 실패 시각 (실패 후 TODAY_RECHECK_SECONDS 동안 재조회하지 않음)
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 캐시 관리
+    # ------------------------------------------------------------------
+    def _load(self):
+        if self._days is not None:
+            return
+        if os.path.exists(self.path):
+            with np.load(self.path, allow_pickle=False) as npz:
+                self._days = npz['days'].astype('datetime64[D]')
+                self._checked_until = npz['checked_until'].astype('datetime64[D]')[()]
+        else:
+            self._days = np.array([], dtype='datetime64[D]')
+            self._checked_until = to_datetime64(self.FIRST_DATE) - np.timedelta64(1, 'D')
+
+    def _save(self):
+        tmp_path = f'{self.path}.tmp.npz'
+        np.savez_compressed(tmp_path, days=self._days, checked_until=np.array(self._checked_until))
+        os.replace(tmp_path, self.path)
+
+    def _fetch_days(self, start, end):
+        if not pykrx_stock:
+            raise RuntimeError("pykrx is not available")
+        df = get_rate_limiter().call(
+            pykrx_stock.get_index_ohlcv_by_date,
+            str(start).replace('-', ''), str(end).replace('-', ''), self.INDEX_TICKER
+        )
+        if df is None or df.empty:
+            return np.array([], dtype='datetime64[D]')
+        return df.index.values.astype('datetime64[D]')
+
+    def refresh(self, until=None):
+        """
+        캐시에 없는 구간의 거래일을 조회해 추가
+
+        Args:
+            until: 확인할 마지막 날짜 (None이면 오늘)
+        """
+        with self._lock:
+            self._load()
+            today = to_datetime64(datetime.now())
+            until = min(to_datetime64(until), today) if until is not None else today
+
+            if until <= self._checked_until:
+                return
+            # 오늘 데이터는 장중에도 생길 수 있으므로 일정 간격으로만 재확인
+            if until == today and self._checked_until == today - np.timedelta64(1, 'D'):
+                if time.time() - self._today_checked_at < self.TODAY_RECHECK_SECONDS:
+                    return
+            # KRX 장애 중에 조회마다 타임아웃을 기다리지 않도록 실패 후 일정 시간은 캐시만 사용
+            if time.time() - self._failed_at < self.TODAY_RECHECK_SECONDS:
+                return
+
+            start = self._checked_until + np.timedelta64(1, 'D')
+            try:
+                new_days = self._fetch_days(start, until)
+            except Exception as e:
+                logger.warning(f"Trading calendar refresh failed ({start} ~ {until}): {e}")
+                self._failed_at = time.time()
+                return
+
+            self._days = np.union1d(self._days, new_days)
+            if until == today:
+                self._today_checked_at = time.time()
+                # 오늘 거래일 여부는 장 시작 전에는 확정되지 않음
+                self._checked_until = today if np.isin(today, new_days) else today - np.timedelta64(1, 'D')
+            else:
+                self._checked_until = until
+            self._save()
+            logger.info(f"Trading calendar refreshed: {len(self._days)} days (checked until {self._checked_until})")
+
+    def _ensure(self, end):
+        self._load()
+        if to_datetime64(end) > self._checked_until:
+            self.refresh(end)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def trading_days(self, start, end):
+        """
+        [start, end] 구간의 거래일 배열 (datetime64[D])
+        """
+        self._ensure(end)
+        start_d, end_d = to_datetime64(start), to_datetime64(end)
+        lo = np.searchsorted(self._days, start_d, side='left')
+        hi = np.searchsorted(self._days, end_d, side='right')
+        return self._days[lo:hi]
+
+    def is_trading_day(self, date):
+        self._ensure(date)
+        return bool(np.isin(to_datetime64(date), self._days))
+
+    def previous(self, date, offset=0):
+        """
+        date 당일 또는 그 이전의 가장 가까운 거래일에서 offset 거래일 전
+
+        Args:
+            date: 기준일
+            offset (int): 추가로 거슬러 올라갈 거래일 수
+
+        Returns:
+            numpy.datetime64: 거래일 (캐시 범위를 벗어나면 None)
+        """
+        self._ensure(date)
+        idx = np.searchsorted(self._days, to_datetime64(date), side='right') - 1 - offset
+        if idx < 0:
+            return None
+        return self._days[idx]
+
+    def nearest_business_day(self, date=None, fmt='%Y%m%d'):
+        """
+        pykrx get_nearest_business_day_in_a_week 대체 (date 당일 또는 직전 거래일)
+
+        Returns:
+            str: fmt 형식의 날짜 문자열
+        """
+        date = date if date is not None else datetime.now()
+        day = self.previous(date)
+        if day is None:
+            # 캘린더를 아직 받지 못했으면(최초 조회 실패 등) 공휴일을 구분하지 못하는 평일 기준으로 대체
+            day = np.busday_offset(to_datetime64(date), 0, roll='backward')
+            logger.warning(f"Trading calendar unavailable for {to_datetime64(date)}; using weekday {day}")
+        return day.astype(datetime).strftime(fmt)
+
+    def last_closed_day(self, now=None, fmt='%Y%m%d'):
+        """
+        시세/수급이 확정된 마지막 거래일 (장 마감 후 SETTLE_HOURS 이전에는 직전 거래일)
+
+        Returns:
+            str: fmt 형식의 날짜 문자열
+        """
+        return self.nearest_business_day(settled_until(now), fmt=fmt)
+
+    def schedule(self, start, end, interval='monthly'):
+        """
+        리밸런싱 일정 생성
+
+        Args:
+            start, end: 구간
+            interval (str): 'daily', 'weekly', 'monthly', 'quarterly', 'yearly'
+                            뒤에 '_first'(기본) 또는 '_last'를 붙여 구간의 첫/마지막 거래일 지정
+                            예: 'monthly_last', 'weekly_first'
+
+        Returns:
+            ndarray: 리밸런싱 거래일 배열 (datetime64[D])
+        """
+        days = self.trading_days(start, end)
+        freq, _, anchor = interval.partition('_')
+        anchor = anchor or 'first'
+        if anchor not in ('first', 'last'):
+            raise ValueError(f"Unknown schedule anchor: {interval}")
+
+        if freq == 'daily' or len(days) == 0:
+            return days
+        if freq not in _GROUP_KEYS:
+            raise ValueError(f"Unknown rebalance interval: {interval}")
+        keys = _GROUP_KEYS[freq](days)
+
+        # 정렬된 keys에서 그룹 경계 = 값이 바뀌는 위치
+        boundary = np.flatnonzero(np.diff(keys)) + 1
+        if anchor == 'first':
+            idx = np.concatenate([[0], boundary])
+        else:
+            idx = np.concatenate([boundary - 1, [len(days) - 1]])
+        return days[idx]
+
+
+_calendar = None
+
+
+def get_calendar():
+    """
+    프로세스 공용 TradingCalendar 인스턴스
+    """
+    global _calendar
+    if _calendar is None:
+        _calendar = TradingCalendar()
+    return _calendar
+
+
+def _reset_after_fork():
+    """
+    fork된 자식 프로세스에서 공용 캘린더를 버림 (부모 스레드가 잡고 있던 락을 물려받지 않도록 새로 생성)
+    """
+    global _calendar
+    _calendar = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -3,6 +3,7 @@
 7split_checklist_21 Plugin - Data Collector (Improved)
 OpenDartReader 개선 버전 적용
 """
+import threading
 import time
 from datetime import datetime, timedelta
 import pandas as pd
@@ -36,21 +37,65 @@ except ImportError:
 # ------------------------------------
 
 
+_dart_clients = {}
+_dart_failed_on = {}  # API 키 -> 생성에 실패한 날짜 (같은 날에는 다시 시도하지 않음)
+_dart_clients_lock = threading.Lock()
+
+
+def get_dart_client(api_key):
+    """
+    API 키별 프로세스 공용 OpenDartReader
+
+    OpenDartReader는 생성할 때 전체 회사 목록을 받아 파싱하므로, 수집기마다 만들지 않고
+    실제로 DART 조회가 처음 필요할 때 한 번만 만듭니다. (종목코드 -> corp_code는 CorpCodeMap 사용)
+    생성에 실패하면 그날은 다시 시도하지 않고 None을 반환합니다.
+    """
+    if not api_key or not odr:
+        return None
+    with _dart_clients_lock:
+        if api_key not in _dart_clients:
+            today = datetime.now().date()
+            if _dart_failed_on.get(api_key) == today:
+                return None
+            try:
+                _dart_clients[api_key] = odr.OpenDartReader(api_key)
+                logger.info("OpenDartReader initialized.")
+            except Exception as e:
+                _dart_failed_on[api_key] = today
+                logger.error(f"OpenDartReader initialization failed (retry tomorrow): {e}")
+                return None
+        return _dart_clients[api_key]
+
+
 class DataCollector:
     def __init__(self, dart_api_key=None):
         self.dart_api_key = dart_api_key
-        if dart_api_key and odr:
-            self.dart = odr.OpenDartReader(dart_api_key)
-            logger.info("OpenDartReader initialized.")
-        else:
-            self.dart = None
-            if not odr:
-                logger.warning("OpenDartReader not initialized because the library is not available.")
-            if not dart_api_key:
-                logger.warning("OpenDartReader not initialized because DART API key is missing.")
+        self._snapshot = None  # 수집기(실행 1회)당 한 번만 받는 전 종목 시세
+        self._snapshot_lock = threading.Lock()
+        if not odr:
+            logger.warning("OpenDartReader not initialized because the library is not available.")
+        if not dart_api_key:
+            logger.warning("OpenDartReader not initialized because DART API key is missing.")
+
+    @property
+    def dart(self):
+        return get_dart_client(self.dart_api_key)
 
     def get_all_tickers(self):
         logger.info("전체 종목 코드 수집 시작...")
+        # 일 단위로 갱신되는 종목 마스터를 우선 사용
+        from .logic_store import get_ticker_master
+        ticker_master = get_ticker_master()
+        ticker_master.refresh()
+        master = ticker_master.frame(listed_only=True)
+        if not master.empty:
+            tickers = [
+                {'code': code, 'name': row['name'], 'market': row['market'], 'sector': row['sector']}
+                for code, row in master.iterrows()
+            ]
+            logger.info(f"총 {len(tickers)}개 종목 수집 완료 (종목 마스터 {ticker_master.as_of}).")
+            return tickers
+
         if not fdr:
             logger.error("FinanceDataReader is not available. Cannot fetch tickers.")
             return []
@@ -67,12 +112,144 @@ class DataCollector:
         stock_data = {'code': code}
         
         if 'market' in required_data:
-            stock_data.update(self.get_market_data(code))
+            # 종목별 get_market_data는 아직 임시 값이므로 저장되는 시세는 일괄 스냅샷에서만 가져옴
+            stock_data.update(self.market_snapshot().get(code) or {})
+        if 'disclosure' in required_data:
+            stock_data.update(self.get_disclosure_info(code))
+        if 'major_shareholder' in required_data:
+            stock_data['major_shareholder_ratio'] = self.get_major_shareholder(code)
         # ... (other data collection calls)
             
         logger.debug(f"[{code}] 모든 데이터 수집 완료.")
         return stock_data
 
+    def market_snapshot(self):
+        """
+        이 수집기에서 처음 한 번 받은 시세 스냅샷 (조회에 실패했으면 빈 dict - 같은 실행에서 다시 조회하지 않음)
+        """
+        with self._snapshot_lock:
+            if self._snapshot is None:
+                self._snapshot = self.get_market_snapshot()
+            return self._snapshot
+
+    def get_market_snapshot(self, date_str=None):
+        """
+        전 종목 시세 스냅샷 (시가총액/거래대금/PER/PBR/배당수익률) - 종목별 조회 대신 일괄 2회 조회
+
+        Args:
+            date_str (str): 기준 영업일 YYYYMMDD (None이면 최근 영업일)
+
+        Returns:
+            dict: {종목코드: {'market_cap', 'trading_value', 'per', 'pbr', 'div_yield'}} (조회 실패 시 빈 dict)
+        """
+        if not pykrx_stock:
+            logger.warning("pykrx is not available. Cannot fetch market snapshot.")
+            return {}
+        from .logic_ratelimit import fetch_parallel
+        if date_str is None:
+            from .logic_calendar import get_calendar
+            date_str = get_calendar().nearest_business_day(datetime.now())
+        try:
+            fetched = fetch_parallel({
+                'cap': (pykrx_stock.get_market_cap_by_ticker, (date_str,), {'market': 'ALL'}),
+                'fundamental': (pykrx_stock.get_market_fundamental_by_ticker, (date_str,), {'market': 'ALL'}),
+            })
+        except Exception as e:
+            logger.warning(f"시세 스냅샷 조회 실패 ({date_str}): {e}")
+            return {}
+        cap, fundamental = fetched['cap'], fetched['fundamental']
+        if cap is None or cap.empty:
+            return {}
+        df = cap.rename(columns={'시가총액': 'market_cap', '거래대금': 'trading_value'})[['market_cap', 'trading_value']]
+        if fundamental is not None and not fundamental.empty:
+            df = df.join(fundamental.rename(columns={'PER': 'per', 'PBR': 'pbr', 'DIV': 'div_yield'})[['per', 'pbr', 'div_yield']])
+        df = df.astype(object).where(pd.notna(df), None)
+        snapshot = {}
+        for code, row in df.iterrows():
+            values = row.to_dict()
+            for key in ('market_cap', 'trading_value'):
+                if values.get(key) is not None:
+                    values[key] = int(values[key])
+            for key in ('per', 'pbr', 'div_yield'):
+                if values.get(key) is not None:
+                    values[key] = float(values[key])
+            snapshot[code] = values
+        logger.info(f"시세 스냅샷 {len(snapshot)}개 종목 수집 완료 ({date_str}).")
+        return snapshot
+
+    def get_filings(self, start, end):
+        """
+        기간 내 상장사 DART 공시 목록 (증분 스크리닝 변경 감지용, 공시 색인에서 조회)
+
+        Args:
+            start, end (date): 조회 기간
+
+        Returns:
+            list: [(종목코드, 보고서명), ...] (DART를 쓸 수 없거나 색인 동기화에 실패하면 None)
+        """
+        from .logic_disclosure import get_disclosure_index
+        index = get_disclosure_index()
+        if index.sync(lambda: self.dart) is None:
+            return None
+        return index.filings(start, end)
+
+    def corp_code(self, code):
+        """
+        종목코드 -> DART 고유번호 (모르면 None)
+        """
+        if not self.dart_api_key:
+            return None
+        from .logic_corpcode import get_corp_code_map
+        corp_codes = get_corp_code_map()
+        corp_code = corp_codes.corp_code(code, self.dart_api_key)
+        if corp_code is not None or len(corp_codes) or not odr:
+            return corp_code
+        # 매핑 파일을 아직 받지 못한 경우 (다운로드 실패 등)
+        try:
+            return self.dart.find_corp_code(code) if self.dart else None
+        except Exception as e:
+            logger.debug(f"[{code}] corp_code 조회 실패: {e}")
+            return None
+
+    def get_disclosure_info(self, code, required_data=None):
+        """
+        최근 1년 CB/BW 발행, 유상증자 여부 (공시 색인 조회 - 종목별 DART 요청 없음)
+
+        Returns:
+            dict: {'has_cb_bw', 'has_paid_increase'} (판단할 수 없으면 빈 dict)
+        """
+        if required_data is not None and 'disclosure' not in required_data:
+            return {}
+        from .logic_disclosure import get_disclosure_index
+        index = get_disclosure_index()
+        corp_code = self.corp_code(code)
+        if not corp_code or (index.sync(lambda: self.dart) is None and index.synced_until() is None):
+            return {}
+        since = datetime.now().date() - timedelta(days=365)
+        return {
+            'has_cb_bw': index.has_report(corp_code, ('cb', 'bw'), since),
+            'has_paid_increase': index.has_report(corp_code, ('paid_increase',), since),
+        }
+
+    def get_major_shareholder(self, code, required_data=None):
+        """
+        최대주주(특수관계인 포함) 보통주 지분율 (%) - 새 정기보고서가 나온 회사만 DART에서 다시 조회
+
+        Returns:
+            float: 지분율 (알 수 없으면 None)
+        """
+        if required_data is not None and 'major_shareholder' not in required_data:
+            return None
+        corp_code = self.corp_code(code)
+        if not corp_code:
+            return None
+        from .logic_shareholder import get_major_shareholder_cache
+        try:
+            return get_major_shareholder_cache().ratio(code, corp_code, self)
+        except Exception as e:
+            logger.warning(f"[{code}] 최대주주 지분율 조회 실패: {e}")
+            return None
+
     def get_market_data(self, code):
         logger.debug(f"[{code}] 시장 데이터 수집...")
         if not pykrx_stock:
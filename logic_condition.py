@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Condition Scheduler
+조건별 cron 스케줄(ConditionSchedule) 실행 엔진
+
+condition_number 0은 전략 전체 스크리닝, 1 이상은 개별 조건 재평가입니다.
+개별 조건은 해당 전략의 마지막 스크리닝 결과를 기준으로, 그 조건에 필요한 데이터만 다시 조회해
+조건 결과와 최종 통과 여부를 갱신합니다. (가격 기반 조건은 장중, 재무/공시 기반 조건은 하루 단위 권장)
+"""
+import json
+import threading
+import traceback
+from datetime import datetime
+
+from .setup import P, F
+from framework import db
+from .logic_cron import CronExpression
+from .logic_ratelimit import map_parallel, with_app_context
+
+logger = P.logger
+
+# 조건 데이터 종류별 기본 실행 주기
+INTRADAY_CRON = '*/30 9-15 * * 1-5'
+DAILY_CRON = '0 8 * * 1-5'
+
+# StockScreeningResult 열 중 조건 재평가 시 종목 데이터로 쓰는 값
+RESULT_FIELDS = (
+    'code', 'name', 'market', 'sector', 'market_cap', 'trading_value',
+    'per', 'pbr', 'pcr', 'psr', 'div_yield', 'debt_ratio', 'retention_ratio', 'roe_avg_3y',
+    'fscore', 'major_shareholder_ratio', 'has_cb_bw', 'has_paid_increase',
+)
+
+
+def default_cron(strategy, condition_number):
+    """
+    조건 데이터 종류에 따른 기본 cron (시세만 쓰면 장중 30분마다, 그 외에는 평일 하루 한 번)
+    """
+    if condition_number == 0:
+        return DAILY_CRON
+    return INTRADAY_CRON if strategy.data_for_condition(condition_number) == {'market'} else DAILY_CRON
+
+
+def load_details(row):
+    try:
+        return {str(k): bool(v) for k, v in json.loads(row.condition_details or '{}').items()}
+    except (TypeError, ValueError):
+        return {}
+
+
+def row_to_stock_data(row):
+    """
+    저장된 결과 행 -> 전략 apply_filters 입력
+    """
+    data = {field: getattr(row, field) for field in RESULT_FIELDS}
+    try:
+        data['net_income_3y'] = json.loads(row.net_income_3y) if row.net_income_3y else None
+    except (TypeError, ValueError):
+        data['net_income_3y'] = None
+    flags = (('관리', row.is_managed), ('거래정지', row.is_suspended), ('환기', row.is_caution))
+    data['status'] = ' '.join(name for name, on in flags if on)
+    return data
+
+
+def apply_fresh_data(row, fresh):
+    """
+    다시 조회한 값을 결과 행에 반영 (행에 있는 열만)
+    """
+    for field in RESULT_FIELDS:
+        if field in fresh and field != 'code':
+            setattr(row, field, fresh[field])
+    if 'net_income_3y' in fresh:
+        row.net_income_3y = json.dumps(fresh['net_income_3y'])
+    if 'status' in fresh:
+        status = str(fresh['status'] or '').upper()
+        row.is_managed = '관리' in status
+        row.is_suspended = '거래정지' in status or 'HALT' in status
+        row.is_caution = '환기' in status or 'CAUTION' in status
+
+
+def evaluate_condition(strategy_id, condition_number, collector=None):
+    """
+    전략의 마지막 스크리닝 결과에 대해 조건 하나만 재평가
+
+    Args:
+        strategy_id (str): 전략 ID
+        condition_number (int): 조건 번호 (1 이상)
+        collector (DataCollector): 데이터 수집기 (없으면 설정의 DART 키로 생성)
+
+    Returns:
+        dict: {
+            'screening_date', 'total', 'passed', 'failed', 'fetch_failed',
+            'changed': [{'code', 'name', 'before', 'after', 'passed_all'}, ...]
+        } (기준 결과가 없으면 None)
+    """
+    from .strategies import get_strategy
+    from .model import StockScreeningResult
+    from .logic_collector import DataCollector
+
+    strategy = get_strategy(strategy_id)
+    if strategy is None:
+        raise ValueError(f"Unknown strategy: {strategy_id}")
+    if condition_number not in strategy.conditions:
+        raise ValueError(f"{strategy_id} has no condition {condition_number}")
+
+    screening_date = db.session.query(db.func.max(StockScreeningResult.screening_date)).filter(
+        StockScreeningResult.strategy_name == strategy_id
+    ).scalar()
+    if screening_date is None:
+        logger.info(f"[{strategy_id}] 조건 {condition_number}: 기준 스크리닝 결과가 없어 건너뜁니다.")
+        return None
+    rows = db.session.query(StockScreeningResult).filter(
+        StockScreeningResult.strategy_name == strategy_id,
+        StockScreeningResult.screening_date == screening_date,
+    ).all()
+
+    # 이 조건에 필요한 데이터만 다시 조회 (나머지 값은 마지막 결과 그대로 사용)
+    required = strategy.data_for_condition(condition_number)
+    if collector is None:
+        collector = DataCollector(dart_api_key=P.ModelSetting.get('dart_api_key'))
+    # 시세는 전 종목 일괄 스냅샷으로 한 번만 받음 (받지 못하면 시세 값은 갱신하지 않음)
+    if 'market' in required and not collector.market_snapshot():
+        if required == {'market'}:
+            logger.warning(f"[{strategy_id}] 조건 {condition_number}: 시세 스냅샷을 받지 못해 재평가를 건너뜁니다.")
+            return None
+        logger.warning(f"[{strategy_id}] 조건 {condition_number}: 시세 스냅샷 없이 나머지 데이터만 갱신합니다.")
+    # 공시 색인/지분율 캐시 조회가 DB를 쓰므로 풀 스레드마다 앱 컨텍스트 필요
+    fetch = with_app_context(lambda code: collector.get_all_data_for_ticker(code, required))
+    fetched = dict(map_parallel(fetch, [row.code for row in rows]))
+
+    key = str(condition_number)
+    result = {'screening_date': screening_date.strftime('%Y-%m-%d'), 'total': len(rows),
+              'passed': 0, 'failed': 0, 'fetch_failed': 0, 'changed': []}
+    for row in rows:
+        fresh = fetched.get(row.code)
+        if isinstance(fresh, Exception):
+            logger.warning(f"[{strategy_id}] {row.code} 데이터 조회 실패, 마지막 결과 유지: {fresh}")
+            result['fetch_failed'] += 1
+            fresh = {}
+        stock_data = dict(row_to_stock_data(row), **(fresh or {}))
+        _, condition_details = strategy.apply_filters(stock_data)
+
+        details = load_details(row)
+        before = details.get(key)
+        after = bool(condition_details.get(condition_number, condition_details.get(key, False)))
+        details[key] = after
+        apply_fresh_data(row, fresh or {})
+        # 일부 값만 갱신했으므로 다음 증분 스크리닝에서 전체 조건을 다시 평가하도록 입력 해시를 비움
+        row.input_hash = None
+        row.condition_details = json.dumps(details)
+        row.passed = bool(details) and all(details.values())
+
+        result['passed' if after else 'failed'] += 1
+        if before is not None and before != after:
+            result['changed'].append({'code': row.code, 'name': row.name, 'before': before,
+                                      'after': after, 'passed_all': row.passed})
+    db.session.commit()
+    logger.info(f"[{strategy_id}] 조건 {condition_number} 재평가: 통과 {result['passed']} / 실패 {result['failed']} "
+                f"/ 변경 {len(result['changed'])}")
+    return result
+
+
+class ConditionScheduler:
+    """
+    조건별 스케줄 실행기 (분 단위로 due인 스케줄 실행)
+
+    실행 여부는 cron과 DB의 last_run_at으로만 판단하므로 재시작 중 놓친 실행은 한 번으로 합쳐 실행하고,
+    last_run_at을 조건부 UPDATE로 선점해 여러 프로세스에서 중복 실행하지 않습니다.
+    """
+
+    TICK_SECONDS = 60
+
+    def __init__(self):
+        self._thread = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f'{P.package_name}_condition', daemon=True)
+                self._thread.start()
+
+    def wake(self):
+        """
+        스케줄이 바뀌었을 때 다음 분을 기다리지 않고 바로 확인
+        """
+        self.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                with F.app.app_context():
+                    self.run_due()
+            except Exception as e:
+                logger.error(f"Condition scheduler error: {e}")
+                logger.error(traceback.format_exc())
+            # 다음 분 시작까지 대기
+            now = datetime.now()
+            self._wake.wait(self.TICK_SECONDS - now.second - now.microsecond / 1e6 + 0.5)
+
+    def due_schedules(self, now=None):
+        from .model import ConditionSchedule
+        now = now or datetime.now()
+        due = []
+        for schedule in db.session.query(ConditionSchedule).filter(ConditionSchedule.is_enabled == True).all():
+            try:
+                if CronExpression(schedule.cron_expression).is_due(schedule.last_run_at, now):
+                    due.append(schedule)
+            except ValueError as e:
+                logger.error(f"Invalid cron for {schedule}: {e}")
+        return due
+
+    def _claim(self, schedule, now):
+        from .model import ConditionSchedule
+        query = db.session.query(ConditionSchedule).filter(ConditionSchedule.id == schedule.id)
+        if schedule.last_run_at is None:
+            query = query.filter(ConditionSchedule.last_run_at == None)
+        else:
+            query = query.filter(ConditionSchedule.last_run_at == schedule.last_run_at)
+        claimed = query.update({'last_run_at': now}, synchronize_session=False)
+        db.session.commit()
+        return claimed == 1
+
+    def run_due(self, now=None):
+        """
+        due인 스케줄을 모두 실행
+
+        Returns:
+            int: 실행한 스케줄 수
+        """
+        now = (now or datetime.now()).replace(second=0, microsecond=0)
+        targets = [(s.id, s.strategy_id, s.condition_number) for s in self.due_schedules(now) if self._claim(s, now)]
+        for schedule_id, strategy_id, condition_number in targets:
+            self.run_schedule(schedule_id, strategy_id, condition_number)
+        return len(targets)
+
+    def run_schedule(self, schedule_id, strategy_id, condition_number):
+        from .model import ConditionSchedule
+        from .logic import Logic
+        logger.info(f"스케줄 실행: {strategy_id} / 조건 {condition_number or '전체'}")
+        try:
+            if condition_number == 0:
+                result = Logic.start_screening(strategy_id=strategy_id, execution_type='auto')
+            else:
+                result = evaluate_condition(strategy_id, condition_number)
+                if result and result['changed']:
+                    self._notify(strategy_id, condition_number, result)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"스케줄 실행 실패 ({strategy_id}/{condition_number}): {e}")
+            logger.error(traceback.format_exc())
+            result = {'error': str(e)}
+
+        schedule = db.session.query(ConditionSchedule).get(schedule_id)
+        if schedule is not None:
+            schedule.last_result = json.dumps(result, ensure_ascii=False, default=str)
+            db.session.commit()
+        return result
+
+    @staticmethod
+    def _notify(strategy_id, condition_number, result):
+        if (P.ModelSetting.get('notification_discord') or 'True') != 'True':
+            return
+        webhook_url = P.ModelSetting.get('discord_webhook_url')
+        if not webhook_url:
+            return
+        from .logic_notifier import Notifier
+        Notifier(webhook_url=webhook_url).send_condition_result_notification(strategy_id, condition_number, result)
+
+
+_condition_scheduler = None
+
+
+def get_condition_scheduler():
+    """
+    프로세스 공용 ConditionScheduler 인스턴스
+    """
+    global _condition_scheduler
+    if _condition_scheduler is None:
+        _condition_scheduler = ConditionScheduler()
+    return _condition_scheduler
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - DART Corp Code Map
+종목코드 <-> DART 고유번호(corp_code) 매핑 테이블
+
+DART corpCode.xml(전체 회사 목록 압축 파일)은 하루에 한 번만 받아 상장사만 고정 길이 배열(.npy)로 저장합니다.
+프로세스에서는 파일을 memory-map으로 열고 코드 -> 행 번호 dict로 O(1) 조회하며,
+파일 갱신 여부는 프로세스마다 하루 한 번만 확인해 다른 프로세스가 받은 파일도 다시 엽니다.
+"""
+import io
+import os
+import threading
+import zipfile
+from datetime import datetime
+from xml.etree import ElementTree
+
+import numpy as np
+import requests
+
+try:
+    from .setup import P
+except ImportError:  # FlaskFarm 밖(독립 실행 CLI)에서 import한 경우
+    from .standalone import P
+from .logic_store import get_store_dir
+from .logic_ratelimit import get_rate_limiter
+
+logger = P.logger
+
+CORP_CODE_URL = 'https://opendart.fss.or.kr/api/corpCode.xml'
+REQUEST_TIMEOUT = 60
+
+
+class CorpCodeMap:
+    """
+    상장사 종목코드 <-> corp_code 매핑 (프로세스 공용, 파일은 하루 한 번 갱신)
+    """
+
+    dtype = np.dtype([('stock_code', '<U6'), ('corp_code', '<U8')])
+
+    def __init__(self, base_dir=None):
+        self.path = os.path.join(base_dir or get_store_dir(), 'corp_codes.npy')
+        self._state = None  # (memory-map된 구조화 배열, 종목코드 -> 행 번호) - 교체 시 한 번에 바꿈
+        self._by_corp = None
+        self._mtime = None
+        self._checked_on = None
+        self._refresh_tried = None  # 오늘 갱신을 시도했는지 (실패해도 하루 한 번만)
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 파일 갱신
+    # ------------------------------------------------------------------
+    def _file_date(self):
+        if not os.path.exists(self.path):
+            return None
+        return datetime.fromtimestamp(os.path.getmtime(self.path)).date()
+
+    def _fetch(self, api_key):
+        response = get_rate_limiter('dart').call(requests.get, CORP_CODE_URL, params={'crtfc_key': api_key},
+                                                 timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(response.content))
+        except zipfile.BadZipFile:
+            # 인증키 오류 등은 zip 대신 오류 XML/JSON으로 내려옴
+            raise RuntimeError(f"corpCode.xml download failed: {response.text[:200]}")
+        with archive.open(archive.namelist()[0]) as xml_file:
+            rows = []
+            for _, element in ElementTree.iterparse(xml_file):
+                if element.tag != 'list':
+                    continue
+                stock_code = (element.findtext('stock_code') or '').strip()
+                if stock_code:
+                    rows.append((stock_code, (element.findtext('corp_code') or '').strip()))
+                element.clear()
+        table = np.array(sorted(rows), dtype=self.dtype)
+        if not len(table):
+            raise RuntimeError("corpCode.xml has no listed companies")
+        return table
+
+    def refresh(self, api_key=None, force=False):
+        """
+        오늘 받은 파일이 없으면 corpCode.xml을 받아 저장
+
+        Returns:
+            bool: 실제로 받았는지 여부
+        """
+        today = datetime.now().date()
+        with self._lock:
+            if not force and (self._file_date() == today or self._refresh_tried == today):
+                return False
+            api_key = api_key or P.ModelSetting.get('dart_api_key')
+            if not api_key:
+                return False
+            self._refresh_tried = today
+            try:
+                table = self._fetch(api_key)
+            except Exception as e:
+                logger.warning(f"[corp_code] refresh failed: {e}")
+                return False
+            tmp_path = f'{self.path}.tmp.npy'
+            np.save(tmp_path, table, allow_pickle=False)
+            os.replace(tmp_path, self.path)
+            logger.info(f"[corp_code] {len(table)} listed companies saved")
+            return True
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def _load(self, api_key=None):
+        # 파일 갱신/교체 확인은 하루 한 번 (그 외 조회는 dict 조회만)
+        today = datetime.now().date()
+        if self._state is not None and self._checked_on == today:
+            return self._state
+        with self._lock:
+            self.refresh(api_key)
+            if not os.path.exists(self.path):
+                return None
+            mtime = os.path.getmtime(self.path)
+            if self._state is None or mtime != self._mtime:
+                table = np.load(self.path, mmap_mode='r', allow_pickle=False)
+                self._state = (table, {code: i for i, code in enumerate(table['stock_code'].tolist())})
+                self._by_corp = None
+                self._mtime = mtime
+            self._checked_on = today
+            return self._state
+
+    def corp_code(self, stock_code, api_key=None):
+        """
+        종목코드 -> corp_code (모르면 None)
+        """
+        state = self._load(api_key)
+        if state is None:
+            return None
+        table, by_stock = state
+        i = by_stock.get(str(stock_code))
+        return None if i is None else str(table['corp_code'][i])
+
+    def stock_code(self, corp_code, api_key=None):
+        """
+        corp_code -> 종목코드 (상장사가 아니면 None)
+        """
+        state = self._load(api_key)
+        if state is None:
+            return None
+        table = state[0]
+        with self._lock:
+            if self._by_corp is None or self._by_corp[0] is not table:
+                self._by_corp = (table, {code: i for i, code in enumerate(table['corp_code'].tolist())})
+            i = self._by_corp[1].get(str(corp_code))
+        return None if i is None else str(table['stock_code'][i])
+
+    def __len__(self):
+        state = self._load()
+        return 0 if state is None else len(state[0])
+
+
+_corp_code_map = None
+_corp_code_map_lock = threading.Lock()
+
+
+def get_corp_code_map():
+    """
+    프로세스 공용 CorpCodeMap 인스턴스
+    """
+    global _corp_code_map
+    with _corp_code_map_lock:
+        if _corp_code_map is None:
+            _corp_code_map = CorpCodeMap()
+        return _corp_code_map
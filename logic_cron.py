@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Cron Expression
+5필드 cron 식(분 시 일 월 요일) 파서와 다음 실행 시각 계산 (의존성 없는 순수 모듈)
+
+지원 문법: *, 숫자, 범위(a-b), 목록(a,b), 간격(*/n, a-b/n), 요일 0-7(0과 7은 일요일)
+일/요일이 모두 지정되면 표준 cron처럼 둘 중 하나만 맞아도 실행합니다.
+"""
+from datetime import timedelta
+
+_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 7),
+)
+
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"invalid cron step: {step_text}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron value out of range: {part} ({low}-{high})")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronExpression:
+    """
+    cron 식 하나 (예: '*/30 9-15 * * 1-5' - 평일 장중 30분마다)
+    """
+
+    def __init__(self, expression):
+        parts = str(expression or '').split()
+        if len(parts) != 5:
+            raise ValueError(f"cron expression needs 5 fields: '{expression}'")
+        self.expression = ' '.join(parts)
+        parsed = {name: _parse_field(part, low, high) for part, (name, low, high) in zip(parts, _FIELDS)}
+        self.minutes = parsed['minute']
+        self.hours = parsed['hour']
+        self.days = parsed['day']
+        self.months = parsed['month']
+        # cron 요일(0=일요일) -> datetime.weekday()(0=월요일)
+        self.weekdays = frozenset((value - 1) % 7 for value in parsed['weekday'])
+        self._any_day = parts[2] == '*'
+        self._any_weekday = parts[4] == '*'
+
+    def _day_matches(self, dt):
+        day_ok = dt.day in self.days
+        weekday_ok = dt.weekday() in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def matches(self, dt):
+        """
+        dt(분 단위)가 실행 시각인지
+        """
+        return (dt.minute in self.minutes and dt.hour in self.hours and dt.month in self.months
+                and self._day_matches(dt))
+
+    def next_after(self, dt):
+        """
+        dt 이후(dt 제외) 첫 실행 시각 (일 -> 시 -> 분 순서로 건너뛰며 탐색, 최대 5년)
+        """
+        current = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current + timedelta(days=366 * 5)
+        while current < limit:
+            if current.month not in self.months or not self._day_matches(current):
+                current = (current + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if current.hour not in self.hours:
+                current = (current + timedelta(hours=1)).replace(minute=0)
+                continue
+            if current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+                continue
+            return current
+        return None
+
+    def is_due(self, last_run, now):
+        """
+        last_run 이후 now까지 실행 시각이 한 번이라도 있었는지 (last_run이 없으면 now 분만 확인)
+        """
+        if last_run is None:
+            return self.matches(now.replace(second=0, microsecond=0))
+        next_run = self.next_after(last_run)
+        return next_run is not None and next_run <= now
+
+    def __repr__(self):
+        return f"<CronExpression '{self.expression}'>"
+
+
+def validate(expression):
+    """
+    cron 식 검사
+
+    Returns:
+        str: 오류 메시지 (정상이면 None)
+    """
+    try:
+        CronExpression(expression)
+        return None
+    except ValueError as e:
+        return str(e)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Screening Delta
+증분 스크리닝을 위한 변경 감지 (의존성 없는 순수 모듈)
+
+재무/지분/CB·BW 같은 입력은 하루 사이에 거의 바뀌지 않으므로, 직전 실행 이후 들어온 DART 공시 목록으로
+종목별로 다시 조회할 데이터 종류만 고르고, 시세는 전 종목 일괄 스냅샷 한 번으로 갱신합니다.
+평가 입력 전체의 해시(input_key)가 직전 결과와 같으면 조건 평가 없이 결과를 그대로 이어 씁니다.
+"""
+import hashlib
+import json
+import re
+
+# 전 종목 일괄 스냅샷으로 갱신하는 데이터 종류 (종목별 조회 불필요)
+SNAPSHOT_GROUP = 'market'
+
+# 공시 색인에 저장하는 보고서 유형 (앞의 유형부터 확인, 보고서명 포함 여부로 판별 - '[기재정정]' 등 접두어 무관)
+# 증분 스크리닝의 변경 감지도 이 유형으로 하므로, 입력을 바꾸는 공시는 모두 여기에 있어야 색인에 남음
+REPORT_TYPES = (
+    ('cb', ('전환사채권발행결정',)),
+    ('bw', ('신주인수권부사채권발행결정',)),
+    ('eb', ('교환사채권발행결정',)),
+    ('paid_increase', ('유상증자결정', '유무상증자결정')),
+    ('unfaithful', ('불성실공시법인지정',)),
+    ('shareholder', ('최대주주', '대량보유', '주요주주', '소유상황')),
+    ('periodic', ('사업보고서', '반기보고서', '분기보고서')),
+    ('earnings', ('감사보고서', '재무제표', '영업(잠정)실적', '매출액또는손익구조')),
+    # 관리/거래정지/환기 지정은 거래소 공시로 들어오며 종목 상태(시세 그룹)에 반영됨
+    ('status', ('관리종목', '매매거래정지', '거래정지', '환기종목', '상장폐지', '정리매매')),
+)
+
+# 보고서 유형 -> 다시 조회할 데이터 종류
+TYPE_GROUPS = {
+    'cb': ('disclosure',),
+    'bw': ('disclosure',),
+    'eb': ('disclosure',),
+    'paid_increase': ('disclosure',),
+    'unfaithful': ('disclosure',),
+    # 최대주주 지분율은 정기보고서에서 읽으므로 지분 공시만으로는 다시 조회하지 않음 (logic_shareholder)
+    'shareholder': (),
+    'periodic': ('financial', 'major_shareholder'),
+    'earnings': ('financial',),
+    'status': (SNAPSHOT_GROUP,),
+}
+
+
+def filing_groups(report_name):
+    """
+    공시 보고서명 -> 영향을 받는 데이터 종류 집합 (해당 없으면 빈 집합)
+    """
+    return set(TYPE_GROUPS.get(report_type(report_name), ()))
+
+
+def report_type(report_name):
+    """
+    공시 보고서명 -> 공시 색인 보고서 유형 (REPORT_TYPES에 없으면 None)
+    """
+    name = str(report_name or '').replace(' ', '')
+    for type_name, keywords in REPORT_TYPES:
+        if any(keyword in name for keyword in keywords):
+            return type_name
+    return None
+
+
+# 정기보고서 보고서명 -> (사업연도, DART 보고서 코드) (12월 결산 기준)
+_PERIODIC_PATTERN = re.compile(r'(사업|반기|분기)보고서\((\d{4})\.(\d{2})\)')
+_QUARTER_CODES = {'03': '11013', '09': '11014'}
+
+
+def periodic_report_period(report_name):
+    """
+    정기보고서명 -> (사업연도, 보고서 코드) - 예: '분기보고서 (2026.09)' -> (2026, '11014')
+
+    Returns:
+        tuple: (int, str) (정기보고서가 아니거나 12월 결산이 아닌 분기 표기면 None)
+    """
+    match = _PERIODIC_PATTERN.search(str(report_name or '').replace(' ', ''))
+    if not match:
+        return None
+    kind, year, month = match.group(1), int(match.group(2)), match.group(3)
+    if kind == '사업':
+        return year, '11011'
+    if kind == '반기':
+        return year, '11012'
+    code = _QUARTER_CODES.get(month)
+    return (year, code) if code else None
+
+
+def changes_from_filings(filings):
+    """
+    공시 목록 -> 종목별 변경 데이터 종류
+
+    Args:
+        filings (iterable): (종목코드, 보고서명) 쌍 (비상장사처럼 종목코드가 없으면 무시)
+
+    Returns:
+        dict: {종목코드: {'financial', ...}}
+    """
+    changed = {}
+    for code, report_name in filings:
+        code = str(code or '').strip()
+        if not code:
+            continue
+        groups = filing_groups(report_name)
+        if groups:
+            changed.setdefault(code, set()).update(groups)
+    return changed
+
+
+def input_key(stock_data, fields, version=None):
+    """
+    조건 평가 입력 해시 (fields에 있는 값과 전략 버전, 키 순서와 무관)
+
+    전략 조건이 바뀌면(version 변경) 입력이 같아도 다른 키가 되어 이어 쓰지 않고 재평가합니다.
+    """
+    values = {field: stock_data.get(field) for field in fields}
+    values = {'version': version, 'values': values}
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def plan_delta(universe, previous, changed, required, snapshot_codes=()):
+    """
+    종목별로 다시 조회할 데이터 종류 결정
+
+    Args:
+        universe (iterable): 오늘 스크리닝 대상 종목 코드
+        previous (iterable): 직전 실행 결과가 있는 종목 코드
+        changed (dict): changes_from_filings 결과
+        required (set): 전략이 쓰는 데이터 종류 (strategy.required_data)
+        snapshot_codes (iterable): 일괄 시세 스냅샷에 있는 종목 코드
+
+    Returns:
+        dict: {
+            'fetch': {종목코드: {데이터 종류, ...}},  # 종목별로 다시 조회
+            'carry': [종목코드, ...],  # 종목별 조회 없이 직전 값 사용 (시세는 스냅샷으로 갱신)
+            'new': [종목코드, ...],  # 직전 결과가 없어 전체 조회
+            'dropped': [종목코드, ...],  # 직전 결과에는 있지만 오늘 대상에서 빠짐 (상장폐지 등)
+        }
+    """
+    required = set(required)
+    previous = set(previous)
+    snapshot_codes = set(snapshot_codes)
+    universe = list(dict.fromkeys(universe))
+    plan = {'fetch': {}, 'carry': [], 'new': [], 'dropped': sorted(previous.difference(universe))}
+    for code in universe:
+        if code not in previous:
+            plan['new'].append(code)
+            plan['fetch'][code] = set(required)
+            continue
+        groups = required & changed.get(code, set())
+        if SNAPSHOT_GROUP in required and code not in snapshot_codes:
+            groups.add(SNAPSHOT_GROUP)
+        if groups:
+            plan['fetch'][code] = groups
+        else:
+            plan['carry'].append(code)
+    return plan
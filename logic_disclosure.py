@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - DART Disclosure Index
+DART 기간별 전체 공시 목록(회사 미지정)을 로컬 DB(DartDisclosure)에 색인
+
+종목마다 공시 목록을 조회하는 대신 하루 한 번 전체 공시 목록을 받아 필요한 보고서 유형만 저장하고,
+CB/BW 발행·유상증자 여부 같은 공시 조건은 (corp_code, report_type, rcept_dt) 색인 조회로 판단합니다.
+처음에는 LOOKBACK_DAYS만큼 적재하고, 이후에는 마지막 동기화일 다음 날부터 오늘까지만 받습니다.
+"""
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from .setup import P
+from framework import db
+from .logic_delta import report_type
+from .logic_ratelimit import get_rate_limiter
+
+logger = P.logger
+
+SYNCED_UNTIL_KEY = 'dart_disclosure_synced_until'
+INDEX_VERSION_KEY = 'dart_disclosure_index_version'
+# REPORT_TYPES에 색인 대상 유형을 추가하면 올림 (이미 지난 RESCAN_DAYS 구간을 다시 받아 새 유형을 채움)
+INDEX_VERSION = '2'
+
+
+class DisclosureIndex:
+    """
+    공시 색인 (프로세스 공용, 동기화는 SYNC_INTERVAL마다 최대 한 번)
+    """
+
+    LOOKBACK_DAYS = 365  # 최초 적재 범위 (공시 조건의 최대 조회 기간)
+    CHUNK_DAYS = 90  # 회사 미지정 공시 목록의 최대 조회 기간
+    RESCAN_DAYS = 90  # 색인 유형이 바뀌었을 때 다시 받는 기간 (증분 스크리닝의 최대 간격)
+    SYNC_INTERVAL = 600  # 같은 프로세스에서 다시 동기화를 확인하기까지의 초
+    _IN_CHUNK = 500  # 접수번호 존재 확인 IN 절 크기
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = None
+
+    def synced_until(self):
+        """
+        빠짐없이 적재한 마지막 날짜 (한 번도 동기화하지 않았으면 None)
+        """
+        value = P.ModelSetting.get(SYNCED_UNTIL_KEY)
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+        except ValueError:
+            return None
+
+    def sync(self, get_dart, today=None, force=False):
+        """
+        마지막 동기화일 다음 날부터 오늘까지 공시 목록 적재 (오늘 공시는 계속 들어오므로 매번 다시 확인)
+
+        Args:
+            get_dart (callable): OpenDartReader 인스턴스(또는 None)를 돌려주는 함수 - 동기화가 필요할 때만 호출
+            today (date): 기준일 (기본: 오늘)
+            force (bool): SYNC_INTERVAL과 관계없이 확인
+
+        Returns:
+            int: 새로 저장한 공시 수 (DART를 쓸 수 없거나 조회에 실패하면 None)
+        """
+        with self._lock:
+            if not force and self._checked_at is not None and time.monotonic() - self._checked_at < self.SYNC_INTERVAL:
+                return 0
+            dart = get_dart()
+            if dart is None:
+                return None
+            today = today or date.today()
+            synced_until = self.synced_until()
+            start = synced_until + timedelta(days=1) if synced_until else today - timedelta(days=self.LOOKBACK_DAYS)
+            version_changed = P.ModelSetting.get(INDEX_VERSION_KEY) != INDEX_VERSION
+            if synced_until and version_changed:
+                start = min(start, today - timedelta(days=self.RESCAN_DAYS))
+            start = min(start, today)
+
+            added = 0
+            while start <= today:
+                end = min(today, start + timedelta(days=self.CHUNK_DAYS - 1))
+                try:
+                    df = get_rate_limiter('dart').call(dart.list, start=start.strftime('%Y-%m-%d'),
+                                                       end=end.strftime('%Y-%m-%d'))
+                except Exception as e:
+                    logger.warning(f"[disclosure] DART 공시 목록 조회 실패 ({start} ~ {end}): {e}")
+                    return None
+                added += self._store(df)
+                # 다시 받는 구간(RESCAN_DAYS)에서는 이미 적재한 날짜를 되돌리지 않음
+                done = min(end, today - timedelta(days=1))
+                if synced_until is None or done > synced_until:
+                    P.ModelSetting.set(SYNCED_UNTIL_KEY, done.strftime('%Y-%m-%d'))
+                start = end + timedelta(days=1)
+            if version_changed:
+                P.ModelSetting.set(INDEX_VERSION_KEY, INDEX_VERSION)
+            self._checked_at = time.monotonic()
+            if added:
+                logger.info(f"[disclosure] 공시 {added}건 색인 (~{today})")
+            return added
+
+    def _store(self, df):
+        """
+        공시 목록 DataFrame 중 색인 대상 유형만, 아직 없는 접수번호만 저장
+        """
+        from .model import DartDisclosure
+        if df is None or df.empty:
+            return 0
+        rows = {}
+        for record in df.to_dict('records'):
+            type_name = report_type(record.get('report_nm'))
+            rcept_no = str(record.get('rcept_no') or '')
+            if type_name is None or not rcept_no or not record.get('corp_code'):
+                continue
+            rows[rcept_no] = DartDisclosure(
+                rcept_no=rcept_no,
+                corp_code=str(record['corp_code']),
+                stock_code=str(record.get('stock_code') or '').strip(),
+                corp_name=record.get('corp_name'),
+                report_nm=str(record.get('report_nm') or '').strip(),
+                report_type=type_name,
+                rcept_dt=datetime.strptime(str(record['rcept_dt']), '%Y%m%d').date(),
+            )
+        numbers = list(rows)
+        for i in range(0, len(numbers), self._IN_CHUNK):
+            chunk = numbers[i:i + self._IN_CHUNK]
+            for (rcept_no,) in db.session.query(DartDisclosure.rcept_no).filter(DartDisclosure.rcept_no.in_(chunk)):
+                rows.pop(rcept_no, None)
+        try:
+            db.session.add_all(rows.values())
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return len(rows)
+
+    def has_report(self, corp_code, types, since):
+        """
+        since 이후 해당 유형 공시가 있는지 (색인 조회)
+        """
+        from .model import DartDisclosure
+        return db.session.query(DartDisclosure.id).filter(
+            DartDisclosure.corp_code == corp_code,
+            DartDisclosure.report_type.in_(list(types)),
+            DartDisclosure.rcept_dt >= since,
+        ).first() is not None
+
+    def latest(self, corp_code, types):
+        """
+        해당 유형의 가장 최근 공시 (없으면 None)
+        """
+        from .model import DartDisclosure
+        return db.session.query(DartDisclosure).filter(
+            DartDisclosure.corp_code == corp_code,
+            DartDisclosure.report_type.in_(list(types)),
+        ).order_by(DartDisclosure.rcept_dt.desc(), DartDisclosure.rcept_no.desc()).first()
+
+    def filings(self, start, end):
+        """
+        기간 내 색인된 상장사 공시 목록
+
+        Returns:
+            list: [(종목코드, 보고서명), ...]
+        """
+        from .model import DartDisclosure
+        return db.session.query(DartDisclosure.stock_code, DartDisclosure.report_nm).filter(
+            DartDisclosure.rcept_dt >= start,
+            DartDisclosure.rcept_dt <= end,
+            DartDisclosure.stock_code != '',
+        ).all()
+
+
+_disclosure_index = None
+
+
+def get_disclosure_index():
+    """
+    프로세스 공용 DisclosureIndex 인스턴스
+    """
+    global _disclosure_index
+    if _disclosure_index is None:
+        _disclosure_index = DisclosureIndex()
+    return _disclosure_index
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Discord Transport
+Discord 웹훅 전송 (연결 재사용 세션, 429 retry_after 및 rate limit 버킷 헤더 준수)
+
+웹훅별로 X-RateLimit-Bucket/Remaining/Reset-After 헤더를 기억해 버킷이 비었으면
+다음 전송 전에 대기하고, 429 응답은 retry_after만큼 쉰 뒤 다시 보냅니다.
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from .setup import P
+except ImportError:  # FlaskFarm 밖(독립 실행 CLI)에서 import한 경우
+    from .standalone import P
+from .logic_embed import split_payload
+
+logger = P.logger
+
+REQUEST_TIMEOUT = 10
+DEFAULT_RETRY_AFTER = 1.0
+# 한 번의 전송에서 허용하는 최대 대기 (이보다 길면 호출자가 나중에 재시도)
+MAX_INLINE_WAIT = 30.0
+
+
+class DiscordRateLimited(Exception):
+    """
+    429 응답 (retry_after: 다시 보낼 수 있을 때까지 남은 초)
+    """
+
+    def __init__(self, retry_after, message=''):
+        super().__init__(message or f'rate limited (retry after {retry_after:.1f}s)')
+        self.retry_after = retry_after
+
+
+class DiscordSendError(Exception):
+    """
+    전송 실패 (retryable: 같은 내용으로 다시 보내볼 가치가 있는지)
+    """
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class DiscordTransport:
+    """
+    웹훅 전송기 (스레드 안전)
+
+    requests.Session 하나로 연결을 재사용하고, 웹훅 URL -> 버킷, 버킷 -> 다음 전송 가능 시각을
+    기록해 rate limit에 걸리기 전에 스스로 대기합니다.
+    """
+
+    def __init__(self, pool_size=4):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._buckets = {}  # webhook_url -> bucket id
+        self._resume_at = {}  # bucket id (또는 url) -> time.monotonic() 기준 전송 가능 시각
+        self._lock = threading.Lock()
+
+    def _bucket_key(self, url):
+        return self._buckets.get(url, url)
+
+    def wait_time(self, url):
+        """
+        url로 지금 보내기 전에 기다려야 하는 초 (0이면 바로 전송 가능)
+        """
+        with self._lock:
+            resume_at = self._resume_at.get(self._bucket_key(url), 0.0)
+        return max(0.0, resume_at - time.monotonic())
+
+    def _update_limits(self, url, response, retry_after=None):
+        headers = response.headers
+        with self._lock:
+            bucket = headers.get('X-RateLimit-Bucket')
+            if bucket:
+                self._buckets[url] = bucket
+            key = self._bucket_key(url)
+            resume_at = None
+            if retry_after is not None:
+                resume_at = time.monotonic() + retry_after
+            elif headers.get('X-RateLimit-Remaining') == '0':
+                try:
+                    resume_at = time.monotonic() + float(headers.get('X-RateLimit-Reset-After', DEFAULT_RETRY_AFTER))
+                except ValueError:
+                    resume_at = time.monotonic() + DEFAULT_RETRY_AFTER
+            if resume_at is not None:
+                self._resume_at[key] = max(self._resume_at.get(key, 0.0), resume_at)
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return float(response.json().get('retry_after'))
+        except Exception:
+            pass
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER
+
+    def post(self, url, payload):
+        """
+        웹훅 1회 전송 (버킷이 비어 있으면 먼저 대기)
+
+        Raises:
+            DiscordRateLimited: 429 응답
+            DiscordSendError: 그 밖의 실패
+        """
+        wait = self.wait_time(url)
+        if wait > MAX_INLINE_WAIT:
+            raise DiscordRateLimited(wait)
+        if wait > 0:
+            time.sleep(wait)
+
+        try:
+            response = self.session.post(url, json=payload, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            raise DiscordSendError(str(e))
+
+        if response.status_code == 429:
+            retry_after = self._retry_after(response)
+            self._update_limits(url, response, retry_after)
+            raise DiscordRateLimited(retry_after)
+        self._update_limits(url, response)
+        if 200 <= response.status_code < 300:
+            return response
+        # 4xx(429 제외)는 같은 내용을 다시 보내도 실패 (잘못된 URL, 삭제된 웹훅, 형식 오류)
+        raise DiscordSendError(f'{response.status_code}: {response.text[:200]}',
+                               retryable=response.status_code >= 500)
+
+    def send(self, url, payload, max_attempts=3):
+        """
+        즉시 전송 (429는 retry_after만큼 쉬고 재시도). 독립 실행 CLI처럼 outbox가 없을 때 사용
+
+        Returns:
+            bool: 전송 성공 여부
+        """
+        for attempt in range(1, max_attempts + 1):
+            try:
+                self.post(url, payload)
+                return True
+            except DiscordRateLimited as e:
+                if attempt == max_attempts or e.retry_after > MAX_INLINE_WAIT:
+                    logger.error(f"Discord send gave up: {e}")
+                    return False
+                time.sleep(e.retry_after)
+            except DiscordSendError as e:
+                if attempt == max_attempts or not e.retryable:
+                    logger.error(f"Discord send failed: {e}")
+                    return False
+                time.sleep(2 ** attempt)
+        return False
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """
+    프로세스 공용 DiscordTransport
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = DiscordTransport()
+        return _transport
+
+
+def send_now(webhook_url, payload, kind=None, **kwargs):
+    """
+    outbox 없이 바로 전송 (메시지 제한에 맞게 나눠 순서대로 전송, enqueue_discord와 같은 시그니처)
+    """
+    transport = get_transport()
+    return all(transport.send(webhook_url, part) for part in split_payload(payload))
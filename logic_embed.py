@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Discord Embed Packing
+Discord 메시지 제한(필드 값 1024자, 임베드당 필드 25개, 메시지당 임베드 10개/합계 6000자)에 맞춰
+필드와 임베드를 가장 적은 수의 메시지로 나누어 담습니다.
+
+순서를 유지해야 하므로 앞에서부터 채우다 넘치면 다음 칸으로 넘기는 방식(next-fit)을 쓰며,
+순서를 지키는 연속 분할에서는 이 방식이 칸 수를 최소로 만듭니다. 의존성 없는 순수 함수만 포함합니다.
+"""
+import hashlib
+import json
+
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+FIELDS_PER_EMBED = 25
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 4096
+FOOTER_LIMIT = 2048
+EMBED_TOTAL_LIMIT = 6000
+EMBEDS_PER_MESSAGE = 10
+
+# 줄 구분자 (실제 개행과, 기존 표 포맷이 쓰는 문자 그대로의 '\n')
+_LINE_BREAKS = ('\n', '\\n')
+
+
+def _clip(text, limit):
+    text = str(text or '')
+    return text if len(text) <= limit else text[:limit - 3] + '...'
+
+
+def _break_at(text, limit):
+    """
+    text[:limit] 안에서 마지막 줄 끝 위치 (줄 경계가 없으면 limit)
+    """
+    window = text[:limit]
+    cut = max(window.rfind(sep) + len(sep) if window.rfind(sep) >= 0 else 0 for sep in _LINE_BREAKS)
+    return cut or limit
+
+
+def split_value(text, limit=FIELD_VALUE_LIMIT, header=''):
+    """
+    긴 필드 값을 줄 경계에서 limit 이하 조각으로 분할 (각 조각 앞에 header 반복)
+
+    Returns:
+        list: 조각 문자열 (빈 값이면 [''])
+    """
+    text = str(text or '')
+    if len(text) <= limit:
+        return [text]
+    if header and text.startswith(header):
+        text = text[len(header):]
+    room = max(1, limit - len(header))
+    chunks = []
+    while text:
+        cut = _break_at(text, room) if len(text) > room else len(text)
+        chunks.append(header + text[:cut])
+        text = text[cut:]
+    return chunks
+
+
+def pack_lines(lines, limit=FIELD_VALUE_LIMIT, header=''):
+    """
+    줄 목록을 header 포함 limit 이하가 되도록 연속 구간으로 나눔
+
+    Returns:
+        list: [(start, stop), ...] - lines[start:stop]이 한 필드
+    """
+    ranges = []
+    start, size = 0, len(header)
+    for i, line in enumerate(lines):
+        if i > start and size + len(line) > limit:
+            ranges.append((start, i))
+            start, size = i, len(header)
+        size += len(line)
+    if start < len(lines):
+        ranges.append((start, len(lines)))
+    return ranges
+
+
+def split_field(field, header=''):
+    """
+    값이 1024자를 넘는 필드를 이어지는 여러 필드로 분할 (이름에 (i/n) 표시)
+    """
+    chunks = split_value(field.get('value'), FIELD_VALUE_LIMIT, header)
+    name = str(field.get('name') or '')
+    if len(chunks) == 1:
+        return [dict(field, name=_clip(name, FIELD_NAME_LIMIT), value=chunks[0] or '-')]
+    total = len(chunks)
+    return [
+        dict(field, name=_clip(f"{name} ({i}/{total})", FIELD_NAME_LIMIT), value=chunk)
+        for i, chunk in enumerate(chunks, 1)
+    ]
+
+
+def embed_size(embed):
+    """
+    Discord가 6000자 제한에 세는 글자 수 (title, description, 필드 이름/값, footer, author)
+    """
+    size = len(embed.get('title') or '') + len(embed.get('description') or '')
+    size += len((embed.get('footer') or {}).get('text') or '')
+    size += len((embed.get('author') or {}).get('name') or '')
+    for field in embed.get('fields') or []:
+        size += len(field.get('name') or '') + len(field.get('value') or '')
+    return size
+
+
+def pack_fields(fields, title=None, description=None, footer=None, **extra):
+    """
+    필드 목록을 제한에 맞는 임베드 목록으로 분할
+
+    첫 임베드에만 title/description을, 마지막 임베드에만 footer를 넣고 나머지 키(color 등)는 모두에 넣습니다.
+    1024자를 넘는 필드 값은 split_field로 먼저 나눕니다.
+
+    Returns:
+        list: 임베드 dict 목록
+    """
+    head = {}
+    if title:
+        head['title'] = _clip(title, TITLE_LIMIT)
+    if description:
+        head['description'] = _clip(description, DESCRIPTION_LIMIT)
+    footer_size = len(_clip(footer, FOOTER_LIMIT)) if footer else 0
+
+    split = [part for field in fields for part in split_field(field)]
+    embeds = [dict(extra, **head, fields=[])]
+    size = embed_size(embeds[0])
+    for field in split:
+        field_size = len(field['name']) + len(field['value'])
+        current = embeds[-1]['fields']
+        # footer는 마지막 임베드에 붙으므로 항상 자리를 남겨 둠
+        if current and (len(current) >= FIELDS_PER_EMBED or size + field_size + footer_size > EMBED_TOTAL_LIMIT):
+            embeds.append(dict(extra, fields=[]))
+            size = 0
+        embeds[-1]['fields'].append(field)
+        size += field_size
+
+    if footer:
+        embeds[-1]['footer'] = {'text': _clip(footer, FOOTER_LIMIT)}
+    for embed in embeds:
+        if not embed['fields']:
+            del embed['fields']
+    return embeds
+
+
+def pack_messages(embeds):
+    """
+    임베드 목록을 메시지 단위로 묶음 (메시지당 임베드 10개, 글자 합계 6000자 이하)
+
+    Returns:
+        list: [[embed, ...], ...]
+    """
+    messages = []
+    size = 0
+    for embed in embeds:
+        embed_chars = embed_size(embed)
+        if not messages or len(messages[-1]) >= EMBEDS_PER_MESSAGE or size + embed_chars > EMBED_TOTAL_LIMIT:
+            messages.append([])
+            size = 0
+        messages[-1].append(embed)
+        size += embed_chars
+    return messages
+
+
+def build_payloads(embeds, **base):
+    """
+    임베드 목록 -> 웹훅 본문 목록 (base: username, avatar_url 등 공통 키)
+    """
+    return [dict(base, embeds=group) for group in pack_messages(embeds)]
+
+
+def split_payload(payload):
+    """
+    임베드 개수 제한 없는 웹훅 본문 -> 실제 전송할 본문 목록 (embeds 외 키는 모든 메시지에 복사)
+    """
+    embeds = payload.get('embeds') or []
+    if not embeds:
+        return [payload]
+    base = {key: value for key, value in payload.items() if key != 'embeds'}
+    return build_payloads(embeds, **base)
+
+
+def content_key(embeds):
+    """
+    임베드 내용 해시 (실행 시각이 들어가는 timestamp/footer는 제외) - 같은 알림 중복 판별용
+    """
+    stripped = [{key: value for key, value in embed.items() if key not in ('timestamp', 'footer')} for embed in embeds]
+    return hashlib.sha1(json.dumps(stripped, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def build_digest(items, title="🗞️ 알림 요약", color=9807270):
+    """
+    여러 알림을 하나의 요약 본문으로 병합 (같은 dedup_key는 처음 것만 남김)
+
+    Args:
+        items (list): [{'kind', 'payload', 'dedup_key', 'created_at'(str)}, ...] (생성 순서)
+
+    Returns:
+        dict: 웹훅 본문 (첫 알림의 username/avatar_url 사용, embeds 개수 제한 없음)
+    """
+    seen = {}
+    kept, duplicates = [], []
+    for item in items:
+        key = item.get('dedup_key') or content_key(item['payload'].get('embeds') or [])
+        if key in seen:
+            duplicates.append((item, seen[key]))
+            continue
+        seen[key] = item
+        kept.append(item)
+
+    counts = {}
+    for item in items:
+        kind = item.get('kind') or 'other'
+        counts[kind] = counts.get(kind, 0) + 1
+    lines = [f"**{len(items)}건**의 알림을 묶었습니다. ({', '.join(f'{k} {v}' for k, v in counts.items())})"]
+    if duplicates:
+        lines.append(f"같은 내용 {len(duplicates)}건은 생략했습니다:")
+        for item, original in duplicates:
+            lines.append(f"- {_first_title(item['payload'])} = {_first_title(original['payload'])}")
+    times = [item.get('created_at') for item in items if item.get('created_at')]
+    header = {"title": title, "description": _clip("\n".join(lines), DESCRIPTION_LIMIT), "color": color}
+    if times:
+        header["footer"] = {"text": f"{min(times)} ~ {max(times)}"}
+
+    base = {key: value for key, value in items[0]['payload'].items() if key != 'embeds'} if items else {}
+    embeds = [header]
+    for item in kept:
+        embeds.extend(item['payload'].get('embeds') or [])
+    return dict(base, embeds=embeds)
+
+
+def _first_title(payload):
+    for embed in payload.get('embeds') or []:
+        if embed.get('title'):
+            return embed['title']
+    return '(제목 없음)'
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Incremental Screening
+직전 스크리닝 결과 대비 바뀐 입력만 다시 조회/평가하는 일일 증분 스크리닝
+
+1. 시세(시가총액/거래대금/PER/PBR/배당)는 전 종목 일괄 스냅샷으로 갱신
+2. 직전 실행일 이후 DART 공시 목록으로 재무/공시/지분 데이터가 바뀐 종목만 종목별 재조회
+3. 평가 입력 해시가 직전 결과와 같으면 조건 평가 없이 결과를 이어 쓰고, 다르면 apply_filters로 재평가
+
+직전 결과가 없거나, 공시 목록을 확인할 수 없거나, 간격이 공시 조회 한도(3개월)를 넘으면 None을 반환해
+호출자가 전체 스크리닝을 실행하도록 합니다.
+"""
+import json
+import time
+from datetime import date
+
+from .setup import P
+from framework import db
+from .logic_condition import RESULT_FIELDS, row_to_stock_data, apply_fresh_data, load_details
+from .logic_delta import changes_from_filings, input_key, plan_delta
+from .logic_ratelimit import map_parallel, with_app_context
+
+logger = P.logger
+
+# 조건 평가 입력으로 쓰는 값 (저장 결과 행에서 복원 가능한 값)
+INPUT_FIELDS = RESULT_FIELDS + ('net_income_3y', 'status')
+# DART 공시 목록(회사 미지정) 조회 가능 기간
+MAX_GAP_DAYS = 90
+
+
+def is_enabled():
+    return (P.ModelSetting.get('screening_incremental') or 'True') == 'True'
+
+
+def _new_row(strategy, screening_date, stock_data, passed, condition_details, key):
+    from .model import StockScreeningResult
+    row = StockScreeningResult(code=stock_data['code'], screening_date=screening_date,
+                               strategy_name=strategy.strategy_id, strategy_version=strategy.version)
+    apply_fresh_data(row, stock_data)
+    row.passed = passed
+    row.condition_details = json.dumps({str(k): bool(v) for k, v in condition_details.items()})
+    row.input_hash = key
+    return row
+
+
+def run_incremental_screening(strategy_id, execution_type='auto', collector=None, today=None):
+    """
+    직전 결과 기준 증분 스크리닝
+
+    Args:
+        strategy_id (str): 전략 ID
+        execution_type (str): ScreeningHistory 실행 구분
+        collector (DataCollector): 데이터 수집기 (없으면 설정의 DART 키로 생성)
+        today (date): 스크리닝 기준일 (기본: 오늘)
+
+    Returns:
+        dict: {'success', 'message', 'delta': {...}} (증분으로 실행할 수 없으면 None)
+    """
+    from .strategies import get_strategy
+    from .model import StockScreeningResult, ScreeningHistory
+    from .logic_collector import DataCollector
+
+    strategy = get_strategy(strategy_id)
+    if strategy is None:
+        raise ValueError(f"Unknown strategy: {strategy_id}")
+    today = today or date.today()
+    start_time = time.time()
+
+    base_date = db.session.query(db.func.max(StockScreeningResult.screening_date)).filter(
+        StockScreeningResult.strategy_name == strategy_id,
+        StockScreeningResult.screening_date < today,
+    ).scalar()
+    if base_date is None:
+        logger.info(f"[{strategy_id}] 증분 스크리닝: 직전 결과가 없어 전체 스크리닝으로 진행합니다.")
+        return None
+    if (today - base_date).days > MAX_GAP_DAYS:
+        logger.info(f"[{strategy_id}] 증분 스크리닝: 직전 결과({base_date})가 오래되어 전체 스크리닝으로 진행합니다.")
+        return None
+
+    if collector is None:
+        collector = DataCollector(dart_api_key=P.ModelSetting.get('dart_api_key'))
+    required = set(strategy.required_data)
+    filings = collector.get_filings(base_date, today)
+    if filings is None and required - {'market'}:
+        # 공시 변경을 확인할 수 없으면 재무/공시 데이터를 이어 쓸 근거가 없음
+        logger.info(f"[{strategy_id}] 증분 스크리닝: DART 공시 목록을 확인할 수 없어 전체 스크리닝으로 진행합니다.")
+        return None
+    changed = changes_from_filings(filings or [])
+
+    history = ScreeningHistory(execution_type=execution_type, status='running')
+    db.session.add(history)
+    db.session.commit()
+
+    try:
+        previous = {row.code: row for row in db.session.query(StockScreeningResult).filter(
+            StockScreeningResult.strategy_name == strategy_id,
+            StockScreeningResult.screening_date == base_date,
+        ).all()}
+        universe = {ticker['code']: ticker for ticker in collector.get_all_tickers()}
+        if not universe:
+            # 종목 목록을 못 받으면 직전 종목을 그대로 대상으로 (상장폐지 반영은 다음 실행으로)
+            universe = {code: {'code': code, 'name': row.name, 'market': row.market, 'sector': row.sector}
+                        for code, row in previous.items()}
+        snapshot = collector.market_snapshot() if 'market' in required else {}
+        plan = plan_delta(universe, previous, changed, required, snapshot)
+
+        fetch = with_app_context(lambda code: collector.get_all_data_for_ticker(code, plan['fetch'][code]))
+        fetched = dict(map_parallel(fetch, list(plan['fetch'])))
+
+        # 같은 날 다시 실행하면 그날 결과를 새로 씀
+        db.session.query(StockScreeningResult).filter(
+            StockScreeningResult.strategy_name == strategy_id,
+            StockScreeningResult.screening_date == today,
+        ).delete(synchronize_session=False)
+
+        delta = {'base_date': base_date.strftime('%Y-%m-%d'), 'filings': len(filings or []),
+                 'refetched': 0, 'reevaluated': 0, 'carried': 0, 'fetch_failed': 0,
+                 'new': len(plan['new']), 'dropped': len(plan['dropped'])}
+        failed_counts = {}
+        passed_count = 0
+        for code, ticker in universe.items():
+            row = previous.get(code)
+            fresh = fetched.get(code) if code in plan['fetch'] else {}
+            if isinstance(fresh, Exception):
+                delta['fetch_failed'] += 1
+                if row is None:
+                    logger.warning(f"[{strategy_id}] {code} 데이터 조회 실패, 이번 결과에서 제외: {fresh}")
+                    continue
+                logger.warning(f"[{strategy_id}] {code} 데이터 조회 실패, 직전 값 사용: {fresh}")
+                fresh = {}
+            elif code in plan['fetch']:
+                delta['refetched'] += 1
+
+            stock_data = row_to_stock_data(row) if row is not None else {'code': code}
+            stock_data.update({key: ticker.get(key) for key in ('name', 'market', 'sector') if ticker.get(key)})
+            stock_data.update(snapshot.get(code) or {})
+            stock_data.update(fresh or {})
+            key = input_key(stock_data, INPUT_FIELDS, strategy.version)
+
+            if row is not None and row.input_hash == key:
+                passed, details = bool(row.passed), load_details(row)
+                delta['carried'] += 1
+            else:
+                passed, details = strategy.apply_filters(stock_data)
+                delta['reevaluated'] += 1
+            db.session.add(_new_row(strategy, today, stock_data, bool(passed), details, key))
+
+            passed_count += bool(passed)
+            for condition_number, ok in details.items():
+                if not ok:
+                    failed_counts[str(condition_number)] = failed_counts.get(str(condition_number), 0) + 1
+
+        history.total_stocks = delta['reevaluated'] + delta['carried']
+        history.passed_stocks = passed_count
+        history.filter_statistics = json.dumps(failed_counts)
+        history.execution_time = time.time() - start_time
+        history.status = 'completed'
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        history.status = 'failed'
+        history.error_message = str(e)
+        history.execution_time = time.time() - start_time
+        db.session.commit()
+        raise
+
+    message = (f"증분 스크리닝 완료: {history.total_stocks}개 중 {passed_count}개 통과 "
+               f"(재조회 {delta['refetched']}, 재평가 {delta['reevaluated']}, 이어쓰기 {delta['carried']})")
+    logger.info(f"[{strategy_id}] {message} / 기준 {delta['base_date']}, 공시 {delta['filings']}건")
+    return {'success': True, 'message': message, 'delta': delta}
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Schema Migration
+기존 설치 DB에 모델에 새로 추가된 열을 채워 넣는 마이그레이션 (플러그인 로드 시 실행)
+
+db.create_all()은 없는 테이블만 만들고 기존 테이블에는 열을 추가하지 않으므로,
+모델 정의와 실제 테이블을 비교해 빠진 열만 ALTER TABLE ... ADD COLUMN으로 추가합니다.
+이미 있는 열은 건너뛰므로 여러 번 실행해도 안전합니다. 기존 행에는 모델의 고정 기본값을 채웁니다.
+"""
+from sqlalchemy import inspect, literal, text
+
+from .setup import P
+from framework import db
+
+logger = P.logger
+
+
+def _models():
+    from .model import (StockScreeningResult, ScreeningHistory, FilterDetail, ConditionSchedule, TrendSnapshot,
+                        NotificationOutbox, DartDisclosure, MajorShareholderRatio)
+    from .backtesting import BacktestingHistory
+    return (StockScreeningResult, ScreeningHistory, FilterDetail, ConditionSchedule, TrendSnapshot,
+            NotificationOutbox, DartDisclosure, MajorShareholderRatio, BacktestingHistory)
+
+
+def _column_ddl(column, dialect):
+    """
+    ADD COLUMN 절 (NOT NULL 제약은 기존 행 때문에 붙이지 않음)
+    """
+    ddl = f"{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=dialect)}"
+    default = column.default
+    if default is not None and default.is_scalar and default.arg is not None:
+        value = literal(default.arg, column.type).compile(dialect=dialect, compile_kwargs={'literal_binds': True})
+        ddl += f" DEFAULT {value}"
+    return ddl
+
+
+def migrate_model(model):
+    """
+    모델 테이블에 빠진 열 추가
+
+    Returns:
+        list: 추가한 열 이름 (테이블이 아직 없으면 빈 목록 - create_all이 전체를 만듦)
+    """
+    table = model.__table__
+    engine = db.session.get_bind(mapper=model.__mapper__)
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return []
+    existing = {column['name'] for column in inspector.get_columns(table.name)}
+    missing = [column for column in table.columns if column.name not in existing]
+    if not missing:
+        return []
+    table_name = engine.dialect.identifier_preparer.format_table(table)
+    with engine.begin() as conn:
+        for column in missing:
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {_column_ddl(column, engine.dialect)}"))
+    added = [column.name for column in missing]
+    logger.info(f"[migration] {table.name}: added columns {', '.join(added)}")
+    return added
+
+
+def migrate():
+    """
+    모든 모델 테이블 마이그레이션 (한 테이블 실패가 나머지를 막지 않음)
+
+    Returns:
+        dict: {테이블명: [추가한 열, ...]} (추가한 열이 있는 테이블만)
+    """
+    result = {}
+    for model in _models():
+        try:
+            added = migrate_model(model)
+        except Exception as e:
+            logger.error(f"[migration] {model.__tablename__} 마이그레이션 실패: {e}")
+            continue
+        if added:
+            result[model.__tablename__] = added
+    return result
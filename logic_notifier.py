@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 """
 7split_checklist_21 Plugin - Notifier
-Discord Webhook을 통한 알림 전송
+Discord Webhook을 통한 알림 전송 (발송 대기열에 넣으면 백그라운드 전송기가 전송)
 """
+import hashlib
 import json
-import requests
 from datetime import datetime
 from .setup import *
+from .logic_embed import pack_fields
 
 logger = P.logger    
 
@@ -20,6 +21,21 @@ class Notifier:
             webhook_url (str): Discord Webhook URL
         """
         self.webhook_url = webhook_url
+
+    def _enqueue(self, payload, kind, **kwargs):
+        """
+        발송 대기열에 추가 (메시지 분할, 묶음 전송, 429/재시도 처리는 OutboxSender 담당)
+        """
+        from .logic_outbox import enqueue_discord
+        return enqueue_discord(self.webhook_url, payload, kind=kind, **kwargs)
+
+    @staticmethod
+    def stock_list_key(stocks):
+        """
+        종목 목록 중복 판별 키 (전략/실행 시각이 달라도 같은 종목 목록이면 같은 키)
+        """
+        codes = sorted(str(stock.get('code', '')) for stock in stocks)
+        return hashlib.sha1(','.join(codes).encode('utf-8')).hexdigest()
     
     
     def send_screening_result(self, passed_stocks, total_stocks, execution_time, strategy_name="기본 전략"):
@@ -33,7 +49,7 @@ class Notifier:
             strategy_name (str): 사용된 전략 이름
         
         Returns:
-            bool: 전송 성공 여부
+            bool: 발송 대기열 추가 성공 여부
         """
         if not self.webhook_url:
             logger.warning("Discord webhook URL not configured")
@@ -45,7 +61,7 @@ class Notifier:
             
             # 1. 요약 Embed
             summary_embed = {
-                "title": "🎯 세븐스플릿 스크리닝 결과",
+                "title": f"🎯 세븐스플릿 스크리닝 결과 - {strategy_name}",
                 "description": f"**{len(passed_stocks)}개 종목**이 21가지 조건을 모두 통과했습니다.",
                 "color": 3066993,  # 초록색
                 "fields": [
@@ -72,11 +88,11 @@ class Notifier:
             }
             embeds.append(summary_embed)
             
-            # 2. 통과 종목 상세 (최대 10개까지만)
+            # 2. 통과 종목 상세 (전체 종목을 필드/임베드/메시지 제한에 맞춰 나눔)
             if len(passed_stocks) > 0:
                 stock_fields = []
                 
-                for i, stock in enumerate(passed_stocks[:10]):
+                for i, stock in enumerate(passed_stocks):
                     # 종목 정보 필드
                     field_value = (
                         f"**시가총액**: {stock.get('market_cap', 0) // 100000000:,}억원\n"
@@ -91,40 +107,19 @@ class Notifier:
                         "inline": False
                     })
                 
-                # 종목 상세 Embed
-                detail_embed = {
-                    "title": "📈 통과 종목 목록",
-                    "color": 5814783,  # 파란색
-                    "fields": stock_fields
-                }
-                embeds.append(detail_embed)
-                
-                # 10개 이상이면 추가 메시지
-                if len(passed_stocks) > 10:
-                    more_embed = {
-                        "description": f"*나머지 {len(passed_stocks) - 10}개 종목은 웹 페이지에서 확인하세요.*",
-                        "color": 15844367  # 주황색
-                    }
-                    embeds.append(more_embed)
+                # 종목 상세 Embed (25개 필드/6000자 단위로 이어지는 임베드)
+                embeds.extend(pack_fields(stock_fields, title="📈 통과 종목 목록", color=5814783))  # 파란색
             
-            # Discord Webhook 전송
+            # Discord Webhook 전송 (메시지 제한에 맞춘 분할은 전송 시 처리)
             payload = {
                 "username": "세븐스플릿 Bot",
                 "embeds": embeds
             }
             
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
-            
-            if response.status_code == 204:
-                logger.info("Discord notification sent successfully")
-                return True
-            else:
-                logger.error(f"Discord notification failed: {response.status_code}")
-                return False
+            queued = self._enqueue(payload, 'screening', dedup_key=self.stock_list_key(passed_stocks))
+            if queued:
+                logger.info("Discord notification queued")
+            return queued
                 
         except Exception as e:
             logger.error(f"Failed to send Discord notification: {str(e)}")
@@ -139,7 +134,7 @@ class Notifier:
             error_message (str): 에러 메시지
         
         Returns:
-            bool: 전송 성공 여부
+            bool: 발송 대기열 추가 성공 여부
         """
         if not self.webhook_url:
             return False
@@ -159,13 +154,8 @@ class Notifier:
                 "embeds": [embed]
             }
             
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
-            
-            return response.status_code == 204
+            # 오류 알림은 묶음 전송 대상에서 제외하고 바로 전송
+            return self._enqueue(payload, 'error', digest=False)
             
         except Exception as e:
             logger.error(f"Failed to send error notification: {str(e)}")
@@ -181,7 +171,7 @@ class Notifier:
             strategy_name (str): 실행할 전략 이름
         
         Returns:
-            bool: 전송 성공 여부
+            bool: 발송 대기열 추가 성공 여부
         """
         if not self.webhook_url:
             return False
@@ -202,13 +192,7 @@ class Notifier:
                 "embeds": [embed]
             }
             
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=10
-            )
-            
-            return response.status_code == 204
+            return self._enqueue(payload, 'start')
             
         except Exception as e:
             logger.debug(f"Failed to send start notification: {str(e)}")
@@ -222,7 +206,7 @@ class Notifier:
         Args:
             strategy_id (str): 전략 ID
             condition_number (int): 조건 번호
-            result (dict): 실행 결과 {passed: int, failed: int}
+            result (dict): 실행 결과 {passed: int, failed: int, changed: [...]} (evaluate_condition 반환값)
         """
         if not self.webhook_url:
             return False
@@ -243,34 +227,45 @@ class Notifier:
             else:
                 strategy_name = 'Unknown Strategy'
 
-            embed = {
-                "title": f"📊 개별 조건 실행 결과: {strategy_name}",
-                "description": f"**{condition_name}** 조건의 스크리닝 결과입니다.",
-                "color": 4886754, # 보라색
-                "fields": [
-                    {
-                        "name": "✅ 통과",
-                        "value": f"{result['passed']:,}개",
-                        "inline": True
-                    },
-                    {
-                        "name": "❌ 실패",
-                        "value": f"{result['failed']:,}개",
-                        "inline": True
-                    }
-                ],
-                "footer": {
-                    "text": f"실행 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            fields = [
+                {
+                    "name": "✅ 통과",
+                    "value": f"{result['passed']:,}개",
+                    "inline": True
+                },
+                {
+                    "name": "❌ 실패",
+                    "value": f"{result['failed']:,}개",
+                    "inline": True
                 }
-            }
+            ]
+
+            # 이전 결과와 달라진 종목 (기준 스크리닝 결과 대비, 1024자를 넘으면 이어지는 필드로 나눔)
+            changed = result.get('changed') or []
+            if changed:
+                lines = [
+                    f"{'✅' if item['after'] else '❌'} {item['name']}({item['code']})"
+                    f"{' · 전체 통과' if item.get('passed_all') else ''}"
+                    for item in changed
+                ]
+                fields.append({
+                    "name": f"🔄 결과 변경 ({len(changed)}개, 기준일 {result.get('screening_date', '-')})",
+                    "value": "\n".join(lines),
+                    "inline": False
+                })
 
             payload = {
                 "username": "세븐스플릿 Bot",
-                "embeds": [embed]
+                "embeds": pack_fields(
+                    fields,
+                    title=f"📊 개별 조건 실행 결과: {strategy_name}",
+                    description=f"**{condition_name}** 조건의 스크리닝 결과입니다.",
+                    footer=f"실행 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                    color=4886754,  # 보라색
+                )
             }
 
-            requests.post(self.webhook_url, json=payload, timeout=10)
-            return True
+            return self._enqueue(payload, 'condition')
 
         except Exception as e:
             logger.error(f"Failed to send condition result notification: {e}")
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Notification Outbox
+Discord 알림 발송 대기열 (NotificationOutbox 테이블 + 백그라운드 전송 스레드)
+
+알림을 보내는 쪽은 enqueue_discord()로 행만 추가하고 바로 돌아갑니다.
+전송 스레드가 대기열을 순서대로 보내며, 429는 retry_after 이후로, 그 밖의 일시적 실패는
+지수 백오프로 다시 예약합니다. 대기열이 DB에 있으므로 재시작 후에도 미전송 알림이 이어서 전송됩니다.
+
+묶음 전송(discord_digest_minutes > 0)을 켜면 창 안에 들어온 알림을 웹훅별로 하나의 요약 알림으로
+병합하고, 같은 내용(dedup_key)은 한 번만 보냅니다. 한 알림이 메시지 제한을 넘으면 전송 시 나눠 보냅니다.
+"""
+import json
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from .setup import P, F
+from framework import db
+from .logic_discord import get_transport, DiscordRateLimited, DiscordSendError
+from .logic_embed import split_payload, content_key, build_digest
+
+logger = P.logger
+
+STATUS_PENDING = 'pending'
+STATUS_SENDING = 'sending'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+STATUS_MERGED = 'merged'  # 묶음 전송으로 다른 행(kind='digest')에 병합됨
+
+
+def digest_minutes():
+    """
+    묶음 전송 창 (분, 0이면 즉시 전송)
+    """
+    try:
+        return max(0.0, float(P.ModelSetting.get('discord_digest_minutes') or 0))
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def enqueue_discord(webhook_url, payload, kind=None, dedup_key=None, digest=None):
+    """
+    Discord 웹훅 알림을 대기열에 추가 (전송은 백그라운드)
+
+    Args:
+        webhook_url (str): Discord Webhook URL
+        payload (dict): 웹훅 본문 (username, embeds 등 - embeds 개수 제한 없음)
+        kind (str): 알림 종류 (로그/조회용)
+        dedup_key (str): 묶음 전송 시 같은 내용 판별 키 (없으면 embeds 내용 해시)
+        digest (bool): False면 묶음 전송 설정과 관계없이 즉시 전송 (오류 알림 등)
+
+    Returns:
+        bool: 대기열 추가 성공 여부
+    """
+    from .model import NotificationOutbox
+    try:
+        now = datetime.now()
+        window = digest_minutes() if digest is not False else 0
+        next_attempt_at = now
+        if window > 0:
+            # 이미 열린 창이 있으면 같은 시각에 함께 병합
+            opened = db.session.query(db.func.min(NotificationOutbox.next_attempt_at)).filter(
+                NotificationOutbox.webhook_url == webhook_url,
+                NotificationOutbox.status == STATUS_PENDING,
+                NotificationOutbox.digest == True,
+            ).scalar()
+            next_attempt_at = opened or now + timedelta(minutes=window)
+        db.session.add(NotificationOutbox(
+            webhook_url=webhook_url,
+            payload=json.dumps(payload, ensure_ascii=False, default=str),
+            kind=kind,
+            status=STATUS_PENDING,
+            dedup_key=dedup_key or content_key(payload.get('embeds') or []),
+            digest=window > 0,
+            parts_sent=0,
+            attempts=0,
+            next_attempt_at=next_attempt_at,
+        ))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Failed to enqueue Discord notification ({kind}): {e}")
+        return False
+    get_outbox_sender().wake()
+    return True
+
+
+class OutboxSender:
+    """
+    대기열 전송 스레드
+
+    due(next_attempt_at <= 지금)인 pending 행을 id 순으로 가져와 pending -> sending으로
+    조건부 UPDATE해 선점한 행만 보냅니다. (여러 프로세스가 같은 DB를 봐도 중복 전송 없음)
+    """
+
+    POLL_INTERVAL = 30.0
+    BATCH_SIZE = 20
+    MAX_ATTEMPTS = 8
+    MAX_BACKOFF = 300
+    # sending 상태로 이 시간 이상 남은 행은 전송 도중 종료된 것으로 보고 다시 예약
+    STALE_SENDING = timedelta(minutes=5)
+
+    def __init__(self):
+        self._thread = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f'{P.package_name}_outbox', daemon=True)
+                self._thread.start()
+
+    def wake(self):
+        self.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            timeout = self.POLL_INTERVAL
+            try:
+                with F.app.app_context():
+                    self._recover_stale()
+                    self._merge_digests()
+                    while self._send_due():
+                        pass
+                    self._prune()
+                    timeout = self._next_due_in()
+            except Exception as e:
+                logger.error(f"Outbox sender error: {e}")
+                logger.error(traceback.format_exc())
+            self._wake.wait(timeout)
+
+    def _next_due_in(self):
+        """
+        다음 예약 행까지 남은 초 (최대 POLL_INTERVAL)
+        """
+        from .model import NotificationOutbox
+        next_at = db.session.query(db.func.min(NotificationOutbox.next_attempt_at)).filter(
+            NotificationOutbox.status == STATUS_PENDING
+        ).scalar()
+        if next_at is None:
+            return self.POLL_INTERVAL
+        return min(self.POLL_INTERVAL, max(0.5, (next_at - datetime.now()).total_seconds()))
+
+    def _recover_stale(self):
+        from .model import NotificationOutbox
+        cutoff = datetime.now() - self.STALE_SENDING
+        count = db.session.query(NotificationOutbox).filter(
+            NotificationOutbox.status == STATUS_SENDING,
+            NotificationOutbox.next_attempt_at < cutoff,
+        ).update({'status': STATUS_PENDING}, synchronize_session=False)
+        db.session.commit()
+        if count:
+            logger.warning(f"Outbox: {count} interrupted notification(s) rescheduled")
+
+    def _has_earlier(self, row_id, webhook_url):
+        """
+        같은 웹훅에 아직 보내지 못한 앞선 행이 있는지 (있으면 순서 유지를 위해 이 행도 보류)
+
+        재시도 대기 중인 행(429의 retry_after, 백오프)도 포함하므로 예약 시각이 지나 먼저 전송될 때까지 뒤 행이 기다립니다.
+        """
+        from .model import NotificationOutbox
+        return db.session.query(NotificationOutbox.id).filter(
+            NotificationOutbox.webhook_url == webhook_url,
+            NotificationOutbox.id < row_id,
+            NotificationOutbox.status.in_([STATUS_PENDING, STATUS_SENDING]),
+            db.or_(NotificationOutbox.digest == False, NotificationOutbox.digest == None),
+        ).first() is not None
+
+    def _claim(self, row_id):
+        from .model import NotificationOutbox
+        claimed = db.session.query(NotificationOutbox).filter(
+            NotificationOutbox.id == row_id,
+            NotificationOutbox.status == STATUS_PENDING,
+        ).update({'status': STATUS_SENDING, 'next_attempt_at': datetime.now()}, synchronize_session=False)
+        db.session.commit()
+        return claimed == 1
+
+    def _merge_digests(self):
+        """
+        창이 끝난 묶음 대상 행을 웹훅별 요약 행 하나로 병합 (원래 행은 merged 상태)
+        """
+        from .model import NotificationOutbox
+        rows = db.session.query(NotificationOutbox.id, NotificationOutbox.webhook_url).filter(
+            NotificationOutbox.status == STATUS_PENDING,
+            NotificationOutbox.digest == True,
+            NotificationOutbox.next_attempt_at <= datetime.now(),
+        ).order_by(NotificationOutbox.id).all()
+
+        groups = {}
+        for row_id, webhook_url in rows:
+            groups.setdefault(webhook_url, []).append(row_id)
+
+        for webhook_url, row_ids in groups.items():
+            owned = [db.session.query(NotificationOutbox).get(row_id) for row_id in row_ids if self._claim(row_id)]
+            if not owned:
+                continue
+            if len(owned) == 1:
+                owned[0].status = STATUS_PENDING
+                owned[0].digest = False
+                db.session.commit()
+                continue
+
+            items = [{
+                'kind': row.kind,
+                'payload': json.loads(row.payload),
+                'dedup_key': row.dedup_key,
+                'created_at': row.created_at.strftime('%H:%M:%S') if row.created_at else None,
+            } for row in owned]
+            merged = NotificationOutbox(
+                webhook_url=webhook_url,
+                payload=json.dumps(build_digest(items), ensure_ascii=False, default=str),
+                kind='digest',
+                status=STATUS_PENDING,
+                digest=False,
+                parts_sent=0,
+                attempts=0,
+                next_attempt_at=datetime.now(),
+            )
+            db.session.add(merged)
+            db.session.flush()
+            for row in owned:
+                row.status = STATUS_MERGED
+                row.sent_at = datetime.now()
+                row.last_error = f'merged into #{merged.id}'
+            db.session.commit()
+            logger.info(f"Outbox: merged {len(owned)} notification(s) into digest #{merged.id}")
+
+    def _send_due(self):
+        """
+        due 행 한 묶음 전송
+
+        Returns:
+            bool: 한 건이라도 처리했는지 (True면 바로 다음 묶음 확인)
+        """
+        from .model import NotificationOutbox
+        rows = db.session.query(NotificationOutbox.id, NotificationOutbox.webhook_url).filter(
+            NotificationOutbox.status == STATUS_PENDING,
+            db.or_(NotificationOutbox.digest == False, NotificationOutbox.digest == None),
+            NotificationOutbox.next_attempt_at <= datetime.now(),
+        ).order_by(NotificationOutbox.id).limit(self.BATCH_SIZE).all()
+
+        transport = get_transport()
+        processed = False
+        for row_id, webhook_url in rows:
+            if self._has_earlier(row_id, webhook_url) or not self._claim(row_id):
+                continue
+            processed = True
+            row = db.session.query(NotificationOutbox).get(row_id)
+            try:
+                # 메시지 제한에 맞게 나눠 보내고, 중간에 실패하면 보낸 메시지 다음부터 재시도
+                parts = split_payload(json.loads(row.payload))
+                for index in range(row.parts_sent or 0, len(parts)):
+                    transport.post(row.webhook_url, parts[index])
+                    row.parts_sent = index + 1
+                    db.session.commit()
+                row.status = STATUS_SENT
+                row.sent_at = datetime.now()
+                row.last_error = None
+                logger.info(f"Outbox: sent #{row.id} ({row.kind})")
+            except DiscordRateLimited as e:
+                # rate limit은 실패로 세지 않고 retry_after 이후로 다시 예약 (같은 웹훅의 뒤 행은 _has_earlier로 대기)
+                row.status = STATUS_PENDING
+                row.next_attempt_at = datetime.now() + timedelta(seconds=e.retry_after)
+                row.last_error = str(e)
+            except Exception as e:
+                row.attempts = (row.attempts or 0) + 1
+                row.last_error = str(e)
+                retryable = not isinstance(e, DiscordSendError) or e.retryable
+                if not retryable or row.attempts >= self.MAX_ATTEMPTS:
+                    row.status = STATUS_FAILED
+                    logger.error(f"Outbox: giving up #{row.id} ({row.kind}) after {row.attempts} attempt(s): {e}")
+                else:
+                    row.status = STATUS_PENDING
+                    delay = min(self.MAX_BACKOFF, 2 ** row.attempts)
+                    row.next_attempt_at = datetime.now() + timedelta(seconds=delay)
+                    logger.warning(f"Outbox: #{row.id} ({row.kind}) failed, retrying in {delay}s: {e}")
+            db.session.commit()
+        return processed
+
+    def _prune(self):
+        """
+        보관 기간(db_retention_days)이 지난 전송 완료/실패 행 정리
+        """
+        from .model import NotificationOutbox
+        try:
+            retention_days = int(P.ModelSetting.get('db_retention_days') or 30)
+        except (ValueError, TypeError):
+            retention_days = 30
+        cutoff = datetime.now() - timedelta(days=retention_days)
+        db.session.query(NotificationOutbox).filter(
+            NotificationOutbox.status.in_([STATUS_SENT, STATUS_FAILED, STATUS_MERGED]),
+            NotificationOutbox.created_at < cutoff,
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+
+_outbox_sender = None
+
+
+def get_outbox_sender():
+    """
+    프로세스 공용 OutboxSender 인스턴스
+    """
+    global _outbox_sender
+    if _outbox_sender is None:
+        _outbox_sender = OutboxSender()
+    return _outbox_sender
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Rate Limiter
+외부 데이터 소스(KRX/pykrx 등) 공용 호출 속도 제한기와 제한된 크기의 병렬 조회 풀
+
+독립적인 조회는 풀에서 동시에 실행하되, 모든 호출은 소스별 토큰 버킷을 거쳐
+초당 요청 수를 넘지 않도록 합니다. (프로세스 단위 제한)
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .setup import P, F
+except ImportError:  # FlaskFarm 밖(독립 실행 CLI)에서 import한 경우
+    from .standalone import P, F
+
+logger = P.logger
+
+# 소스별 기본값 (설정이 없거나 읽을 수 없는 환경에서 사용)
+DEFAULT_LIMITS = {
+    'krx': {'rate': 5.0, 'burst': 5},
+    'dart': {'rate': 5.0, 'burst': 5},
+}
+DEFAULT_MAX_WORKERS = 4
+
+
+class RateLimiter:
+    """
+    토큰 버킷 속도 제한기 (스레드 안전)
+
+    초당 rate개의 토큰이 채워지고 최대 burst개까지 쌓입니다.
+    acquire()는 토큰이 생길 때까지 대기합니다.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def call(self, func, *args, **kwargs):
+        """
+        토큰을 얻은 뒤 func 호출
+        """
+        self.acquire()
+        return func(*args, **kwargs)
+
+
+def _setting(key, default):
+    try:
+        value = P.ModelSetting.get(key)
+        return value if value not in (None, '') else default
+    except Exception:
+        # 워커 프로세스 등 설정 DB에 접근할 수 없는 환경
+        return default
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(source='krx'):
+    """
+    소스별 공용 RateLimiter (설정 키: {source}_requests_per_second)
+    """
+    with _limiters_lock:
+        if source not in _limiters:
+            defaults = DEFAULT_LIMITS.get(source, DEFAULT_LIMITS['krx'])
+            rate = float(_setting(f'{source}_requests_per_second', defaults['rate']))
+            _limiters[source] = RateLimiter(rate, burst=max(1, int(rate)))
+        return _limiters[source]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_worker = threading.local()
+
+
+def _mark_worker():
+    _worker.active = True
+
+
+def get_fetch_pool():
+    """
+    공용 조회 스레드 풀 (설정 키: krx_max_workers)
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            max_workers = max(1, int(_setting('krx_max_workers', DEFAULT_MAX_WORKERS)))
+            _pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'{P.package_name}_fetch',
+                                       initializer=_mark_worker)
+        return _pool
+
+
+def fetch_parallel(calls, source='krx'):
+    """
+    서로 독립적인 조회를 공용 풀에서 동시에 실행 (각 호출은 속도 제한 적용)
+
+    이미 풀 워커 안에서 호출되면 교착을 피하기 위해 같은 스레드에서 순서대로 실행합니다.
+
+    Args:
+        calls (dict): {key: (func, args, kwargs)} - args/kwargs는 생략 가능
+        source (str): 속도 제한 소스 이름
+
+    Returns:
+        dict: {key: 결과} (하나라도 실패하면 해당 예외를 그대로 발생)
+    """
+    limiter = get_rate_limiter(source)
+    normalized = {}
+    for key, spec in calls.items():
+        func, args, kwargs = (tuple(spec) + ((), {}))[:3]
+        normalized[key] = (func, args or (), kwargs or {})
+
+    if getattr(_worker, 'active', False) or len(normalized) <= 1:
+        return {key: limiter.call(func, *args, **kwargs) for key, (func, args, kwargs) in normalized.items()}
+
+    pool = get_fetch_pool()
+    futures = {key: pool.submit(limiter.call, func, *args, **kwargs) for key, (func, args, kwargs) in normalized.items()}
+    return {key: future.result() for key, future in futures.items()}
+
+
+def map_parallel(func, items):
+    """
+    items 각각에 func를 공용 풀에서 동시에 적용 (실패한 항목은 예외 객체로 반환)
+
+    func 안의 실제 외부 호출은 fetch_parallel 또는 get_rate_limiter().call로 속도 제한을 받아야 합니다.
+
+    Returns:
+        list: [(item, 결과 또는 Exception), ...] (items 순서)
+    """
+    def run(item):
+        try:
+            return func(item)
+        except Exception as e:
+            return e
+
+    items = list(items)
+    if getattr(_worker, 'active', False) or len(items) <= 1:
+        return [(item, run(item)) for item in items]
+    pool = get_fetch_pool()
+    return list(zip(items, pool.map(run, items)))
+
+
+def _reset_after_fork():
+    """
+    fork된 자식 프로세스에서 부모의 풀/락/속도 제한기를 버림
+
+    자식에는 부모 풀의 스레드가 없어 물려받은 풀에 제출한 작업이 실행되지 않고 영원히 대기하므로
+    (백테스트 ProcessPoolExecutor 워커 등) 첫 사용 시 새로 만들도록 초기화합니다.
+    """
+    global _pool, _pool_lock, _limiters_lock, _worker
+    _pool = None
+    _pool_lock = threading.Lock()
+    _limiters.clear()
+    _limiters_lock = threading.Lock()
+    _worker = threading.local()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def with_app_context(func):
+    """
+    풀 스레드에서 DB나 P.ModelSetting을 쓰는 func를 Flask 앱 컨텍스트 안에서 실행하도록 감쌈
+
+    풀 스레드에는 앱 컨텍스트가 없어 db.session 조회가 실패하므로 map_parallel에 넘기기 전에 사용합니다.
+    (독립 실행 환경처럼 앱이 없으면 func를 그대로 반환)
+    """
+    app = getattr(F, 'app', None)
+    if app is None:
+        return func
+
+    def run(item):
+        with app.app_context():
+            return func(item)
+    return run
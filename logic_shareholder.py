@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Major Shareholder Cache
+최대주주 지분율 캐시 (MajorShareholderRatio, corp_code 기준)
+
+지분율은 정기보고서의 '최대주주 현황'에서 읽으므로 새 정기보고서가 나올 때만 바뀝니다.
+공시 색인의 해당 회사 최신 정기보고서 접수번호를 함께 저장해 두고 그 번호가 바뀐 회사만 DART에서 다시 읽습니다.
+(최대주주 소유주식 변동·대량보유 공시는 특수관계인 합계를 주지 않으므로 다음 정기보고서에서 반영됩니다.)
+공시 색인을 쓸 수 없을 때만 STALE_DAYS 기준으로 다시 조회합니다.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from .setup import P
+from framework import db
+from .logic_delta import periodic_report_period
+from .logic_disclosure import get_disclosure_index
+from .logic_ratelimit import get_rate_limiter
+
+logger = P.logger
+
+SOURCE_TYPES = ('periodic',)  # 지분율을 읽는 공시 유형 (캐시 키)
+_RATIO_COLUMN = 'trmend_posesn_stock_qota_rt'  # 기말 소유 주식 지분율
+
+
+def _number(value):
+    try:
+        return float(str(value).replace(',', '').strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _ratio_from_report(df):
+    """
+    정기보고서 '최대주주 현황' -> 보통주 지분율 합계 ('계' 행이 있으면 그 값)
+    """
+    if df is None or df.empty or _RATIO_COLUMN not in df.columns:
+        return None
+    common = df
+    if 'stock_knd' in df.columns:
+        common = df[df['stock_knd'].astype(str).str.contains('보통')]
+        if common.empty:
+            common = df
+    names = common['nm'].astype(str).str.replace(' ', '') if 'nm' in common.columns else None
+    if names is not None:
+        total = [_number(v) for v in common.loc[names == '계', _RATIO_COLUMN]]
+        total = [v for v in total if v is not None]
+        if total:
+            return total[-1]
+        common = common[names != '계']
+    values = [v for v in (_number(v) for v in common[_RATIO_COLUMN]) if v is not None]
+    return round(sum(values), 2) if values else None
+
+
+def _candidate_periods(today):
+    """
+    최근 정기보고서 후보 (최신순, 12월 결산 기준)
+    """
+    year = today.year
+    return [(year, '11014'), (year, '11012'), (year, '11013'),
+            (year - 1, '11011'), (year - 1, '11014'), (year - 1, '11012'), (year - 1, '11013')]
+
+
+class MajorShareholderCache:
+    """
+    최대주주 지분율 캐시 (프로세스 공용)
+    """
+
+    STALE_DAYS = 30
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def _source(self, get_dart):
+        """
+        회사별 캐시 유효성 판단에 쓸 공시 색인 (쓸 수 없으면 None)
+        """
+        index = get_disclosure_index()
+        if index.sync(get_dart) is None and index.synced_until() is None:
+            return None
+        return index
+
+    def _fetch(self, stock_code, dart, latest_periodic):
+        """
+        가장 최근 정기보고서의 최대주주 현황에서 지분율 조회
+
+        Returns:
+            tuple: (지분율 또는 None, '사업연도/보고서 코드' 또는 None)
+        """
+        periods = _candidate_periods(datetime.now().date())
+        period = periodic_report_period(latest_periodic.report_nm) if latest_periodic is not None else None
+        if period is not None:
+            periods = [period] + [p for p in periods if p != period]
+        limiter = get_rate_limiter('dart')
+        for year, reprt_code in periods:
+            df = limiter.call(dart.report, stock_code, '최대주주', year, reprt_code=reprt_code)
+            ratio = _ratio_from_report(df)
+            if ratio is not None:
+                return ratio, f'{year}/{reprt_code}'
+        return None, None
+
+    def ratio(self, stock_code, corp_code, collector):
+        """
+        최대주주(특수관계인 포함) 보통주 지분율 (%)
+
+        Args:
+            stock_code (str): 종목코드 (DART 조회용)
+            corp_code (str): DART 고유번호 (캐시 키)
+            collector (DataCollector): 공시 색인 동기화와 재조회에 collector.dart 사용
+
+        Returns:
+            float: 지분율 (알 수 없으면 None)
+        """
+        from .model import MajorShareholderRatio
+        index = self._source(lambda: collector.dart)
+        row = db.session.query(MajorShareholderRatio).filter(MajorShareholderRatio.corp_code == corp_code).first()
+
+        latest_periodic = None
+        if index is not None:
+            latest_periodic = index.latest(corp_code, SOURCE_TYPES)
+            source = latest_periodic.rcept_no if latest_periodic is not None else ''
+            if row is not None and row.rcept_no == source:
+                return row.ratio
+        else:
+            source = None
+            if row is not None and row.fetched_at and datetime.now() - row.fetched_at < timedelta(days=self.STALE_DAYS):
+                return row.ratio
+
+        dart = collector.dart
+        if dart is None:
+            return row.ratio if row is not None else None
+        ratio, period = self._fetch(stock_code, dart, latest_periodic)
+        with self._lock:
+            try:
+                if row is None:
+                    row = MajorShareholderRatio(corp_code=corp_code)
+                    db.session.add(row)
+                row.ratio = ratio
+                row.rcept_no = source
+                row.report_period = period
+                row.fetched_at = datetime.now()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+        logger.debug(f"[{stock_code}] 최대주주 지분율 갱신: {ratio} ({period}, 근거 공시 {source})")
+        return ratio
+
+
+_major_shareholder_cache = None
+
+
+def get_major_shareholder_cache():
+    """
+    프로세스 공용 MajorShareholderCache 인스턴스
+    """
+    global _major_shareholder_cache
+    if _major_shareholder_cache is None:
+        _major_shareholder_cache = MajorShareholderCache()
+    return _major_shareholder_cache
@@ -0,0 +1,851 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Point-in-time Store
+일자 x 종목 패널 데이터를 로컬에 저장하는 시점 기준(point-in-time) 저장소
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .setup import P, F
+except ImportError:  # FlaskFarm 밖(독립 실행 CLI)에서 import한 경우
+    from .standalone import P, F
+from .logic_ratelimit import fetch_parallel, get_rate_limiter, map_parallel
+
+logger = P.logger
+
+try:
+    from pykrx import stock as pykrx_stock
+except ImportError:
+    pykrx_stock = None
+
+
+def get_store_dir():
+    """
+    저장소 기본 경로 반환 ({path_data}/{package_name}/store)
+    """
+    base_dir = os.path.join(F.config['path_data'], P.package_name, 'store')
+    os.makedirs(base_dir, exist_ok=True)
+    return base_dir
+
+
+def to_datetime64(value):
+    """
+    'YYYY-MM-DD', 'YYYYMMDD', datetime, date 를 numpy datetime64[D]로 변환
+    """
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[D]')
+    if isinstance(value, str):
+        value = value.strip()
+        if len(value) == 8 and value.isdigit():
+            value = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+        return np.datetime64(value, 'D')
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+# 당일 시세/수급은 이 시각(장 마감 후) 이전에는 잠정치이므로 저장하지 않음
+SETTLE_HOURS = 16
+
+
+def settled_until(now=None):
+    """
+    확정된 데이터로 저장할 수 있는 마지막 날짜 (datetime64[D], SETTLE_HOURS 이전에는 전날)
+    """
+    return to_datetime64((now or datetime.now()) - timedelta(hours=SETTLE_HOURS))
+
+
+class PanelStore:
+    """
+    일자 x 종목 패널 저장소
+
+    필드별로 (일자 수, 종목 수) float32 행렬을 연도 단위 샤드(npz)로 저장합니다.
+    한 번 수집한 일자는 다시 조회하지 않으며, window()로 필요한 구간만 읽어옵니다.
+    장중 잠정치가 영구 저장되지 않도록 settled_until() 이후 일자는 수집하지 않습니다.
+    """
+
+    name = 'panel'
+    fields = ()
+    key_dtype = '<U12'  # 종목 축 키 자료형
+
+    SYNC_BATCH_DAYS = 20
+
+    def __init__(self, base_dir=None):
+        self.base_dir = base_dir or get_store_dir()
+        self._shards = {}  # year -> {'dates', 'tickers', field: matrix}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 샤드 입출력
+    # ------------------------------------------------------------------
+    def _shard_path(self, year):
+        return os.path.join(self.base_dir, f'{self.name}_{year}.npz')
+
+    def _load_shard(self, year):
+        with self._lock:
+            if year in self._shards:
+                return self._shards[year]
+
+            path = self._shard_path(year)
+            if os.path.exists(path):
+                with np.load(path, allow_pickle=False) as npz:
+                    shard = {key: npz[key] for key in npz.files}
+            else:
+                shard = {
+                    'dates': np.array([], dtype='datetime64[D]'),
+                    'tickers': np.array([], dtype=self.key_dtype),
+                }
+                for field in self.fields:
+                    shard[field] = np.empty((0, 0), dtype=np.float32)
+            self._shards[year] = shard
+            return shard
+
+    def _save_shard(self, year):
+        with self._lock:
+            shard = self._shards[year]
+            path = self._shard_path(year)
+            tmp_path = f'{path}.tmp.npz'
+            np.savez_compressed(tmp_path, **shard)
+            os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def has_date(self, date):
+        day = to_datetime64(date)
+        shard = self._load_shard(int(str(day)[:4]))
+        return bool(np.isin(day, shard['dates']))
+
+    def stored_dates(self, start, end):
+        """
+        [start, end] 구간에 저장된 일자 배열 (datetime64[D])
+        """
+        start_d, end_d = to_datetime64(start), to_datetime64(end)
+        parts = []
+        for year in range(int(str(start_d)[:4]), int(str(end_d)[:4]) + 1):
+            dates = self._load_shard(year)['dates']
+            parts.append(dates[(dates >= start_d) & (dates <= end_d)])
+        if not parts:
+            return np.array([], dtype='datetime64[D]')
+        return np.concatenate(parts)
+
+    def window(self, start, end, tickers=None, fields=None):
+        """
+        구간 패널 조회
+
+        Args:
+            start, end: 조회 구간 (양 끝 포함)
+            tickers (list): 조회할 종목 코드 (None이면 구간 내 전체 종목)
+            fields (list): 조회할 필드 (None이면 전체 필드)
+
+        Returns:
+            tuple: (dates, tickers, {field: (T, N) float32 행렬}) - 없는 값은 NaN
+        """
+        start_d, end_d = to_datetime64(start), to_datetime64(end)
+        fields = list(fields or self.fields)
+        years = range(int(str(start_d)[:4]), int(str(end_d)[:4]) + 1)
+        shards = [self._load_shard(year) for year in years]
+
+        if tickers is None:
+            all_tickers = [s['tickers'] for s in shards if len(s['tickers'])]
+            out_tickers = np.unique(np.concatenate(all_tickers)) if all_tickers else np.array([], dtype=self.key_dtype)
+        else:
+            out_tickers = np.asarray(list(tickers), dtype=self.key_dtype)
+
+        date_parts = []
+        field_parts = {field: [] for field in fields}
+        for shard in shards:
+            mask = (shard['dates'] >= start_d) & (shard['dates'] <= end_d)
+            if not mask.any():
+                continue
+            date_parts.append(shard['dates'][mask])
+
+            # 샤드 종목 -> 출력 종목 위치 매핑
+            order = np.argsort(shard['tickers'])
+            sorted_tickers = shard['tickers'][order]
+            pos = np.searchsorted(sorted_tickers, out_tickers)
+            pos = np.clip(pos, 0, max(len(sorted_tickers) - 1, 0))
+            found = (sorted_tickers[pos] == out_tickers) if len(sorted_tickers) else np.zeros(len(out_tickers), dtype=bool)
+            src_cols = order[pos[found]] if len(sorted_tickers) else np.array([], dtype=np.intp)
+
+            for field in fields:
+                block = np.full((int(mask.sum()), len(out_tickers)), np.nan, dtype=np.float32)
+                if len(src_cols):
+                    block[:, found] = shard[field][mask][:, src_cols]
+                field_parts[field].append(block)
+
+        if not date_parts:
+            empty = {field: np.empty((0, len(out_tickers)), dtype=np.float32) for field in fields}
+            return np.array([], dtype='datetime64[D]'), out_tickers, empty
+
+        return (
+            np.concatenate(date_parts),
+            out_tickers,
+            {field: np.concatenate(parts, axis=0) for field, parts in field_parts.items()},
+        )
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def append_frames(self, frames):
+        """
+        일자별 DataFrame을 저장소에 병합
+
+        Args:
+            frames (dict): {date: DataFrame(index=종목코드, columns=fields)}
+        """
+        by_year = {}
+        for date, frame in frames.items():
+            if frame is None or frame.empty:
+                continue
+            day = to_datetime64(date)
+            by_year.setdefault(int(str(day)[:4]), []).append((day, frame))
+
+        with self._lock:
+            for year, items in by_year.items():
+                shard = self._load_shard(year)
+                items = [(day, frame) for day, frame in items if not np.isin(day, shard['dates'])]
+                if not items:
+                    continue
+
+                new_tickers = np.unique(np.concatenate(
+                    [shard['tickers']] + [frame.index.astype(str).to_numpy(dtype=self.key_dtype) for _, frame in items]
+                ))
+                new_dates = np.sort(np.concatenate([shard['dates'], np.array([d for d, _ in items], dtype='datetime64[D]')]))
+
+                old_rows = np.searchsorted(new_dates, shard['dates'])
+                old_cols = np.searchsorted(new_tickers, shard['tickers'])
+                for field in self.fields:
+                    matrix = np.full((len(new_dates), len(new_tickers)), np.nan, dtype=np.float32)
+                    if shard[field].size:
+                        matrix[np.ix_(old_rows, old_cols)] = shard[field]
+                    for day, frame in items:
+                        if field not in frame.columns:
+                            continue
+                        row = np.searchsorted(new_dates, day)
+                        cols = np.searchsorted(new_tickers, frame.index.astype(str).to_numpy(dtype=self.key_dtype))
+                        matrix[row, cols] = pd.to_numeric(frame[field], errors='coerce').to_numpy(dtype=np.float32)
+                    shard[field] = matrix
+
+                shard['dates'] = new_dates
+                shard['tickers'] = new_tickers
+                self._save_shard(year)
+                logger.info(f"[{self.name}] {year} shard updated: +{len(items)} days ({len(new_dates)} days x {len(new_tickers)} tickers)")
+
+    def fetch_day(self, date_str):
+        """
+        하루치 데이터를 조회 (하위 클래스 구현)
+
+        Returns:
+            DataFrame: index=종목코드, columns=fields (휴장일이면 빈 DataFrame)
+        """
+        raise NotImplementedError
+
+    def missing_dates(self, start, end, dates=None):
+        """
+        [start, end] 구간에서 아직 저장되지 않은 일자 (dates가 None이면 평일 기준, 확정되지 않은 당일 제외)
+        """
+        end = min(to_datetime64(end), settled_until())
+        if to_datetime64(start) > end:
+            return np.array([], dtype='datetime64[D]')
+        if dates is None:
+            dates = pd.bdate_range(str(to_datetime64(start)), str(to_datetime64(end))).values.astype('datetime64[D]')
+        return np.setdiff1d(np.asarray(dates, dtype='datetime64[D]'), self.stored_dates(start, end))
+
+    def sync(self, start, end, dates=None):
+        """
+        [start, end] 구간에서 저장되지 않은 일자만 수집하여 저장
+
+        Args:
+            start, end: 수집 구간
+            dates (array): 수집 대상 거래일 (None이면 평일 전체)
+
+        Returns:
+            int: 새로 저장된 일자 수
+        """
+        missing = self.missing_dates(start, end, dates)
+        if len(missing) == 0:
+            return 0
+
+        logger.info(f"[{self.name}] Syncing {len(missing)} missing days ({missing[0]} ~ {missing[-1]})")
+        # 일자별 조회는 공용 풀에서 동시에 실행하고, 일정량(SYNC_BATCH_DAYS)마다 중간 저장
+        for lo in range(0, len(missing), self.SYNC_BATCH_DAYS):
+            batch = [str(day).replace('-', '') for day in missing[lo:lo + self.SYNC_BATCH_DAYS]]
+            frames = {}
+            for date_str, frame in map_parallel(self.fetch_day, batch):
+                if isinstance(frame, Exception):
+                    logger.warning(f"[{self.name}] fetch failed for {date_str}: {frame}")
+                    continue
+                if frame is not None and not frame.empty:
+                    frames[to_datetime64(date_str)] = frame
+            self.append_frames(frames)
+        return len(missing)
+
+
+class PriceStore(PanelStore):
+    """
+    전 종목 일별 OHLCV 저장소
+
+    pykrx의 일자별 전 종목 시세(get_market_ohlcv_by_ticker)를 하루 한 번만 조회해 저장합니다.
+    """
+
+    name = 'ohlcv'
+    fields = ('open', 'high', 'low', 'close', 'volume', 'trading_value')
+
+    _column_map = {
+        '시가': 'open',
+        '고가': 'high',
+        '저가': 'low',
+        '종가': 'close',
+        '거래량': 'volume',
+        '거래대금': 'trading_value',
+    }
+
+    def fetch_day(self, date_str):
+        if not pykrx_stock:
+            raise RuntimeError("pykrx is not available")
+        df = get_rate_limiter().call(pykrx_stock.get_market_ohlcv_by_ticker, date_str, market='ALL')
+        if df is None or df.empty:
+            return pd.DataFrame()
+        df = df.rename(columns=self._column_map)
+        # 휴장일에는 전 종목 시가/종가가 0으로 내려옴
+        if (df['close'] == 0).all():
+            return pd.DataFrame()
+        df = df[[c for c in self.fields if c in df.columns]].astype(float)
+        # 거래정지 종목은 시가/고가/저가가 0으로 내려오므로 NaN 처리
+        for column in ('open', 'high', 'low'):
+            df.loc[df[column] == 0, column] = np.nan
+        return df
+
+
+_price_store = None
+
+
+def get_price_store():
+    """
+    프로세스 공용 PriceStore 인스턴스
+    """
+    global _price_store
+    if _price_store is None:
+        _price_store = PriceStore()
+    return _price_store
+
+
+class IndexStore(PanelStore):
+    """
+    벤치마크 지수 일별 종가 저장소 (종목 축 = 지수 코드)
+
+    지수는 종목 수가 적으므로 일자별이 아니라 지수별 기간 조회(get_index_ohlcv_by_date)로 한 번에 수집합니다.
+    이미 저장한 일자는 다시 받지 않으므로 BENCHMARKS에 있는 지수만 다룹니다.
+    """
+
+    name = 'index'
+    fields = ('close',)
+
+    # 벤치마크 이름 -> KRX 지수 코드
+    BENCHMARKS = {
+        'KOSPI': '1001',
+        'KOSDAQ': '2001',
+        'KRX300': '5042',
+    }
+
+    @classmethod
+    def resolve(cls, benchmark):
+        """
+        벤치마크 이름 또는 지수 코드를 지수 코드로 변환
+
+        Raises:
+            ValueError: BENCHMARKS에 없는 벤치마크 (저장소가 수집하지 않으므로 결과가 비게 됨)
+        """
+        code = cls.BENCHMARKS.get(str(benchmark).strip().upper(), str(benchmark).strip())
+        if code not in cls.BENCHMARKS.values():
+            raise ValueError(f"Unknown benchmark: {benchmark} (supported: {', '.join(cls.BENCHMARKS)})")
+        return code
+
+    def _fetch_range(self, start_str, end_str):
+        if not pykrx_stock:
+            raise RuntimeError("pykrx is not available")
+        fetched = fetch_parallel({
+            ticker: (pykrx_stock.get_index_ohlcv_by_date, (start_str, end_str, ticker))
+            for ticker in self.BENCHMARKS.values()
+        })
+        frames = {}
+        for ticker, df in fetched.items():
+            if df is None or df.empty:
+                continue
+            for day, close in zip(df.index.values.astype('datetime64[D]'), df['종가'].to_numpy(dtype=float)):
+                frames.setdefault(day, {})[ticker] = close
+        return {
+            day: pd.DataFrame({'close': pd.Series(values, dtype=float)})
+            for day, values in frames.items()
+        }
+
+    def fetch_day(self, date_str):
+        return self._fetch_range(date_str, date_str).get(to_datetime64(date_str), pd.DataFrame())
+
+    def sync(self, start, end, dates=None):
+        missing = self.missing_dates(start, end, dates)
+        if len(missing) == 0:
+            return 0
+
+        logger.info(f"[{self.name}] Syncing {len(missing)} missing days ({missing[0]} ~ {missing[-1]})")
+        try:
+            frames = self._fetch_range(str(missing[0]).replace('-', ''), str(missing[-1]).replace('-', ''))
+        except Exception as e:
+            # 일부 지수만 저장되지 않도록 실패 시 전체 구간을 다음 기회에 다시 수집
+            logger.warning(f"[{self.name}] fetch failed ({missing[0]} ~ {missing[-1]}): {e}")
+            return 0
+        self.append_frames({day: frame for day, frame in frames.items() if np.isin(day, missing)})
+        return len(missing)
+
+    def series(self, benchmark, start, end, dates=None):
+        """
+        벤치마크 종가 시계열 (저장되지 않은 구간은 먼저 수집)
+
+        Returns:
+            tuple: (dates, closes) - datetime64[D] 배열, float64 배열
+        """
+        self.sync(start, end, dates=dates)
+        days, _, panel = self.window(start, end, tickers=[self.resolve(benchmark)], fields=('close',))
+        return days, panel['close'][:, 0].astype(np.float64)
+
+
+_index_store = None
+
+
+def get_index_store():
+    """
+    프로세스 공용 IndexStore 인스턴스
+    """
+    global _index_store
+    if _index_store is None:
+        _index_store = IndexStore()
+    return _index_store
+
+
+class FlowStore(PanelStore):
+    """
+    전 종목 일별 투자자 순매수 저장소 (기관합계/외국인 순매수 거래대금 + 시가총액/종가)
+
+    하루치 값만 한 번 저장해 두고, 1일/1주/1개월 등 임의 기간 집계는
+    period_totals()에서 누적합 차이로 한 번에 계산합니다.
+    """
+
+    name = 'flow'
+    fields = ('inst_netbuy', 'fgn_netbuy', 'market_cap', 'close')
+
+    INVESTORS = {
+        'inst_netbuy': '기관합계',
+        'fgn_netbuy': '외국인',
+    }
+
+    def fetch_day(self, date_str):
+        if not pykrx_stock:
+            raise RuntimeError("pykrx is not available")
+        # 시가총액/종가와 투자자별 순매수는 서로 독립적이므로 동시에 조회
+        calls = {'cap': (pykrx_stock.get_market_cap_by_ticker, (date_str,), {'market': 'ALL'})}
+        for field, investor in self.INVESTORS.items():
+            calls[field] = (pykrx_stock.get_market_net_purchases_of_equities_by_ticker, (date_str, date_str, 'ALL', investor))
+        fetched = fetch_parallel(calls)
+
+        cap = fetched['cap']
+        if cap is None or cap.empty or (cap['종가'] == 0).all():
+            return pd.DataFrame()
+        df = pd.DataFrame({'market_cap': cap['시가총액'], 'close': cap['종가']}).astype(float)
+        df.loc[df['close'] == 0, 'close'] = np.nan
+        for field in self.INVESTORS:
+            flow = fetched[field]
+            # 순매수 내역이 없는 종목은 0 (조회 실패와 구분하기 위해 빈 결과는 그대로 0 처리)
+            netbuy = flow['순매수거래대금'] if flow is not None and not flow.empty else pd.Series(dtype=float)
+            df[field] = netbuy.reindex(df.index).fillna(0.0).astype(float)
+        return df
+
+    def period_totals(self, end, starts, dates=None, tickers=None):
+        """
+        여러 기간 [start, end]의 누적 순매수와 기간 수익률을 한 번의 구간 조회로 계산
+
+        Args:
+            end: 기간 종료일 (모든 기간 공통)
+            starts (list): 기간 시작일 목록
+            dates (array): 수집 대상 거래일 (None이면 평일 전체)
+            tickers (list): 대상 종목 (None이면 전체)
+
+        Returns:
+            dict: {start: DataFrame(index=종목코드,
+                   columns=['inst_netbuy', 'fgn_netbuy', 'market_cap', 'close', 'return'])}
+                  return은 시작일 종가 대비 종료일 종가 등락률(%)
+        """
+        first = min(to_datetime64(start) for start in starts)
+        self.sync(first, end, dates=dates)
+        days, codes, panel = self.window(first, end, tickers=tickers)
+        if len(days) == 0:
+            return {start: pd.DataFrame() for start in starts}
+
+        # 시작 행 i부터 마지막 행까지의 합 = cumsum[-1] - cumsum[i]
+        cumsum = {
+            field: np.concatenate([
+                np.zeros((1, len(codes))),
+                np.nancumsum(panel[field].astype(np.float64), axis=0),
+            ])
+            for field in self.INVESTORS
+        }
+        close = panel['close'].astype(np.float64)
+        index = pd.Index(codes, name='code')
+
+        results = {}
+        for start in starts:
+            i = min(int(np.searchsorted(days, to_datetime64(start))), len(days) - 1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ret = (close[-1] / close[i] - 1.0) * 100.0
+            results[start] = pd.DataFrame({
+                'inst_netbuy': cumsum['inst_netbuy'][-1] - cumsum['inst_netbuy'][i],
+                'fgn_netbuy': cumsum['fgn_netbuy'][-1] - cumsum['fgn_netbuy'][i],
+                'market_cap': panel['market_cap'][-1].astype(np.float64),
+                'close': close[-1],
+                'return': ret,
+            }, index=index)
+        return results
+
+
+_flow_store = None
+
+
+def get_flow_store():
+    """
+    프로세스 공용 FlowStore 인스턴스
+    """
+    global _flow_store
+    if _flow_store is None:
+        _flow_store = FlowStore()
+    return _flow_store
+
+
+class SectorFlowStore(PanelStore):
+    """
+    업종별 일별 투자자 순매수 합계 / 시가총액 / 시가총액 가중 수익률 저장소 (종목 축 = '시장:업종')
+
+    네트워크 조회 없이 FlowStore의 일별 배열을 종목 마스터의 업종 분류로 묶어(원-핫 행렬 곱)
+    새로 생긴 일자만 한 번에 집계해 저장합니다. 업종 분류는 현재 기준입니다.
+    """
+
+    name = 'sector_flow'
+    fields = ('inst_netbuy', 'fgn_netbuy', 'market_cap', 'cap_return')
+    key_dtype = '<U48'
+
+    def __init__(self, flow_store=None, ticker_master=None, base_dir=None):
+        super().__init__(base_dir)
+        self.flow_store = flow_store or get_flow_store()
+        self.ticker_master = ticker_master or get_ticker_master()
+
+    def _group_matrix(self, codes):
+        master = self.ticker_master.frame(listed_only=False)
+        master = master.reindex(pd.Index(codes))
+        keys = (master['market'].fillna('') + ':' + master['sector'].fillna('')).to_numpy(dtype=object)
+        # 업종 정보가 없는 종목(지수/ETF 등)은 제외
+        valid = master['sector'].fillna('').to_numpy(dtype=object) != ''
+        groups, inverse = np.unique(keys[valid], return_inverse=True)
+        onehot = np.zeros((len(codes), len(groups)))
+        onehot[np.flatnonzero(valid), inverse] = 1.0
+        return groups.astype(self.key_dtype), onehot
+
+    def sync(self, start, end, dates=None):
+        missing = self.missing_dates(start, end, dates)
+        if len(missing) == 0:
+            return 0
+
+        # 수익률 계산을 위해 첫 누락일의 전 거래일까지 원천 데이터를 확보
+        from .logic_calendar import get_calendar
+        calendar = get_calendar()
+        first = calendar.previous(missing[0], offset=1)
+        first = missing[0] if first is None else first
+        self.flow_store.sync(first, missing[-1], dates=calendar.trading_days(first, missing[-1]) if dates is not None else None)
+
+        days, codes, panel = self.flow_store.window(first, missing[-1])
+        if len(days) == 0:
+            return 0
+        groups, onehot = self._group_matrix(codes)
+        if len(groups) == 0:
+            logger.warning(f"[{self.name}] no sector classification available; refresh the ticker master first")
+            return 0
+
+        # (T, N) @ (N, G) -> (T, G): 모든 일자를 한 번에 업종별 합계로 축약
+        sums = {
+            field: np.nan_to_num(panel[field].astype(np.float64)) @ onehot
+            for field in ('inst_netbuy', 'fgn_netbuy', 'market_cap')
+        }
+        close = panel['close'].astype(np.float64)
+        cap = panel['market_cap'].astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ret = close[1:] / close[:-1] - 1.0
+        weight = np.where(np.isfinite(ret) & np.isfinite(cap[:-1]), cap[:-1], 0.0)
+        weighted = np.nan_to_num(ret * weight) @ onehot
+        total_weight = weight @ onehot
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cap_return = np.vstack([np.full((1, len(groups)), np.nan), weighted / total_weight * 100.0])
+
+        frames = {}
+        for row, day in enumerate(days):
+            if not np.isin(day, missing):
+                continue
+            frames[day] = pd.DataFrame({
+                'inst_netbuy': sums['inst_netbuy'][row],
+                'fgn_netbuy': sums['fgn_netbuy'][row],
+                'market_cap': sums['market_cap'][row],
+                'cap_return': cap_return[row],
+            }, index=pd.Index(groups))
+        self.append_frames(frames)
+        return len(missing)
+
+    def period_totals(self, end, starts, dates=None, market='ALL'):
+        """
+        여러 기간 [start, end]의 업종별 누적 순매수와 시가총액 가중 누적 수익률
+
+        Returns:
+            dict: {start: DataFrame(index='시장:업종',
+                   columns=['inst_netbuy', 'fgn_netbuy', 'market_cap', 'return'])} - return은 %
+        """
+        first = min(to_datetime64(start) for start in starts)
+        self.sync(first, end, dates=dates)
+        days, keys, panel = self.window(first, end)
+        if market and market != 'ALL':
+            keep = np.char.startswith(keys.astype(str), f'{market}:')
+            keys = keys[keep]
+            panel = {field: values[:, keep] for field, values in panel.items()}
+        if len(days) == 0 or len(keys) == 0:
+            return {start: pd.DataFrame() for start in starts}
+
+        zeros = np.zeros((1, len(keys)))
+        cumsum = {
+            field: np.concatenate([zeros, np.nancumsum(panel[field].astype(np.float64), axis=0)])
+            for field in ('inst_netbuy', 'fgn_netbuy')
+        }
+        # 일간 수익률의 복리 누적 = exp(log(1+r) 누적합 차이)
+        log_growth = np.concatenate([zeros, np.nancumsum(np.log1p(panel['cap_return'].astype(np.float64) / 100.0), axis=0)])
+
+        results = {}
+        for start in starts:
+            i = min(int(np.searchsorted(days, to_datetime64(start))), len(days) - 1)
+            results[start] = pd.DataFrame({
+                'inst_netbuy': cumsum['inst_netbuy'][-1] - cumsum['inst_netbuy'][i],
+                'fgn_netbuy': cumsum['fgn_netbuy'][-1] - cumsum['fgn_netbuy'][i],
+                'market_cap': panel['market_cap'][-1].astype(np.float64),
+                # 시작일 종가 기준이므로 시작일 당일 수익률(i행)은 제외
+                'return': (np.exp(log_growth[-1] - log_growth[i + 1]) - 1.0) * 100.0,
+            }, index=pd.Index(keys, name='sector'))
+        return results
+
+
+_sector_flow_store = None
+
+
+def get_sector_flow_store():
+    """
+    프로세스 공용 SectorFlowStore 인스턴스
+    """
+    global _sector_flow_store
+    if _sector_flow_store is None:
+        _sector_flow_store = SectorFlowStore()
+    return _sector_flow_store
+
+
+class TickerMaster:
+    """
+    전 종목 기준정보 마스터 (코드, 종목명, 시장, 업종, 상장 상태)
+
+    기준 영업일마다 시장별 일괄 조회(시장당 2~3회)로 한 번만 갱신해 로컬(npz)에 저장합니다.
+    목록에서 사라진 종목은 지우지 않고 'delisted'로 남겨, 과거 구간(백테스트)에서도 이름을 찾을 수 있습니다.
+    """
+
+    MARKETS = ('KOSPI', 'KOSDAQ', 'KONEX')
+    columns = ('name', 'market', 'sector', 'status')
+
+    def __init__(self, base_dir=None):
+        self.path = os.path.join(base_dir or get_store_dir(), 'ticker_master.npz')
+        self._frame = None  # index: code, columns: name/market/sector/status/last_seen
+        self._as_of = None
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # 캐시 관리
+    # ------------------------------------------------------------------
+    def _load(self):
+        if self._frame is not None:
+            return
+        if os.path.exists(self.path):
+            with np.load(self.path, allow_pickle=False) as npz:
+                cols = {key: npz[key] for key in npz.files}
+            self._as_of = str(cols.pop('as_of')[()]) or None
+            codes = cols.pop('code')
+            self._frame = pd.DataFrame({key: cols[key] for key in self.columns}, index=pd.Index(codes, name='code'))
+            self._frame['last_seen'] = cols['last_seen'].astype('datetime64[D]')
+        else:
+            self._frame = pd.DataFrame(columns=self.columns + ('last_seen',), index=pd.Index([], name='code'))
+
+    def _save(self):
+        tmp_path = f'{self.path}.tmp.npz'
+        np.savez_compressed(
+            tmp_path,
+            as_of=np.array(self._as_of or ''),
+            code=self._frame.index.to_numpy(dtype='<U12'),
+            last_seen=self._frame['last_seen'].to_numpy(dtype='datetime64[D]'),
+            **{key: self._frame[key].to_numpy(dtype=np.str_) for key in self.columns},
+        )
+        os.replace(tmp_path, self.path)
+
+    def _fetch(self, date_str):
+        if not pykrx_stock:
+            raise RuntimeError("pykrx is not available")
+        def sectors_of(market):
+            # 업종 분류는 부가 정보이므로 실패해도 갱신을 막지 않음
+            try:
+                return pykrx_stock.get_market_sector_classifications(date_str, market)
+            except Exception as e:
+                logger.warning(f"[ticker_master] sector fetch failed for {market}: {e}")
+                return None
+
+        # 시장별 목록/종목명(등락률 조회 결과에 일괄 포함)/업종 조회를 모두 동시에 실행
+        calls = {}
+        for market in self.MARKETS:
+            calls[(market, 'codes')] = (pykrx_stock.get_market_ticker_list, (date_str,), {'market': market})
+            calls[(market, 'change')] = (pykrx_stock.get_market_price_change_by_ticker, (date_str, date_str), {'market': market})
+            if market != 'KONEX':
+                calls[(market, 'sectors')] = (sectors_of, (market,))
+        fetched = fetch_parallel(calls)
+
+        frames = []
+        for market in self.MARKETS:
+            codes = fetched[(market, 'codes')]
+            if not codes:
+                continue
+            frame = pd.DataFrame(index=pd.Index(codes, name='code'))
+            change = fetched[(market, 'change')]
+            frame['name'] = change['종목명'] if change is not None and '종목명' in change.columns else ''
+            frame['sector'] = ''
+            sectors = fetched.get((market, 'sectors'))
+            if sectors is not None and '업종명' in sectors.columns:
+                frame['sector'] = sectors['업종명']
+            frame['market'] = market
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame()
+        fetched = pd.concat(frames)
+        return fetched[~fetched.index.duplicated()].fillna('')
+
+    # ------------------------------------------------------------------
+    # 갱신 / 조회
+    # ------------------------------------------------------------------
+    def refresh(self, date=None, force=False):
+        """
+        기준 영업일의 종목 마스터로 갱신 (이미 그 날짜 기준이면 조회하지 않음)
+
+        Args:
+            date: 기준 영업일 (None이면 캘린더의 최근 영업일)
+            force (bool): 같은 날짜라도 다시 조회
+
+        Returns:
+            bool: 실제로 조회했는지 여부
+        """
+        if date is None:
+            from .logic_calendar import get_calendar
+            date = get_calendar().nearest_business_day(datetime.now())
+        day = to_datetime64(date)
+        with self._lock:
+            self._load()
+            if not force and self._as_of is not None and np.datetime64(self._as_of, 'D') >= day:
+                return False
+
+            date_str = str(day).replace('-', '')
+            try:
+                fetched = self._fetch(date_str)
+            except Exception as e:
+                logger.warning(f"[ticker_master] refresh failed ({date_str}): {e}")
+                return False
+            if fetched.empty:
+                logger.warning(f"[ticker_master] no tickers returned for {date_str}")
+                return False
+
+            fetched['status'] = 'listed'
+            fetched['last_seen'] = day
+            previous = self._frame[~self._frame.index.isin(fetched.index)].copy()
+            previous['status'] = 'delisted'
+            fetched = fetched[list(self.columns) + ['last_seen']]
+            self._frame = (pd.concat([fetched, previous]) if len(previous) else fetched).sort_index()
+            self._as_of = str(day)
+            self._save()
+            logger.info(f"[ticker_master] refreshed for {date_str}: {len(fetched)} listed, {len(previous)} delisted")
+            return True
+
+    @property
+    def as_of(self):
+        with self._lock:
+            self._load()
+            return self._as_of
+
+    def frame(self, market='ALL', listed_only=True, date=None):
+        """
+        종목 마스터 DataFrame (index: code, columns: name/market/sector/status)
+
+        Args:
+            market (str): 'ALL' 또는 시장 이름 (KOSPI/KOSDAQ/KONEX)
+            listed_only (bool): 현재 상장 종목만
+            date: 지정 시 그 영업일 기준으로 먼저 갱신
+        """
+        if date is not None:
+            self.refresh(date)
+        with self._lock:
+            self._load()
+            df = self._frame
+            if listed_only:
+                df = df[df['status'] == 'listed']
+            if market and market != 'ALL':
+                df = df[df['market'] == market]
+            return df[list(self.columns)].copy()
+
+    def names(self, codes):
+        """
+        종목 코드 배열 -> 종목명 Series (모르는 코드는 코드 그대로)
+        """
+        with self._lock:
+            self._load()
+            names = self._frame['name'].reindex(pd.Index(codes))
+        names = names.where(names.notna() & (names != ''), pd.Series(names.index, index=names.index))
+        return names
+
+    def name(self, code):
+        return self.names([code]).iloc[0]
+
+    def market_map(self):
+        """
+        매매동향 분석용 시장 구분 맵 (index: '티커', column: '시장구분')
+        """
+        df = self.frame(listed_only=True)[['market']].rename(columns={'market': '시장구분'})
+        df.index.name = '티커'
+        return df
+
+
+_ticker_master = None
+
+
+def get_ticker_master():
+    """
+    프로세스 공용 TickerMaster 인스턴스
+    """
+    global _ticker_master
+    if _ticker_master is None:
+        _ticker_master = TickerMaster()
+    return _ticker_master
+
+
+def _reset_after_fork():
+    """
+    fork된 자식 프로세스에서 공용 인스턴스를 버림 (부모 스레드가 잡고 있던 락을 물려받지 않도록 새로 생성)
+    """
+    global _price_store, _index_store, _flow_store, _sector_flow_store, _ticker_master
+    _price_store = _index_store = _flow_store = _sector_flow_store = _ticker_master = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
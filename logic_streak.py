@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Trend Streaks
+일별 순매수/수익률 이력 패널에 대한 순위 및 연속 기록(streak) 계산 (NumPy 벡터 연산)
+
+모든 함수는 (일자 T, 종목 N) 행렬을 받아 일자 축을 따라 한 번에 계산합니다.
+"""
+import numpy as np
+
+
+def rank_panel(values, descending=True):
+    """
+    일자별 종목 순위 (1이 최상위, 값이 없는 칸은 0)
+
+    Args:
+        values (ndarray): (T, N) 값 행렬 (NaN은 순위 제외)
+        descending (bool): 큰 값이 높은 순위
+
+    Returns:
+        ndarray: (T, N) int32 순위
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.isfinite(values)
+    keys = np.where(valid, -values if descending else values, np.inf)
+    order = np.argsort(keys, axis=1, kind='stable')
+    ranks = np.empty(values.shape, dtype=np.int32)
+    np.put_along_axis(ranks, order, np.arange(1, values.shape[1] + 1, dtype=np.int32)[None, :], axis=1)
+    ranks[~valid] = 0
+    return ranks
+
+
+def streak_lengths(mask):
+    """
+    각 일자에서 끝나는 연속 True 길이
+
+    Args:
+        mask (ndarray): (T, N) bool
+
+    Returns:
+        ndarray: (T, N) int32 (해당 일자가 False면 0)
+    """
+    mask = np.asarray(mask, dtype=bool)
+    counts = np.cumsum(mask, axis=0, dtype=np.int32)
+    # 마지막 False 시점의 누적값을 앞으로 채워 빼면 현재 연속 길이
+    reset = np.where(~mask, counts, 0)
+    reset = np.maximum.accumulate(reset, axis=0)
+    return counts - reset
+
+
+def entered_top(ranks, top_n):
+    """
+    마지막 일자에 처음으로 상위 top_n에 진입한 종목 (전일에는 top_n 밖)
+
+    Returns:
+        ndarray: (N,) bool
+    """
+    ranks = np.asarray(ranks)
+    in_top = (ranks > 0) & (ranks <= top_n)
+    if len(ranks) < 2:
+        return in_top[-1] if len(ranks) else np.zeros(ranks.shape[1:], dtype=bool)
+    return in_top[-1] & ~in_top[-2]
+
+
+def daily_returns(close):
+    """
+    (T, N) 종가 -> (T, N) 일간 수익률(%) (첫 행과 결측 구간은 NaN)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(close.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out[1:] = (close[1:] / close[:-1] - 1.0) * 100.0
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def top_streaks(mask, limit, min_length=1):
+    """
+    마지막 일자 기준 연속 기록이 긴 종목 선택
+
+    Returns:
+        tuple: (종목 열 인덱스, 연속 길이) - 길이 내림차순, 최대 limit개
+    """
+    lengths = streak_lengths(mask)[-1] if len(mask) else np.zeros(0, dtype=np.int32)
+    idx = np.flatnonzero(lengths >= min_length)
+    idx = idx[np.argsort(-lengths[idx], kind='stable')][:limit]
+    return idx, lengths[idx]
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 import traceback
-import json
 from datetime import datetime
 from plugin import *
 from .setup import P
 from framework import db
-from .backtesting import BacktestingEngine, BacktestingHistory
+from .backtesting import BacktestingEngine, BacktestingHistory, run_history_robustness
+from .backtesting_jobs import get_job_manager
+from .logic_calendar import get_calendar
+from .logic_store import IndexStore
 from .strategies import get_strategies_info
 
 
@@ -35,6 +37,16 @@ class ModuleBacktesting(PluginModuleBase):
         'backtest_end_date': datetime.now().strftime('%Y-%m-%d'),
         'backtest_initial_capital': '100000000',  # 1억
         'backtest_rebalance_interval': 'monthly',
+        'backtest_ladder_splits': '7',
+        'backtest_ladder_step_pct': '3',
+        'backtest_ladder_take_profit_pct': '3',
+        'backtest_ladder_amount_per_split': '1000000',
+        'backtest_max_jobs': '2',
+        'backtest_benchmark': 'KOSPI',
+        'backtest_seed': '42',
+        'backtest_cost_model': 'default',  # none / default / conservative
+        'backtest_robustness_samples': '2000',
+        'backtest_robustness_block_size': '5',
     }
 
     def __init__(self, P):
@@ -95,52 +107,112 @@ class ModuleBacktesting(PluginModuleBase):
     def process_ajax(self, sub, req):
         try:
             if sub == 'run_backtest':
-                # 백테스팅 실행
+                # 백테스팅 작업 등록 (백그라운드 실행, 진행 상황은 socketio로 전송)
                 strategy_id = req.form.get('strategy_id')
-                start_date = req.form.get('start_date', P.ModelSetting.get('backtest_start_date'))
-                end_date = req.form.get('end_date', P.ModelSetting.get('backtest_end_date'))
-                initial_capital = int(req.form.get('initial_capital', P.ModelSetting.get('backtest_initial_capital')))
-                rebalance_interval = req.form.get('rebalance_interval', P.ModelSetting.get('backtest_rebalance_interval'))
-                
-                # 백테스팅 엔진 생성
-                dart_api_key = P.ModelSetting.get('dart_api_key')
-                engine = BacktestingEngine(dart_api_key=dart_api_key)
-                
-                # 백테스팅 실행
-                result = engine.run_backtest(
-                    strategy_id=strategy_id,
-                    start_date=start_date,
-                    end_date=end_date,
-                    initial_capital=initial_capital,
-                    rebalance_interval=rebalance_interval
-                )
-                
-                if result['success']:
-                    # 이력 저장
-                    backtest_result = result['results']
-                    history = BacktestingHistory()
-                    history.strategy_id = strategy_id
-                    history.strategy_name = backtest_result['strategy_name']
-                    history.start_date = datetime.strptime(start_date, '%Y-%m-%d')
-                    history.end_date = datetime.strptime(end_date, '%Y-%m-%d')
-                    history.initial_capital = initial_capital
-                    history.final_value = backtest_result['performance_metrics'].get('final_value', 0)
-                    history.total_return = backtest_result['performance_metrics'].get('total_return', 0)
-                    history.cagr = backtest_result['performance_metrics'].get('cagr', 0)
-                    history.sharpe_ratio = backtest_result['performance_metrics'].get('sharpe_ratio', 0)
-                    history.backtest_data = json.dumps(backtest_result, default=str)
-                    
-                    db.session.add(history)
-                    db.session.commit()
-                    
-                    return jsonify({
-                        'ret': 'success', 
-                        'msg': '백테스팅이 완료되었습니다.', 
-                        'data': backtest_result
-                    })
-                else:
-                    return jsonify({'ret': 'error', 'msg': result['error']})
+                params = {
+                    'dart_api_key': P.ModelSetting.get('dart_api_key'),
+                    'strategy_id': strategy_id,
+                    'start_date': req.form.get('start_date', P.ModelSetting.get('backtest_start_date')),
+                    'end_date': req.form.get('end_date', P.ModelSetting.get('backtest_end_date')),
+                    'initial_capital': int(req.form.get('initial_capital', P.ModelSetting.get('backtest_initial_capital'))),
+                    'rebalance_interval': req.form.get('rebalance_interval', P.ModelSetting.get('backtest_rebalance_interval')),
+                    'benchmark': req.form.get('benchmark', P.ModelSetting.get('backtest_benchmark')),
+                    'cost_model': req.form.get('cost_model', P.ModelSetting.get('backtest_cost_model')),
+                    'seed': int(req.form.get('seed', P.ModelSetting.get('backtest_seed'))),
+                }
+                error = self._check_benchmark(params['benchmark'])
+                if error:
+                    return jsonify({'ret': 'error', 'msg': error})
+                # 워커 프로세스는 DB에 접근하지 않으므로 공시/지분율 입력은 여기서 확정
+                params['screening_inputs'] = BacktestingEngine(params['dart_api_key']).load_screening_inputs(strategy_id)
+                job_id = get_job_manager().submit('strategy', params, label=strategy_id)
+                return jsonify({'ret': 'success', 'msg': '백테스트 작업이 등록되었습니다.', 'job_id': job_id})
             
+            elif sub == 'run_ladder_backtest':
+                # 세븐스플릿 래더 백테스트 작업 등록
+                strategy_id = req.form.get('strategy_id')
+                codes = [c.strip() for c in req.form.get('codes', '').split(',') if c.strip()]
+                if not codes:
+                    # 워커 프로세스는 DB에 접근하지 않으므로 대상 종목은 여기서 확정
+                    codes = BacktestingEngine.resolve_ladder_codes(strategy_id)
+                if not codes:
+                    return jsonify({'ret': 'error', 'msg': '래더 백테스트 대상 종목이 없습니다.'})
+
+                params = {
+                    'start_date': req.form.get('start_date', P.ModelSetting.get('backtest_start_date')),
+                    'end_date': req.form.get('end_date', P.ModelSetting.get('backtest_end_date')),
+                    'codes': codes,
+                    'strategy_id': strategy_id,
+                    'splits': int(req.form.get('splits', P.ModelSetting.get('backtest_ladder_splits'))),
+                    'step_pct': float(req.form.get('step_pct', P.ModelSetting.get('backtest_ladder_step_pct'))),
+                    'take_profit_pct': float(req.form.get('take_profit_pct', P.ModelSetting.get('backtest_ladder_take_profit_pct'))),
+                    'amount_per_split': int(req.form.get('amount_per_split', P.ModelSetting.get('backtest_ladder_amount_per_split'))),
+                    'benchmark': req.form.get('benchmark', P.ModelSetting.get('backtest_benchmark')),
+                    'cost_model': req.form.get('cost_model', P.ModelSetting.get('backtest_cost_model')),
+                }
+                error = self._check_benchmark(params['benchmark'])
+                if error:
+                    return jsonify({'ret': 'error', 'msg': error})
+                job_id = get_job_manager().submit('ladder', params, label=f"래더 ({len(codes)}종목)")
+                return jsonify({'ret': 'success', 'msg': '래더 백테스트 작업이 등록되었습니다.', 'job_id': job_id})
+
+            elif sub == 'get_backtest_jobs':
+                return jsonify({'ret': 'success', 'data': get_job_manager().list()})
+
+            elif sub == 'cancel_backtest':
+                if get_job_manager().cancel(req.form.get('job_id')):
+                    return jsonify({'ret': 'success', 'msg': '취소를 요청했습니다.'})
+                return jsonify({'ret': 'error', 'msg': '실행 중인 작업이 아닙니다.'})
+
+            elif sub == 'get_backtest_result':
+                history = db.session.query(BacktestingHistory).filter_by(id=req.form.get('history_id', type=int)).first()
+                if not history:
+                    return jsonify({'ret': 'error', 'msg': '백테스트 이력이 없습니다.'})
+                return jsonify({'ret': 'success', 'data': history.to_result()})
+
+            elif sub == 'extend_backtest':
+                # 저장된 엔진 상태에서 새 종료일까지 이어서 실행
+                history = db.session.query(BacktestingHistory).filter_by(id=req.form.get('history_id', type=int)).first()
+                if not history:
+                    return jsonify({'ret': 'error', 'msg': '백테스트 이력이 없습니다.'})
+                end_date = req.form.get('end_date') or self._last_closed_trading_day()
+                job_id = get_job_manager().extend(history, end_date)
+                return jsonify({'ret': 'success', 'msg': f'{end_date}까지 연장 작업이 등록되었습니다.', 'job_id': job_id})
+
+            elif sub == 'set_tracked':
+                history = db.session.query(BacktestingHistory).filter_by(id=req.form.get('history_id', type=int)).first()
+                if not history:
+                    return jsonify({'ret': 'error', 'msg': '백테스트 이력이 없습니다.'})
+                history.tracked = req.form.get('tracked') == 'true'
+                db.session.commit()
+                return jsonify({'ret': 'success', 'msg': '자동 연장 대상으로 설정되었습니다.' if history.tracked else '자동 연장이 해제되었습니다.'})
+
+            elif sub == 'run_robustness':
+                # 부트스트랩 강건성 분석 (저장된 곡선/매매 내역을 배치 재표본화, 엔진 재실행 없음)
+                history = db.session.query(BacktestingHistory).filter_by(id=req.form.get('history_id', type=int)).first()
+                if not history:
+                    return jsonify({'ret': 'error', 'msg': '백테스트 이력이 없습니다.'})
+                num_samples = min(int(req.form.get('num_samples', P.ModelSetting.get('backtest_robustness_samples'))), 20000)
+                result = run_history_robustness(
+                    history,
+                    method=req.form.get('method', 'returns'),
+                    num_samples=num_samples,
+                    block_size=int(req.form.get('block_size', P.ModelSetting.get('backtest_robustness_block_size'))),
+                    seed=int(req.form.get('seed', P.ModelSetting.get('backtest_seed')))
+                )
+                return jsonify({'ret': 'success', 'data': result})
+
+            elif sub == 'get_backtest_curve':
+                # 차트용 자산 곡선만 조회 (이력 페이지에서 지연 로딩)
+                history = db.session.query(BacktestingHistory).filter_by(id=req.form.get('history_id', type=int)).first()
+                if not history:
+                    return jsonify({'ret': 'error', 'msg': '백테스트 이력이 없습니다.'})
+                curve = history.get_curve()
+                return jsonify({'ret': 'success', 'data': {
+                    'date': [str(d) for d in curve['date']],
+                    'value': [float(v) for v in curve['value']],
+                }})
+
             elif sub == 'get_backtest_history':
                 # 백테스팅 이력 조회
                 histories = db.session.query(BacktestingHistory).order_by(
@@ -158,6 +230,14 @@ class ModuleBacktesting(PluginModuleBase):
                         'total_return': h.total_return,
                         'cagr': h.cagr,
                         'sharpe_ratio': h.sharpe_ratio,
+                        'sortino_ratio': h.sortino_ratio,
+                        'calmar_ratio': h.calmar_ratio,
+                        'max_drawdown': h.max_drawdown,
+                        'max_drawdown_duration': h.max_drawdown_duration,
+                        'benchmark': h.benchmark,
+                        'alpha': h.alpha,
+                        'beta': h.beta,
+                        'information_ratio': h.information_ratio,
                         'created_at': h.created_at.strftime('%Y-%m-%d %H:%M:%S')
                     })
                 
@@ -189,6 +269,42 @@ class ModuleBacktesting(PluginModuleBase):
     def scheduler_function(self):
         """주기적으로 실행될 작업 정의"""
         P.logger.info("Backtesting module scheduler executed")
+        self.extend_tracked_backtests()
+
+    @staticmethod
+    def _check_benchmark(benchmark):
+        """
+        지원하지 않는 벤치마크면 오류 메시지 (없거나 지원하면 None)
+        """
+        if not benchmark:
+            return None
+        try:
+            IndexStore.resolve(benchmark)
+        except ValueError as e:
+            return str(e)
+        return None
+
+    @staticmethod
+    def _last_closed_trading_day():
+        return get_calendar().last_closed_day(fmt='%Y-%m-%d')
+
+    def extend_tracked_backtests(self):
+        """
+        자동 연장 대상 백테스트를 마지막 거래일까지 이어서 실행 (새 구간만 시뮬레이션)
+        """
+        target = self._last_closed_trading_day()
+        if not target:
+            return
+        histories = db.session.query(BacktestingHistory).filter(
+            BacktestingHistory.tracked == True,
+            BacktestingHistory.end_date < datetime.strptime(target, '%Y-%m-%d').date()
+        ).all()
+        for history in histories:
+            try:
+                job_id = get_job_manager().extend(history, target)
+                P.logger.info(f"Tracked backtest {history.id} extension submitted: {job_id}")
+            except RuntimeError as e:
+                P.logger.warning(f"Tracked backtest {history.id} not extended: {e}")
         
     def setting_save_after(self, change_list):
         """
@@ -18,6 +18,12 @@ class ModuleBase(PluginModuleBase):
         'db_retention_days': '30',
         'db_cleanup_enabled': 'True',
         'db_max_size_gb': '5',
+        'krx_requests_per_second': '5',  # pykrx 공용 속도 제한 (프로세스 단위)
+        'krx_max_workers': '4',  # 병렬 조회 스레드 수
+        'discord_digest_minutes': '0',  # 알림 묶음 전송 창 (0이면 즉시 전송)
+        'screening_incremental': 'True',  # 직전 결과 대비 바뀐 종목만 재조회/재평가
+        'dart_disclosure_synced_until': '',  # 공시 색인을 빠짐없이 적재한 마지막 날짜 (YYYY-MM-DD)
+        'dart_disclosure_index_version': '',  # 공시 색인 유형 버전 (logic_disclosure.INDEX_VERSION)
         # ... (기존 db_default 내용과 동일)
     }
 
@@ -59,15 +65,28 @@ class ModuleBase(PluginModuleBase):
                 from .model import ConditionSchedule
                 template_name = f"{P.package_name}_{self.name}_{page}.html"
                 
+                from .logic_condition import default_cron
                 strategies = Logic.get_strategies_metadata()
-                # 현재 설정 읽기
+                # 현재 설정 읽기 (전략 전체: current_schedule, 개별 조건: condition_schedule)
                 current = {s['id']: {'enabled': False, 'cron': ''} for s in strategies}
-                rows = db.session.query(ConditionSchedule).filter(ConditionSchedule.condition_number == 0).all()
+                conditions = {}
+                for strategy_id, strategy in Logic.get_available_strategies().items():
+                    conditions[strategy_id] = {
+                        n: {'enabled': False, 'cron': '', 'default_cron': default_cron(strategy, n),
+                            'data': ', '.join(sorted(strategy.data_for_condition(n))), 'last_run': ''}
+                        for n in strategy.conditions
+                    }
+                rows = db.session.query(ConditionSchedule).all()
                 for r in rows:
-                    if r.strategy_id in current:
+                    if r.condition_number == 0 and r.strategy_id in current:
                         current[r.strategy_id] = {'enabled': r.is_enabled, 'cron': r.cron_expression}
+                    elif r.condition_number in conditions.get(r.strategy_id, {}):
+                        conditions[r.strategy_id][r.condition_number].update(
+                            enabled=r.is_enabled, cron=r.cron_expression,
+                            last_run=r.last_run_at.strftime('%m-%d %H:%M') if r.last_run_at else '')
                 arg['strategies'] = strategies
                 arg['current_schedule'] = current
+                arg['condition_schedule'] = conditions
                 return render_template(template_name, arg=arg, P=P)
 
             else:
@@ -120,27 +139,13 @@ class ModuleBase(PluginModuleBase):
             
             elif sub == 'save_schedules':
                 from .logic import Logic
-                schedules = []
-                form_data = req.form.to_dict()
-                from .strategies import get_strategies_info
-                
-                strategies = get_strategies_info()
-                
-                for s in strategies:
-                    strategy_id = s['id']
-                    cron_key = f'cron_{strategy_id}'
-                    enabled_key = f'enabled_{strategy_id}'
-                    
-                    cron_expression = form_data.get(cron_key, '').strip()
-                    is_enabled = enabled_key in form_data
-
-                    if cron_expression:
-                        schedules.append({
-                            'strategy_id': strategy_id,
-                            'condition_number': 0, # 전략 전체 스케줄링
-                            'cron_expression': cron_expression,
-                            'is_enabled': is_enabled
-                        })
+                from .logic_cron import validate
+                # 전략 전체(조건 0)와 개별 조건 스케줄
+                schedules = Logic.parse_schedule_form(req.form.to_dict())
+                for schedule in schedules:
+                    error = validate(schedule['cron_expression'])
+                    if error:
+                        return jsonify({'ret': 'error', 'msg': f"잘못된 CRON ({schedule['strategy_id']} 조건 {schedule['condition_number']}): {error}"})
 
                 if F.config['use_celery']:
                     result = Logic.task_save_condition_schedules.apply_async((schedules,))
@@ -157,6 +162,27 @@ class ModuleBase(PluginModuleBase):
             P.logger.error(traceback.format_exc())
             return jsonify({'ret': 'error', 'msg': str(e)})
 
+    def plugin_load(self):
+        # 이전 버전으로 만든 테이블에 새로 추가된 열 반영 (아래 작업들이 새 열을 읽으므로 먼저 실행)
+        try:
+            from .logic_migration import migrate
+            with F.app.app_context():
+                migrate()
+        except Exception as e:
+            P.logger.error(f"Failed to migrate database schema: {str(e)}")
+        # 재시작 전에 남은 미전송 Discord 알림이 있으면 이어서 전송
+        try:
+            from .logic_outbox import get_outbox_sender
+            get_outbox_sender().start()
+        except Exception as e:
+            P.logger.error(f"Failed to start notification outbox sender: {str(e)}")
+        # 조건별 스케줄 실행기 (활성 스케줄이 없으면 분마다 확인만 함)
+        try:
+            from .logic_condition import get_condition_scheduler
+            get_condition_scheduler().start()
+        except Exception as e:
+            P.logger.error(f"Failed to start condition scheduler: {str(e)}")
+
     def setting_save_after(self, change_list):
         from .logic import Logic
         if 'auto_start' in change_list or 'screening_time' in change_list:
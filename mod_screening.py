@@ -428,30 +428,11 @@ class {class_name}(BaseStrategy):
             if sub == 'save_schedules':
                 P.logger.info("스케줄 저장 요청 시작")
                 try:
-                    schedules = []
                     form_data = req.form.to_dict()
                     P.logger.debug(f"Received form data keys: {list(form_data.keys())}")
                     
-                    strategies = Logic.get_strategies_metadata()
-                    P.logger.debug(f"Found {len(strategies)} strategies")
-                    
-                    for s in strategies:
-                        strategy_id = s['id']
-                        cron_key = f'cron_{strategy_id}'
-                        enabled_key = f'enabled_{strategy_id}'
-                        
-                        cron_expression = form_data.get(cron_key, '').strip()
-                        is_enabled = enabled_key in form_data
-                        
-                        P.logger.debug(f"Strategy {strategy_id}: cron={cron_expression}, enabled={is_enabled}")
-                        
-                        if cron_expression:
-                            schedules.append({
-                                'strategy_id': strategy_id,
-                                'condition_number': 0, # 전략 전체 스케줄링
-                                'cron_expression': cron_expression,
-                                'is_enabled': is_enabled
-                            })
+                    # 전략 전체(조건 0)와 개별 조건 스케줄
+                    schedules = Logic.parse_schedule_form(form_data)
 
                     P.logger.debug(f"Saving {len(schedules)} schedules")
                     Logic.save_condition_schedules(schedules)
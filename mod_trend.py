@@ -3,7 +3,7 @@ import traceback
 from plugin import *
 from .setup import P
 from framework import db
-from .trading_trend_analyzer import analyze_trading_trends
+from .trading_trend_analyzer import analyze_trading_trends, get_trend_snapshot, save_trend_snapshot, find_trend_snapshot, snapshot_options
 from .logic_notifier import Notifier
 
 class ModuleTrend(PluginModuleBase):
@@ -28,6 +28,9 @@ class ModuleTrend(PluginModuleBase):
         'trend_send_1day': 'True',
         'trend_send_1week': 'True',
         'trend_send_1month': 'True',
+        'trend_send_streak': 'True',
+        'trend_streak_lookback': '60',  # 연속 기록 조회 거래일 수
+        'trend_streak_min_days': '3',  # 연속 순매수 최소 일수
     }
 
     def __init__(self, P):
@@ -51,12 +54,11 @@ class ModuleTrend(PluginModuleBase):
                 template_name = f'{P.package_name}_{self.name}_{page}.html'
                 
                 # Perform analysis and get results
-                from pykrx import stock
                 from datetime import datetime
+                from .logic_calendar import get_calendar
                 
-                # Get the most recent business day
-                today_str = datetime.now().strftime("%Y%m%d")
-                end_date_str = stock.get_nearest_business_day_in_a_week(today_str)
+                # Get the most recent closed business day
+                end_date_str = get_calendar().last_closed_day()
                 end_date_obj = datetime.strptime(end_date_str, "%Y%m%d")
                 
                 # Get settings with default values
@@ -66,16 +68,16 @@ class ModuleTrend(PluginModuleBase):
                 show_market_column_str = P.ModelSetting.get('trend_show_market_column') or 'True'
                 show_market_column = show_market_column_str == 'True'
                 
-                # Perform analysis
-                results = analyze_trading_trends(
+                # 기준 영업일 스냅샷 캐시에서 조회 (없을 때만 재계산, Discord 전송 없음)
+                results = get_trend_snapshot(
                     market=market,
                     top_n=top_n,
-                    send_discord=False,  # Don't send to Discord from web view
                     show_market_column=show_market_column,
                     send_insight=(P.ModelSetting.get('trend_send_insight') or 'True') == 'True',
                     send_1day=(P.ModelSetting.get('trend_send_1day') or 'True') == 'True',
                     send_1week=(P.ModelSetting.get('trend_send_1week') or 'True') == 'True',
-                    send_1month=(P.ModelSetting.get('trend_send_1month') or 'True') == 'True'
+                    send_1month=(P.ModelSetting.get('trend_send_1month') or 'True') == 'True',
+                    send_streak=(P.ModelSetting.get('trend_send_streak') or 'True') == 'True'
                 )
                 
                 arg['analysis_date'] = end_date_obj.strftime('%Y-%m-%d')
@@ -119,10 +121,19 @@ class ModuleTrend(PluginModuleBase):
                     send_insight=(P.ModelSetting.get('trend_send_insight') or 'True') == 'True',
                     send_1day=(P.ModelSetting.get('trend_send_1day') or 'True') == 'True',
                     send_1week=(P.ModelSetting.get('trend_send_1week') or 'True') == 'True',
-                    send_1month=(P.ModelSetting.get('trend_send_1month') or 'True') == 'True'
+                    send_1month=(P.ModelSetting.get('trend_send_1month') or 'True') == 'True',
+                    send_streak=(P.ModelSetting.get('trend_send_streak') or 'True') == 'True'
                 )
                 
                 if results:
+                    save_trend_snapshot(market, top_n, snapshot_options(
+                        show_market_column,
+                        (P.ModelSetting.get('trend_send_insight') or 'True') == 'True',
+                        (P.ModelSetting.get('trend_send_1day') or 'True') == 'True',
+                        (P.ModelSetting.get('trend_send_1week') or 'True') == 'True',
+                        (P.ModelSetting.get('trend_send_1month') or 'True') == 'True',
+                        (P.ModelSetting.get('trend_send_streak') or 'True') == 'True'
+                    ), results, notified=send_discord)
                     return jsonify({'ret': 'success', 'msg': '매매 동향 분석이 완료되었습니다.', 'data': results})
                 else:
                     return jsonify({'ret': 'error', 'msg': '분석 중 오류가 발생했습니다.'})
@@ -147,7 +158,8 @@ class ModuleTrend(PluginModuleBase):
                     send_insight=(PluginModelSetting.get('trend_send_insight') or 'True') == 'True',
                     send_1day=(PluginModelSetting.get('trend_send_1day') or 'True') == 'True',
                     send_1week=(PluginModelSetting.get('trend_send_1week') or 'True') == 'True',
-                    send_1month=(PluginModelSetting.get('trend_send_1month') or 'True') == 'True'
+                    send_1month=(PluginModelSetting.get('trend_send_1month') or 'True') == 'True',
+                    send_streak=(PluginModelSetting.get('trend_send_streak') or 'True') == 'True'
                 )
                 
                 if results:
@@ -191,6 +203,7 @@ class ModuleTrend(PluginModuleBase):
         """주기적으로 실행될 작업 정의"""
         P.logger.info("Trend module scheduler executed")
         try:
+            from .logic_calendar import get_calendar
             # Only run if auto-start is enabled
             auto_start_str = P.ModelSetting.get('auto_start') or 'False'
             if auto_start_str == 'True':
@@ -209,6 +222,15 @@ class ModuleTrend(PluginModuleBase):
                 send_1day_str = (PluginModelSetting.get('trend_send_1day') or 'True') == 'True'
                 send_1week_str = (PluginModelSetting.get('trend_send_1week') or 'True') == 'True'
                 send_1month_str = (PluginModelSetting.get('trend_send_1month') or 'True') == 'True'
+                send_streak_str = (PluginModelSetting.get('trend_send_streak') or 'True') == 'True'
+                
+                # 기준 영업일 스냅샷이 이미 있고 (필요한 경우) 전송까지 끝났으면 재계산하지 않음
+                options = snapshot_options(show_market_column, send_insight_str, send_1day_str, send_1week_str, send_1month_str, send_streak_str)
+                end_date = get_calendar().last_closed_day()
+                snapshot = find_trend_snapshot(market, end_date, top_n, options)
+                if snapshot is not None and (snapshot.notified or not send_discord):
+                    P.logger.info(f"Trend snapshot for {end_date} is up to date, skipping")
+                    return
                 
                 results = analyze_trading_trends(
                     market=market,
@@ -218,10 +240,12 @@ class ModuleTrend(PluginModuleBase):
                     send_insight=send_insight_str,
                     send_1day=send_1day_str,
                     send_1week=send_1week_str,
-                    send_1month=send_1month_str
+                    send_1month=send_1month_str,
+                    send_streak=send_streak_str
                 )
                 
                 if results:
+                    save_trend_snapshot(market, top_n, options, results, notified=send_discord)
                     P.logger.info(f"Trend analysis completed for {results['date']}")
                 else:
                     P.logger.error("Trend analysis failed")
@@ -64,6 +64,7 @@ class StockScreeningResult(ModelBase):
     
     # 21개 조건별 통과 여부 (JSON)
     condition_details = db.Column(db.Text)  # JSON 형태로 저장
+    input_hash = db.Column(db.String(40))  # 조건 평가 입력 해시 (증분 스크리닝에서 변경 여부 판별)
     
     # 메타 정보
     created_at = db.Column(db.DateTime, default=datetime.now)
@@ -141,6 +142,91 @@ class ConditionSchedule(ModelBase):
     condition_number = db.Column(db.Integer, nullable=False)
     cron_expression = db.Column(db.String(100), nullable=False)
     is_enabled = db.Column(db.Boolean, default=False)
+    last_run_at = db.Column(db.DateTime)  # 마지막 실행 시각 (놓친 실행 판별 및 중복 실행 방지)
+    last_result = db.Column(db.Text)  # 마지막 실행 결과 (JSON)
 
     def __repr__(self):
         return f'<ConditionSchedule {self.strategy_id} - {self.condition_number}>'
+
+
+# 매매 동향 분석 결과 스냅샷 (기준 영업일별 캐시)
+class TrendSnapshot(ModelBase):
+    P = P
+    __tablename__ = f'{P.package_name}_trend_snapshot'
+    __bind_key__ = P.package_name
+
+    id = db.Column(db.Integer, primary_key=True)
+    market = db.Column(db.String(10), nullable=False)  # KOSPI/KOSDAQ/ALL
+    end_date = db.Column(db.String(8), nullable=False, index=True)  # 기준 영업일 (YYYYMMDD)
+    top_n = db.Column(db.Integer, nullable=False)
+    options = db.Column(db.String(20), nullable=False)  # 표시/기간 옵션 키
+    payload = db.Column(db.Text)  # analyze_trading_trends 결과 (JSON)
+    notified = db.Column(db.Boolean, default=False)  # Discord 전송 완료 여부
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f'<TrendSnapshot {self.market} {self.end_date} top{self.top_n}>'
+
+
+# Discord 알림 발송 대기열 (백그라운드 전송기가 순서대로 전송)
+class NotificationOutbox(ModelBase):
+    P = P
+    __tablename__ = f'{P.package_name}_notification_outbox'
+    __bind_key__ = P.package_name
+
+    id = db.Column(db.Integer, primary_key=True)
+    webhook_url = db.Column(db.String(500), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # 웹훅 본문 (JSON, embeds 개수 제한 없음 - 전송 시 분할)
+    kind = db.Column(db.String(50))  # screening/error/start/condition/trend/digest 등
+    status = db.Column(db.String(20), default='pending', index=True)  # pending/sending/sent/failed/merged
+    dedup_key = db.Column(db.String(64))  # 같은 내용(종목 목록 등) 판별용 해시
+    digest = db.Column(db.Boolean, default=False)  # 묶음 전송 대상 (창이 끝나면 웹훅별 요약으로 병합)
+    parts_sent = db.Column(db.Integer, default=0)  # 여러 메시지로 나뉜 경우 전송 완료한 메시지 수
+    attempts = db.Column(db.Integer, default=0)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.now, index=True)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<NotificationOutbox {self.id} {self.kind} {self.status}>'
+
+
+# DART 공시 색인 (기간별 전체 공시 목록에서 필요한 보고서 유형만 저장)
+class DartDisclosure(ModelBase):
+    P = P
+    __tablename__ = f'{P.package_name}_dart_disclosure'
+    __bind_key__ = P.package_name
+    __table_args__ = (
+        db.Index(f'ix_{P.package_name}_dart_disclosure_lookup', 'corp_code', 'report_type', 'rcept_dt'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    rcept_no = db.Column(db.String(14), nullable=False, unique=True)  # 접수번호
+    corp_code = db.Column(db.String(8), nullable=False)  # DART 고유번호
+    stock_code = db.Column(db.String(10))  # 종목코드 (비상장사는 빈 값)
+    corp_name = db.Column(db.String(100))
+    report_nm = db.Column(db.String(300))
+    report_type = db.Column(db.String(20), nullable=False)  # logic_delta.REPORT_TYPES (cb/bw/.../periodic/earnings/status)
+    rcept_dt = db.Column(db.Date, nullable=False)  # 접수일
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f'<DartDisclosure {self.rcept_no} {self.corp_code} {self.report_type}>'
+
+
+# 최대주주 지분율 캐시 (근거 공시가 바뀔 때만 다시 조회)
+class MajorShareholderRatio(ModelBase):
+    P = P
+    __tablename__ = f'{P.package_name}_major_shareholder'
+    __bind_key__ = P.package_name
+
+    id = db.Column(db.Integer, primary_key=True)
+    corp_code = db.Column(db.String(8), nullable=False, unique=True)  # DART 고유번호
+    ratio = db.Column(db.Float)  # 최대주주(특수관계인 포함) 보통주 지분율 (%) - 정기보고서에 없으면 None
+    rcept_no = db.Column(db.String(14))  # 조회 시점 공시 색인의 최신 정기보고서 접수번호 (바뀌면 다시 조회)
+    report_period = db.Column(db.String(20))  # 지분율을 읽은 정기보고서 (사업연도/보고서 코드)
+    fetched_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f'<MajorShareholderRatio {self.corp_code} {self.ratio}>'
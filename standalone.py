@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Standalone Runtime
+FlaskFarm 없이(독립 실행 CLI) 공용 데이터 모듈을 사용할 때의 최소 실행 환경
+
+플러그인의 setup.P / framework.F 대신 로거, 패키지 이름, 설정 조회, 데이터 경로만 제공합니다.
+데이터 경로를 FlaskFarm의 path_data와 같게 지정하면 플러그인과 같은 로컬 저장소를 공유합니다.
+"""
+import logging
+import os
+
+PACKAGE_NAME = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
+
+# 기본 데이터 경로 (FlaskFarm path_data와 같은 위치를 가리키도록 환경 변수로 지정 가능)
+DATA_DIR_ENV = 'SEVENSPLIT_DATA_DIR'
+
+
+class _StandaloneSetting:
+    """
+    P.ModelSetting 대체 (configure()로 넣은 값과 실행 중 set()한 값만, 메모리에만 보관)
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = value
+
+
+class _StandalonePlugin:
+    package_name = PACKAGE_NAME
+
+    def __init__(self):
+        self.logger = logging.getLogger(PACKAGE_NAME)
+        self.ModelSetting = _StandaloneSetting()
+
+
+class _StandaloneFramework:
+    def __init__(self):
+        self.config = {'path_data': os.environ.get(DATA_DIR_ENV, os.path.join(os.path.expanduser('~'), '.flaskfarm', 'data'))}
+
+
+P = _StandalonePlugin()
+F = _StandaloneFramework()
+
+
+def configure(data_dir=None, settings=None, log_level=logging.INFO):
+    """
+    독립 실행 환경 설정
+
+    Args:
+        data_dir (str): FlaskFarm path_data 경로 (저장소는 {data_dir}/{package}/store)
+        settings (dict): P.ModelSetting.get()으로 조회될 값 (예: {'krx_requests_per_second': '5'})
+        log_level (int): 로그 레벨
+    """
+    if data_dir:
+        F.config['path_data'] = data_dir
+    if settings:
+        P.ModelSetting.values.update(settings)
+    if not P.logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+        P.logger.addHandler(handler)
+    P.logger.setLevel(log_level)
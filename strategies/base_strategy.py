@@ -76,6 +76,21 @@ class BaseStrategy(ABC):
         """
         pass
     
+    @property
+    def condition_data(self) -> Dict[int, set]:
+        """
+        조건별로 다시 조회해야 하는 데이터 (조건별 스케줄 재평가에 사용)
+        Returns:
+            {조건번호: {'market', ...}} 딕셔너리 (없는 조건은 required_data 전체를 다시 조회)
+        """
+        return {}
+
+    def data_for_condition(self, condition_number: int) -> set:
+        """
+        조건 하나를 재평가할 때 다시 조회할 데이터 목록
+        """
+        return set(self.condition_data.get(condition_number) or self.required_data)
+
     @property
     def version(self) -> str:
         """전략 버전"""
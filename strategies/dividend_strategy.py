@@ -58,6 +58,14 @@ class DividendStrategy(BaseStrategy):
             8: "거래대금 5억 이상"
         }
     
+    @property
+    def condition_data(self):
+        market = {'market'}
+        return {
+            1: market, 2: market, 3: market, 4: {'financial'},
+            5: {'financial'}, 6: {'financial'}, 7: {'financial'}, 8: market
+        }
+    
     def apply_filters(self, stock_data):
         """
         배당주 조건 필터 적용
@@ -50,6 +50,18 @@ class SevenSplit21Strategy(BaseStrategy):
             21: "최대주주 지분율 30% 이상"
         }
     
+    @property
+    def condition_data(self):
+        # 가격/시세 기반 조건은 장중, 재무/공시 기반 조건은 하루 단위로 재평가
+        market = {'market'}
+        return {
+            1: market, 2: market, 3: market, 4: market, 5: {'disclosure'}, 6: market,
+            7: market, 8: {'financial'}, 9: {'financial'}, 10: {'financial'}, 11: market,
+            12: {'financial'}, 13: market, 14: market, 15: market,
+            16: {'market', 'financial'}, 17: {'market', 'financial'}, 18: {'financial'},
+            19: {'disclosure'}, 20: {'disclosure'}, 21: {'major_shareholder'}
+        }
+    
     def apply_filters(self, stock_data):
         if not self.validate_stock_data(stock_data):
             return False, {}
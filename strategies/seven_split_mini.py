@@ -64,6 +64,14 @@ class SevenSplitMiniStrategy(BaseStrategy):
             10: "최근 1년 유상증자 미실시"
         }
     
+    @property
+    def condition_data(self):
+        market = {'market'}
+        return {
+            1: market, 2: market, 3: {'financial'}, 4: {'financial'}, 5: market,
+            6: market, 7: market, 8: {'financial'}, 9: {'major_shareholder'}, 10: {'disclosure'}
+        }
+    
     def apply_filters(self, stock_data):
         """
         핵심 10개 조건 필터 적용
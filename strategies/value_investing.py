@@ -59,6 +59,14 @@ class ValueInvestingStrategy(BaseStrategy):
             10: "배당 지급 실적"
         }
     
+    @property
+    def condition_data(self):
+        market = {'market'}
+        return {
+            1: market, 2: market, 3: market, 4: market, 5: {'financial'},
+            6: {'financial'}, 7: {'financial'}, 8: {'financial'}, 9: market, 10: {'financial'}
+        }
+    
     def apply_filters(self, stock_data):
         """
         가치투자 조건 필터 적용
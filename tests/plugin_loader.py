@@ -0,0 +1,28 @@
+"""
+플러그인 모듈 테스트 도우미
+
+상대 import(from .setup import P 등)를 쓰는 모듈을 테스트하기 위해 플러그인 디렉터리를 패키지로 등록합니다.
+__init__.py(의존성 자동 설치)는 실행하지 않고, FlaskFarm 대신 standalone 실행 환경을 setup으로 씁니다.
+"""
+import importlib
+import os
+import sys
+import tempfile
+import types
+
+PLUGIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PACKAGE = 'sevensplit_plugin'
+
+
+def load(module_name):
+    """
+    플러그인 모듈 import (예: load('logic_store'))
+    """
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [PLUGIN_DIR]
+        sys.modules[PACKAGE] = package
+        standalone = importlib.import_module(f'{PACKAGE}.standalone')
+        standalone.configure(data_dir=tempfile.mkdtemp(prefix='sevensplit_test_'))
+        sys.modules[f'{PACKAGE}.setup'] = standalone
+    return importlib.import_module(f'{PACKAGE}.{module_name}')
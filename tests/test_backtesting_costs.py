@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backtesting_costs import CostModel
+
+class TestCostModel(unittest.TestCase):
+
+    def test_sell_side_tax_and_commission(self):
+        """Sells pay commission and tax; buys pay commission only."""
+        model = CostModel(commission_rate=0.001, sell_tax_rate=0.002, spread_bps=0, impact_coef=0, max_participation=0)
+        buy = model.execute('BUY', [10000.0], [10])
+        sell = model.execute('SELL', [10000.0], [10])
+
+        self.assertAlmostEqual(buy['cash'][0], -100100.0)
+        self.assertAlmostEqual(sell['cash'][0], 100000.0 - 100.0 - 200.0)
+        self.assertEqual(buy['tax'][0], 0.0)
+
+    def test_impact_grows_with_order_size(self):
+        """Slippage rises with order size relative to trading value, and fills are capped."""
+        model = CostModel(spread_bps=10, impact_coef=0.1, max_participation=0.1)
+        fills = model.execute('BUY', [1000.0, 1000.0, 1000.0], [10, 100, 10000], [1e7, 1e7, 1e7])
+
+        self.assertTrue(np.all(np.diff(fills['fill_price']) > 0))
+        self.assertEqual(fills['quantity'].tolist(), [10, 100, 1000])
+
+    def test_zero_model_is_frictionless(self):
+        fills = CostModel.from_config(None).execute('SELL', [5000.0, 200.0], [3, 7], [0, 1e6])
+        np.testing.assert_allclose(fills['cash'], [15000.0, 1400.0])
+
+    def test_affordable_quantity_stays_within_budget(self):
+        model = CostModel.from_config('conservative')
+        prices = np.array([12345.0, 777.0])
+        qty = model.affordable_quantity(prices, [1e6, 1e6], [5e8, 5e8])
+        fills = model.execute('BUY', prices, qty, [5e8, 5e8])
+        self.assertTrue(np.all(-fills['cash'] <= 1e6))
+
+    def test_fundable_skips_unaffordable_orders_only(self):
+        """An order that does not fit the remaining cash must not block later, smaller orders."""
+        funded = CostModel.fundable([300.0, 900.0, 0.0, 500.0, 300.0], 1000.0)
+        self.assertEqual(funded.tolist(), [True, False, False, True, False])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backtesting_ladder import simulate_ladders
+
+class TestLadderSimulator(unittest.TestCase):
+
+    def test_split_buys_and_take_profits(self):
+        """Each split buys on a step drop and sells on its own take-profit."""
+        close = np.array([[100], [96], [93], [97], [100], [104]], dtype=float)
+        result = simulate_ladders(close, close + 1, close - 1, close, splits=3,
+                                  step_pct=3, take_profit_pct=3, amount_per_split=1000,
+                                  record_trades=True)
+
+        sides = [(t['split'], t['side']) for t in result['trades']]
+        self.assertEqual(sides, [(0, 'BUY'), (1, 'BUY'), (2, 'BUY'), (2, 'SELL'), (1, 'SELL'), (0, 'SELL')])
+        self.assertEqual(result['num_buys'][0], 3)
+        self.assertEqual(result['num_sells'][0], 3)
+        self.assertFalse(result['state']['filled'].any())
+        self.assertAlmostEqual(result['equity'][-1, 0], 3000 + 40 + 40 + 40)
+
+    def test_missing_bars_are_skipped(self):
+        """NaN bars (suspended days) neither trade nor reset the valuation."""
+        close = np.array([[100, np.nan], [100, 50], [np.nan, 50]], dtype=float)
+        result = simulate_ladders(close, close, close, close, splits=2, amount_per_split=1000)
+
+        self.assertEqual(result['num_buys'].tolist(), [1, 1])
+        self.assertEqual(result['equity'][0, 1], 2000)
+        self.assertEqual(result['equity'][2, 0], 2000)
+
+    def test_state_resume_matches_single_run(self):
+        """Continuing from a saved state gives the same curve as one long run."""
+        rng = np.random.default_rng(7)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (60, 5)), axis=0))
+        full = simulate_ladders(close, close * 1.01, close * 0.99, close)
+        head = simulate_ladders(close[:30], close[:30] * 1.01, close[:30] * 0.99, close[:30])
+        tail = simulate_ladders(close[30:], close[30:] * 1.01, close[30:] * 0.99, close[30:], state=head['state'])
+
+        np.testing.assert_allclose(np.vstack([head['equity'], tail['equity']]), full['equity'])
+
+    def test_state_resume_from_json(self):
+        """A state stored as JSON lists (saved backtest history) resumes identically."""
+        rng = np.random.default_rng(11)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (40, 3)), axis=0))
+        full = simulate_ladders(close, close * 1.01, close * 0.99, close)
+        head = simulate_ladders(close[:25], close[:25] * 1.01, close[:25] * 0.99, close[:25])
+        saved = json.loads(json.dumps({k: v.tolist() for k, v in head['state'].items()}))
+        tail = simulate_ladders(close[25:], close[25:] * 1.01, close[25:] * 0.99, close[25:], state=saved)
+
+        np.testing.assert_allclose(tail['equity'], full['equity'][25:])
+
+    def test_parameter_shape_is_explicit(self):
+        """1-D parameters are per split even when ladders == splits; per-ladder values need shape (N, 1)."""
+        close = np.array([[100, 100], [90, 90]], dtype=float)
+        per_split = simulate_ladders(close, close, close, close, splits=2, step_pct=[3, 20], amount_per_split=1000)
+        per_ladder = simulate_ladders(close, close, close, close, splits=2, step_pct=[[3], [20]], amount_per_split=1000)
+
+        self.assertEqual(per_split['num_buys'].tolist(), [1, 1])
+        self.assertEqual(per_ladder['num_buys'].tolist(), [2, 1])
+        with self.assertRaises(ValueError):
+            simulate_ladders(close, close, close, close, splits=3, step_pct=[3, 20])
+
+    def test_first_split_waits_for_empty_ladder(self):
+        """A first split sold while higher splits are held is only re-entered once the ladder is empty."""
+        close = np.array([[100], [96], [101.5], [90]], dtype=float)
+        result = simulate_ladders(close, close, close, close, splits=2, step_pct=3,
+                                  take_profit_pct=[1, 50], amount_per_split=1000, record_trades=True)
+
+        sides = [(t['split'], t['side']) for t in result['trades']]
+        self.assertEqual(sides, [(0, 'BUY'), (1, 'BUY'), (0, 'SELL')])
+        self.assertEqual(result['state']['filled'].tolist(), [[False, True]])
+
+if __name__ == '__main__':
+    unittest.main()
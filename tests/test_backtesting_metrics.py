@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backtesting_metrics import compute_metrics, compute_relative_metrics, drawdown_duration
+
+class TestBacktestingMetrics(unittest.TestCase):
+
+    def test_drawdown_and_duration(self):
+        """Max drawdown and its duration are measured from the running peak."""
+        equity = np.array([100, 120, 90, 96, 110, 130, 125], dtype=float)
+        metrics = compute_metrics(equity, years=1.0)
+
+        self.assertAlmostEqual(metrics['max_drawdown'], -25.0)
+        self.assertEqual(metrics['max_drawdown_duration'], 3)
+        self.assertEqual(drawdown_duration(equity).tolist(), [0, 0, 1, 2, 3, 0, 1])
+        self.assertAlmostEqual(metrics['total_return'], 25.0)
+        self.assertAlmostEqual(metrics['calmar_ratio'], metrics['cagr'] / 25.0)
+
+    def test_batched_curves_match_single_curves(self):
+        """A (M, T) stack gives the same results as each curve on its own."""
+        rng = np.random.default_rng(3)
+        curves = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, (4, 300)), axis=1))
+        batched = compute_metrics(curves)
+
+        for m in range(len(curves)):
+            single = compute_metrics(curves[m])
+            for key, value in single.items():
+                self.assertAlmostEqual(batched[key][m], value, places=9, msg=key)
+
+    def test_turnover_and_exposure(self):
+        """Turnover is traded value over average equity per year; exposure is the invested share."""
+        equity = np.full(253, 1000.0)
+        invested = np.full(253, 500.0)
+        metrics = compute_metrics(equity, traded_value=[1000.0, 1000.0], exposure_value=invested)
+
+        self.assertAlmostEqual(metrics['turnover'], 200.0)
+        self.assertAlmostEqual(metrics['exposure'], 50.0)
+        self.assertEqual(metrics['sharpe_ratio'], 0.0)
+
+    def test_relative_metrics(self):
+        """A leveraged copy of the benchmark has beta 2 and no tracking error against itself."""
+        rng = np.random.default_rng(5)
+        bench_returns = rng.normal(0.0004, 0.01, 250)
+        bench = 100 * np.cumprod(np.concatenate([[1.0], 1 + bench_returns]))
+        levered = 100 * np.cumprod(np.concatenate([[1.0], 1 + 2 * bench_returns]))
+
+        same = compute_relative_metrics(bench, bench)
+        self.assertAlmostEqual(same['beta'], 1.0)
+        self.assertAlmostEqual(same['tracking_error'], 0.0)
+        self.assertAlmostEqual(same['alpha'], 0.0)
+
+        batched = compute_relative_metrics(np.vstack([bench, levered]), bench)
+        np.testing.assert_allclose(batched['beta'], [1.0, 2.0])
+        self.assertGreater(batched['tracking_error'][1], 0)
+
+if __name__ == '__main__':
+    unittest.main()
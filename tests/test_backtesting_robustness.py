@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from plugin_loader import load
+
+backtesting_robustness = load('backtesting_robustness')
+block_indices = backtesting_robustness.block_indices
+run_robustness = backtesting_robustness.run_robustness
+
+class TestBacktestingRobustness(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.equity = 100 * np.cumprod(1 + rng.normal(0.0005, 0.01, 500))
+
+    def test_same_seed_same_distribution(self):
+        """Fixed seeds make the bootstrap reproducible; different seeds differ."""
+        a = run_robustness(self.equity, num_samples=300, block_size=5, seed=7)
+        b = run_robustness(self.equity, num_samples=300, block_size=5, seed=7)
+        c = run_robustness(self.equity, num_samples=300, block_size=5, seed=8)
+
+        self.assertEqual(a, b)
+        self.assertNotEqual(a['cagr']['p50'], c['cagr']['p50'])
+        self.assertLessEqual(a['max_drawdown']['p5'], a['max_drawdown']['p95'])
+
+    def test_chunking_covers_all_samples(self):
+        """Sample counts above the batch size are evaluated in full."""
+        result = run_robustness(self.equity, num_samples=2500, seed=1)
+        self.assertEqual(result['num_samples'], 2500)
+        self.assertTrue(0 <= result['prob_loss'] <= 100)
+
+    def test_block_indices_are_contiguous(self):
+        idx = block_indices(np.random.default_rng(0), 4, 20, block_size=5)
+        self.assertEqual(idx.shape, (4, 20))
+        self.assertTrue((np.diff(idx.reshape(4, 4, 5), axis=2) == 1).all())
+
+    def test_trade_resampling(self):
+        """Trade bootstrap compounds resampled trade returns over the original span."""
+        trades = np.array([0.05, -0.02, 0.03, 0.04, -0.01])
+        result = run_robustness(trade_returns=trades, method='trades', num_samples=200,
+                                seed=3, years=2.0, position_fraction=0.5)
+        self.assertEqual(result['method'], 'trades')
+        self.assertGreater(result['cagr']['p95'], result['cagr']['p5'])
+
+    def test_rejects_non_positive_sample_count(self):
+        with self.assertRaises(ValueError):
+            run_robustness(self.equity, num_samples=0)
+        with self.assertRaises(ValueError):
+            run_robustness(self.equity, block_size=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backtesting_storage import encode_curve, decode_curve, encode_trades, decode_trades
+
+class TestBacktestingStorage(unittest.TestCase):
+
+    def test_curve_round_trip(self):
+        """Equity curves survive encoding as records and as column arrays."""
+        values = [
+            {'date': '2024-01-02', 'value': 1000.5, 'cash': 400.0, 'holdings_value': 600.5},
+            {'date': '2024-01-03', 'value': 1010.0, 'cash': 400.0, 'holdings_value': 610.0},
+        ]
+        blob = encode_curve(values)
+
+        self.assertEqual(decode_curve(blob), values)
+        self.assertEqual(decode_curve(blob, as_records=False)['date'].tolist(), ['2024-01-02', '2024-01-03'])
+
+    def test_trades_round_trip(self):
+        """Trade logs keep side, Korean names and numeric columns."""
+        trades = [
+            {'date': '2024-01-02', 'code': '005930', 'name': '삼성전자', 'action': 'BUY',
+             'quantity': 10, 'price': 70000.0, 'amount': 700000.0},
+            {'date': '2024-02-01', 'code': '005930', 'name': '삼성전자', 'action': 'SELL',
+             'quantity': 10, 'price': 72000.0, 'amount': 720000.0},
+        ]
+        self.assertEqual(decode_trades(encode_trades(trades)), trades)
+        self.assertEqual(decode_trades(encode_trades([])), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from plugin_loader import load
+
+logic_calendar = load('logic_calendar')
+
+class TestTradingCalendar(unittest.TestCase):
+
+    def test_nearest_business_day_falls_back_to_weekday(self):
+        """A cold cache whose refresh fails still yields a date instead of None."""
+        calendar = logic_calendar.TradingCalendar(base_dir=tempfile.mkdtemp())
+        def unavailable(start, end):
+            raise RuntimeError('offline')
+        calendar._fetch_days = unavailable
+        self.assertEqual(calendar.nearest_business_day('2026-10-18'), '20261016')
+        self.assertEqual(calendar.nearest_business_day('2026-10-19', fmt='%Y-%m-%d'), '2026-10-19')
+
+    def test_failed_refresh_is_not_retried_immediately(self):
+        """While KRX is down, lookups use the cache instead of re-fetching on every call."""
+        calendar = logic_calendar.TradingCalendar(base_dir=tempfile.mkdtemp())
+        calls = []
+        def unavailable(start, end):
+            calls.append((start, end))
+            raise RuntimeError('offline')
+        calendar._fetch_days = unavailable
+        for _ in range(3):
+            calendar.trading_days('2026-01-01', '2026-03-31')
+            calendar.is_trading_day('2026-03-02')
+        self.assertEqual(len(calls), 1)
+
+        calendar._failed_at -= calendar.TODAY_RECHECK_SECONDS
+        calendar.trading_days('2026-01-01', '2026-03-31')
+        self.assertEqual(len(calls), 2)
+
+class TestSchedule(unittest.TestCase):
+
+    # 2026 Q1 weekdays without New Year's Day, Seollal (Feb 16-18) and the Mar 2 substitute holiday
+    HOLIDAYS = np.array(['2026-01-01', '2026-02-16', '2026-02-17', '2026-02-18', '2026-03-02'], dtype='datetime64[D]')
+
+    def setUp(self):
+        days = pd.bdate_range('2026-01-01', '2026-03-31').values.astype('datetime64[D]')
+        days = np.setdiff1d(days, self.HOLIDAYS)
+        self.calendar = logic_calendar.TradingCalendar(base_dir=tempfile.mkdtemp())
+        self.calendar._fetch_days = lambda start, end: days[(days >= start) & (days <= end)]
+
+    def schedule(self, interval, start='2026-01-01', end='2026-03-31'):
+        return [str(day) for day in self.calendar.schedule(start, end, interval)]
+
+    def test_monthly_first_and_last_skip_holidays(self):
+        self.assertEqual(self.schedule('monthly'), ['2026-01-02', '2026-02-02', '2026-03-03'])
+        self.assertEqual(self.schedule('monthly_last'), ['2026-01-30', '2026-02-27', '2026-03-31'])
+
+    def test_weekly_groups_by_monday_week(self):
+        """Weeks start on Monday; a holiday week starts on its first trading day."""
+        first = self.schedule('weekly', '2026-02-09', '2026-02-22')
+        last = self.schedule('weekly_last', '2026-02-09', '2026-02-22')
+        self.assertEqual(first, ['2026-02-09', '2026-02-19'])
+        self.assertEqual(last, ['2026-02-13', '2026-02-20'])
+
+    def test_quarterly_yearly_and_daily(self):
+        self.assertEqual(self.schedule('quarterly'), ['2026-01-02'])
+        self.assertEqual(self.schedule('yearly_last'), ['2026-03-31'])
+        self.assertEqual(len(self.schedule('daily')), 59)
+
+    def test_range_is_clipped_to_trading_days(self):
+        self.assertEqual(self.schedule('monthly', '2026-02-14', '2026-02-18'), [])
+        self.assertEqual(self.schedule('monthly', '2026-01-15', '2026-02-10'), ['2026-01-15', '2026-02-02'])
+
+    def test_unknown_interval_raises(self):
+        with self.assertRaises(ValueError):
+            self.calendar.schedule('2026-01-01', '2026-03-31', 'hourly')
+        with self.assertRaises(ValueError):
+            self.calendar.schedule('2026-01-01', '2026-03-31', 'monthly_middle')
+
+if __name__ == '__main__':
+    unittest.main()
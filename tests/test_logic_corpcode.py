@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+import io
+import tempfile
+import zipfile
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from plugin_loader import load
+
+logic_corpcode = load('logic_corpcode')
+
+CORP_CODE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<result>
+    <list><corp_code>00126380</corp_code><corp_name>삼성전자</corp_name><stock_code>005930</stock_code></list>
+    <list><corp_code>00999999</corp_code><corp_name>비상장</corp_name><stock_code> </stock_code></list>
+    <list><corp_code>00164779</corp_code><corp_name>SK하이닉스</corp_name><stock_code>000660</stock_code></list>
+</result>"""
+
+def corp_code_response(xml=CORP_CODE_XML):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('CORPCODE.xml', xml)
+    return mock.Mock(content=buffer.getvalue(), text='', raise_for_status=lambda: None)
+
+class TestCorpCodeMap(unittest.TestCase):
+
+    def setUp(self):
+        self.requests = mock.Mock()
+        self.requests.get.return_value = corp_code_response()
+        patcher = mock.patch.object(logic_corpcode, 'requests', self.requests)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.corp_codes = logic_corpcode.CorpCodeMap(base_dir=tempfile.mkdtemp())
+
+    def test_maps_listed_companies_both_ways(self):
+        self.assertEqual(self.corp_codes.corp_code('005930', api_key='key'), '00126380')
+        self.assertEqual(self.corp_codes.stock_code('00164779', api_key='key'), '000660')
+        self.assertIsNone(self.corp_codes.stock_code('00999999', api_key='key'))
+        self.assertEqual(len(self.corp_codes), 2)
+        # the file is downloaded at most once a day
+        self.assertEqual(self.requests.get.call_count, 1)
+
+    def test_failed_download_is_tried_once_a_day(self):
+        self.requests.get.return_value = mock.Mock(content=b'{"status": "010"}', text='{"status": "010"}',
+                                                   raise_for_status=lambda: None)
+        self.assertIsNone(self.corp_codes.corp_code('005930', api_key='key'))
+        self.assertFalse(self.corp_codes.refresh(api_key='key'))
+        self.assertEqual(self.requests.get.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
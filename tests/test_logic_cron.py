@@ -0,0 +1,34 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic_cron import CronExpression, validate
+
+class TestCronExpression(unittest.TestCase):
+
+    def test_intraday_weekday_schedule(self):
+        cron = CronExpression('*/30 9-15 * * 1-5')
+        self.assertTrue(cron.matches(datetime(2026, 10, 19, 9, 30)))  # Monday
+        self.assertFalse(cron.matches(datetime(2026, 10, 18, 9, 30)))  # Sunday
+        self.assertEqual(cron.next_after(datetime(2026, 10, 16, 15, 30)), datetime(2026, 10, 19, 9, 0))
+
+    def test_is_due_catches_missed_fire_time(self):
+        cron = CronExpression('0 8 * * *')
+        self.assertTrue(cron.is_due(datetime(2026, 10, 18, 8, 0), datetime(2026, 10, 19, 8, 3)))
+        self.assertFalse(cron.is_due(datetime(2026, 10, 19, 8, 0), datetime(2026, 10, 19, 12, 0)))
+
+    def test_day_or_weekday_when_both_restricted(self):
+        """Like cron, day-of-month and weekday are OR-ed when both are given."""
+        cron = CronExpression('0 0 1 * 0')
+        self.assertTrue(cron.matches(datetime(2026, 10, 1, 0, 0)))  # Thursday, 1st
+        self.assertTrue(cron.matches(datetime(2026, 10, 18, 0, 0)))  # Sunday
+
+    def test_validate_reports_bad_expressions(self):
+        self.assertIsNone(validate('5 4 * * 7'))
+        self.assertIsNotNone(validate('60 * * * *'))
+        self.assertIsNotNone(validate('* * *'))
+
+if __name__ == '__main__':
+    unittest.main()
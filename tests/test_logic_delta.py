@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic_delta import filing_groups, report_type, periodic_report_period, changes_from_filings, input_key, plan_delta
+
+class TestScreeningDelta(unittest.TestCase):
+
+    def test_filing_groups_from_report_names(self):
+        self.assertEqual(filing_groups('[기재정정]분기보고서 (2026.09)'), {'financial', 'major_shareholder'})
+        self.assertEqual(filing_groups('주요사항보고서(전환사채권발행결정)'), {'disclosure'})
+        self.assertEqual(filing_groups('주식등의대량보유상황보고서(일반)'), set())
+        self.assertEqual(filing_groups('관리종목지정(감사의견거절)'), {'market'})
+        self.assertEqual(filing_groups('연결재무제표기준영업(잠정)실적(공정공시)'), {'financial'})
+        self.assertEqual(filing_groups('감사보고서제출'), {'financial'})
+        self.assertEqual(filing_groups('투자주의환기종목지정'), {'market'})
+        self.assertEqual(filing_groups('기업설명회(IR)개최'), set())
+
+    def test_report_type_classification(self):
+        self.assertEqual(report_type('주요사항보고서(전환사채권발행결정)'), 'cb')
+        self.assertEqual(report_type('[기재정정]주요사항보고서(신주인수권부사채권발행결정)'), 'bw')
+        self.assertEqual(report_type('주요사항보고서(유무상증자결정)'), 'paid_increase')
+        self.assertIsNone(report_type('주요사항보고서(무상증자결정)'))
+        self.assertIsNone(report_type('전환사채(해외전환사채포함)발행후만기전사채취득'))
+        self.assertEqual(report_type('최대주주등소유주식변동신고서'), 'shareholder')
+
+    def test_periodic_report_period(self):
+        self.assertEqual(periodic_report_period('분기보고서 (2026.09)'), (2026, '11014'))
+        self.assertEqual(periodic_report_period('[기재정정]사업보고서 (2025.12)'), (2025, '11011'))
+        self.assertEqual(periodic_report_period('반기보고서 (2026.06)'), (2026, '11012'))
+        self.assertIsNone(periodic_report_period('분기보고서 (2026.11)'))
+        self.assertIsNone(periodic_report_period('최대주주등소유주식변동신고서'))
+
+    def test_changes_ignore_unlisted_filers(self):
+        changed = changes_from_filings([
+            ('005930', '분기보고서 (2026.09)'),
+            ('000660', '최대주주등소유주식변동신고서'),
+            ('', '사업보고서'),
+            ('035420', '기업설명회(IR)개최'),
+        ])
+        self.assertEqual(changed, {'005930': {'financial', 'major_shareholder'}})
+
+    def test_input_key_is_order_independent(self):
+        fields = ('per', 'pbr')
+        self.assertEqual(input_key({'per': 10.0, 'pbr': 1.2, 'x': 1}, fields), input_key({'pbr': 1.2, 'per': 10.0}, fields))
+        self.assertNotEqual(input_key({'per': 10.0, 'pbr': 1.2}, fields), input_key({'per': 10.5, 'pbr': 1.2}, fields))
+
+    def test_input_key_changes_with_strategy_version(self):
+        data, fields = {'per': 10.0, 'pbr': 1.2}, ('per', 'pbr')
+        self.assertEqual(input_key(data, fields, '1.0'), input_key(dict(data), fields, '1.0'))
+        self.assertNotEqual(input_key(data, fields, '1.0'), input_key(data, fields, '1.1'))
+
+    def test_plan_delta(self):
+        plan = plan_delta(
+            universe=['A', 'B', 'C', 'D'],
+            previous=['A', 'B', 'C', 'Z'],
+            changed={'A': {'financial'}, 'B': {'major_shareholder'}},
+            required={'market', 'financial', 'disclosure'},
+            snapshot_codes=['A', 'B', 'D'],
+        )
+        self.assertEqual(plan['fetch'], {'A': {'financial'}, 'C': {'market'},
+                                         'D': {'market', 'financial', 'disclosure'}})
+        self.assertEqual(plan['carry'], ['B'])
+        self.assertEqual(plan['new'], ['D'])
+        self.assertEqual(plan['dropped'], ['Z'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+from datetime import date, timedelta
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from plugin_loader import load
+
+logic_disclosure = load('logic_disclosure')
+setting = logic_disclosure.P.ModelSetting
+
+class FakeDart:
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def list(self, start, end):
+        self.calls.append((start, end))
+        if self.fail:
+            raise RuntimeError('DART unavailable')
+        return pd.DataFrame({'report_nm': ['분기보고서 (2026.09)']})
+
+class TestDisclosureSync(unittest.TestCase):
+
+    TODAY = date(2026, 10, 19)
+
+    def setUp(self):
+        setting.values.pop(logic_disclosure.SYNCED_UNTIL_KEY, None)
+        setting.values.pop(logic_disclosure.INDEX_VERSION_KEY, None)
+        self.index = logic_disclosure.DisclosureIndex()
+        self.index._store = len  # count rows instead of writing to the DB
+
+    def test_first_sync_loads_lookback_in_chunks(self):
+        dart = FakeDart()
+        self.assertEqual(self.index.sync(lambda: dart, today=self.TODAY), 5)
+        self.assertEqual(dart.calls[0], ('2025-10-19', '2026-01-16'))
+        self.assertEqual(dart.calls[-1], ('2026-10-14', '2026-10-19'))
+        self.assertEqual(len(dart.calls), 5)
+        # today keeps receiving filings, so only yesterday counts as complete
+        self.assertEqual(self.index.synced_until(), self.TODAY - timedelta(days=1))
+
+    def test_next_sync_resumes_after_synced_until(self):
+        self.index.sync(FakeDart, today=self.TODAY)
+        dart = FakeDart()
+        self.index.sync(lambda: dart, today=self.TODAY + timedelta(days=2), force=True)
+        self.assertEqual(dart.calls, [('2026-10-19', '2026-10-21')])
+        self.assertEqual(self.index.synced_until(), date(2026, 10, 20))
+
+    def test_sync_interval_skips_repeated_checks(self):
+        """Within SYNC_INTERVAL the DART client is not even requested."""
+        self.index.sync(FakeDart, today=self.TODAY)
+        def no_client():
+            raise AssertionError('DART client requested')
+        self.assertEqual(self.index.sync(no_client, today=self.TODAY), 0)
+
+    def test_failed_sync_keeps_progress(self):
+        setting.set(logic_disclosure.INDEX_VERSION_KEY, logic_disclosure.INDEX_VERSION)
+        setting.set(logic_disclosure.SYNCED_UNTIL_KEY, '2026-10-10')
+        self.assertIsNone(self.index.sync(lambda: FakeDart(fail=True), today=self.TODAY))
+        self.assertEqual(self.index.synced_until(), date(2026, 10, 10))
+        self.assertIsNone(self.index.sync(lambda: None, today=self.TODAY))
+
+    def test_index_version_change_rescans_recent_filings(self):
+        setting.set(logic_disclosure.SYNCED_UNTIL_KEY, '2026-10-18')
+        dart = FakeDart()
+        self.index.sync(lambda: dart, today=self.TODAY)
+        self.assertEqual(dart.calls[0][0], '2026-07-21')
+        self.assertEqual(self.index.synced_until(), date(2026, 10, 18))
+        self.assertEqual(setting.get(logic_disclosure.INDEX_VERSION_KEY), logic_disclosure.INDEX_VERSION)
+
+if __name__ == '__main__':
+    unittest.main()
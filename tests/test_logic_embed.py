@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic_embed import (split_value, pack_lines, pack_fields, pack_messages, embed_size,
+                         split_payload, build_digest,
+                         FIELD_VALUE_LIMIT, EMBED_TOTAL_LIMIT, EMBEDS_PER_MESSAGE)
+
+class TestEmbedPacking(unittest.TestCase):
+
+    def test_split_value_breaks_on_lines_and_repeats_header(self):
+        header = "| H |\n"
+        text = header + "".join(f"| row {i:03d} |\n" for i in range(200))
+        chunks = split_value(text, header=header)
+        self.assertTrue(all(len(c) <= FIELD_VALUE_LIMIT and c.startswith(header) for c in chunks))
+        self.assertTrue(all(c.endswith("|\n") for c in chunks))
+        self.assertEqual("".join(c[len(header):] for c in chunks), text[len(header):])
+
+    def test_pack_lines_covers_all_rows(self):
+        lines = ["x" * 100] * 25
+        ranges = pack_lines(lines, limit=1024, header="h" * 24)
+        self.assertEqual(ranges, [(0, 10), (10, 20), (20, 25)])
+
+    def test_pack_fields_respects_embed_limits(self):
+        fields = [{"name": f"stock {i}", "value": "v" * 400, "inline": False} for i in range(60)]
+        embeds = pack_fields(fields, title="Result", footer="footer", color=1)
+        self.assertEqual(sum(len(e['fields']) for e in embeds), 60)
+        self.assertTrue(all(len(e['fields']) <= 25 and embed_size(e) <= EMBED_TOTAL_LIMIT for e in embeds))
+        self.assertEqual(embeds[0]['title'], "Result")
+        self.assertEqual(embeds[-1]['footer'], {"text": "footer"})
+        self.assertTrue(all(e['color'] == 1 for e in embeds))
+
+    def test_pack_messages_fewest_groups(self):
+        """Small embeds share one message up to the per-message count cap."""
+        small = [{"title": "t", "fields": [{"name": "n", "value": "v"}]}] * 12
+        self.assertEqual([len(m) for m in pack_messages(small)], [EMBEDS_PER_MESSAGE, 2])
+        big = [{"description": "d" * 3500}] * 3
+        self.assertEqual([len(m) for m in pack_messages(big)], [1, 1, 1])
+
+    def test_split_payload_copies_base_keys(self):
+        payload = {"username": "bot", "embeds": [{"title": str(i)} for i in range(15)]}
+        parts = split_payload(payload)
+        self.assertEqual([len(p['embeds']) for p in parts], [10, 5])
+        self.assertTrue(all(p['username'] == "bot" for p in parts))
+
+    def test_build_digest_drops_duplicate_stock_lists(self):
+        def item(title, key):
+            return {"kind": "screening", "dedup_key": key, "created_at": "09:00:00",
+                    "payload": {"username": "bot", "embeds": [{"title": title}]}}
+        digest = build_digest([item("A", "k1"), item("B", "k1"), item("C", "k2")])
+        self.assertEqual(digest['username'], "bot")
+        self.assertEqual([e['title'] for e in digest['embeds'][1:]], ["A", "C"])
+        self.assertIn("B = A", digest['embeds'][0]['description'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from plugin_loader import load
+
+logic_ratelimit = load('logic_ratelimit')
+
+class FakeClock:
+    """Replaces the time module inside logic_ratelimit: sleep() advances monotonic() instead of waiting."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self._time = logic_ratelimit.time
+        logic_ratelimit.time = self.clock
+
+    def tearDown(self):
+        logic_ratelimit.time = self._time
+
+    def test_burst_then_steady_rate(self):
+        """A full bucket serves `burst` calls at once, then one call per 1/rate seconds."""
+        limiter = logic_ratelimit.RateLimiter(rate=4, burst=2)
+        for _ in range(2):
+            limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [0.25, 0.25])
+        self.assertAlmostEqual(self.clock.now, 1000.5)
+
+    def test_idle_time_refills_up_to_burst(self):
+        """Tokens accumulate while idle but never beyond the burst size."""
+        limiter = logic_ratelimit.RateLimiter(rate=2, burst=3)
+        for _ in range(3):
+            limiter.acquire()
+        self.clock.now += 60
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+
+        limiter.acquire()
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_call_passes_arguments(self):
+        limiter = logic_ratelimit.RateLimiter(rate=1)
+        self.assertEqual(limiter.call(int, '12', base=8), 10)
+
+class TestParallelFetch(unittest.TestCase):
+
+    def setUp(self):
+        # 1-worker pool: a nested submit from inside the worker would deadlock without the inline fallback
+        self._pool = logic_ratelimit._pool
+        self._limiters = dict(logic_ratelimit._limiters)
+        logic_ratelimit._pool = ThreadPoolExecutor(max_workers=1, initializer=logic_ratelimit._mark_worker)
+        logic_ratelimit._limiters['krx'] = logic_ratelimit.RateLimiter(rate=1e6, burst=100)
+
+    def tearDown(self):
+        logic_ratelimit._pool.shutdown(wait=True)
+        logic_ratelimit._pool = self._pool
+        logic_ratelimit._limiters.clear()
+        logic_ratelimit._limiters.update(self._limiters)
+
+    def test_fetch_parallel_returns_results_by_key(self):
+        result = logic_ratelimit.fetch_parallel({'a': (pow, (2, 3)), 'b': (int, ('12',), {'base': 8}), 'c': (list,)})
+        self.assertEqual(result, {'a': 8, 'b': 10, 'c': []})
+
+    def test_nested_fetch_runs_inline_on_worker(self):
+        """fetch_parallel called from a pool worker runs on that worker instead of waiting on the full pool."""
+        def outer():
+            worker = threading.current_thread()
+            return logic_ratelimit.fetch_parallel({
+                'a': (lambda: threading.current_thread() is worker,),
+                'b': (lambda: threading.current_thread() is worker,),
+            })
+        result = logic_ratelimit.get_fetch_pool().submit(outer).result(timeout=5)
+        self.assertEqual(result, {'a': True, 'b': True})
+
+    def test_map_parallel_keeps_order_and_returns_errors(self):
+        def invert(x):
+            return 1 / x
+        result = logic_ratelimit.map_parallel(invert, [1, 0, 4])
+        self.assertEqual([item for item, _ in result], [1, 0, 4])
+        self.assertEqual(result[0][1], 1.0)
+        self.assertIsInstance(result[1][1], ZeroDivisionError)
+        self.assertEqual(result[2][1], 0.25)
+
+    def test_nested_map_parallel_runs_inline(self):
+        def outer():
+            return logic_ratelimit.map_parallel(lambda x: x * 2, [1, 2, 3])
+        result = logic_ratelimit.get_fetch_pool().submit(outer).result(timeout=5)
+        self.assertEqual(result, [(1, 2), (2, 4), (3, 6)])
+
+if __name__ == '__main__':
+    unittest.main()
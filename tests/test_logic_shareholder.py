@@ -0,0 +1,40 @@
+import unittest
+import sys
+import os
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from plugin_loader import load
+
+logic_shareholder = load('logic_shareholder')
+
+def report(rows):
+    return pd.DataFrame(rows, columns=['nm', 'stock_knd', 'trmend_posesn_stock_qota_rt'])
+
+class TestRatioFromReport(unittest.TestCase):
+
+    def test_uses_common_stock_total_row(self):
+        df = report([
+            ('홍길동', '보통주', '30.50'),
+            ('김철수', '보통주', '10.00'),
+            ('계', '보통주', '40.50'),
+            ('계', '우선주', '5.00'),
+        ])
+        self.assertEqual(logic_shareholder._ratio_from_report(df), 40.5)
+
+    def test_sums_common_rows_without_total(self):
+        df = report([
+            ('홍길동', '보통주', '20.10'),
+            ('홍길동', '우선주', '3.00'),
+            ('(주)지주', '보통주', '5.05'),
+            ('김철수', '보통주', '-'),
+        ])
+        self.assertEqual(logic_shareholder._ratio_from_report(df), 25.15)
+
+    def test_missing_report(self):
+        self.assertIsNone(logic_shareholder._ratio_from_report(None))
+        self.assertIsNone(logic_shareholder._ratio_from_report(pd.DataFrame()))
+        self.assertIsNone(logic_shareholder._ratio_from_report(pd.DataFrame({'nm': ['계']})))
+
+if __name__ == '__main__':
+    unittest.main()
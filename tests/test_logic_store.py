@@ -0,0 +1,130 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from plugin_loader import load
+
+logic_store = load('logic_store')
+logic_ratelimit = load('logic_ratelimit')
+
+class StubStore(logic_store.PanelStore):
+    name = 'stub'
+    fields = ('close',)
+
+    def fetch_day(self, date_str):
+        return pd.DataFrame({'close': [float(date_str[-2:])]}, index=['000001'])
+
+def _sync_in_child(base_dir):
+    store = StubStore(base_dir=base_dir)
+    synced = store.sync('2026-03-02', '2026-03-06')
+    return synced, len(store.stored_dates('2026-03-02', '2026-03-06'))
+
+class TestPanelStoreSettlement(unittest.TestCase):
+
+    def test_settled_until_waits_for_close(self):
+        self.assertEqual(logic_store.settled_until(datetime(2026, 10, 19, 15, 59)), np.datetime64('2026-10-18'))
+        self.assertEqual(logic_store.settled_until(datetime(2026, 10, 19, 16, 0)), np.datetime64('2026-10-19'))
+
+    def test_missing_dates_skip_unsettled_days(self):
+        store = logic_store.PanelStore(base_dir=tempfile.mkdtemp())
+        settled = logic_store.settled_until()
+        missing = store.missing_dates(settled - np.timedelta64(10, 'D'), settled + np.timedelta64(5, 'D'))
+        self.assertTrue(len(missing) > 0)
+        self.assertLessEqual(missing.max(), settled)
+        self.assertEqual(len(store.missing_dates(settled + np.timedelta64(1, 'D'), settled + np.timedelta64(3, 'D'))), 0)
+
+class TestIndexStore(unittest.TestCase):
+
+    def test_resolve_known_benchmarks(self):
+        self.assertEqual(logic_store.IndexStore.resolve('kospi'), '1001')
+        self.assertEqual(logic_store.IndexStore.resolve('2001'), '2001')
+
+    def test_resolve_rejects_unstored_codes(self):
+        """Codes the store never downloads would silently yield no benchmark."""
+        with self.assertRaises(ValueError):
+            logic_store.IndexStore.resolve('1028')
+
+class TestFlowStorePeriodTotals(unittest.TestCase):
+
+    DATES = ['2026-03-02', '2026-03-03', '2026-03-04', '2026-03-05']
+
+    def setUp(self):
+        self.store = logic_store.FlowStore(base_dir=tempfile.mkdtemp())
+        rows = {
+            # date: {code: (inst_netbuy, fgn_netbuy, market_cap, close)}
+            '2026-03-02': {'000001': (10, -5, 1000, 100), '000002': (1, 1, 500, 50)},
+            '2026-03-03': {'000001': (20, 5, 1100, 110), '000002': (2, np.nan, 500, 50)},
+            '2026-03-04': {'000001': (-5, 0, 1050, 105)},
+            '2026-03-05': {'000001': (30, 10, 1200, 120), '000002': (3, 3, 600, 60)},
+        }
+        self.store.append_frames({
+            date: pd.DataFrame.from_dict(values, orient='index', columns=list(logic_store.FlowStore.fields))
+            for date, values in rows.items()
+        })
+        # every day is already stored, so period_totals must not fetch anything
+        def unexpected(date_str):
+            raise AssertionError(f'unexpected fetch {date_str}')
+        self.store.fetch_day = unexpected
+
+    def totals(self, starts, end='2026-03-05'):
+        return self.store.period_totals(end, starts, dates=np.array(self.DATES, dtype='datetime64[D]'))
+
+    def test_sums_and_returns_per_period(self):
+        result = self.totals(['2026-03-02', '2026-03-04'])
+        whole, tail = result['2026-03-02'], result['2026-03-04']
+
+        self.assertEqual(whole.loc['000001', 'inst_netbuy'], 55)
+        self.assertEqual(whole.loc['000001', 'fgn_netbuy'], 10)
+        self.assertAlmostEqual(whole.loc['000001', 'return'], 20.0)
+        self.assertEqual(tail.loc['000001', 'inst_netbuy'], 25)
+        self.assertAlmostEqual(tail.loc['000001', 'return'], (120 / 105 - 1) * 100, places=4)
+        self.assertEqual(whole.loc['000001', 'market_cap'], 1200)
+
+    def test_missing_values_do_not_poison_sums(self):
+        """NaN flows count as zero; a missing start close gives a NaN return, not an exception."""
+        result = self.totals(['2026-03-02', '2026-03-04'])
+        self.assertEqual(result['2026-03-02'].loc['000002', 'fgn_netbuy'], 4)
+        self.assertEqual(result['2026-03-02'].loc['000002', 'inst_netbuy'], 6)
+        self.assertAlmostEqual(result['2026-03-02'].loc['000002', 'return'], 20.0)
+        self.assertTrue(np.isnan(result['2026-03-04'].loc['000002', 'return']))
+
+    def test_start_between_stored_days_uses_next_day(self):
+        result = self.totals(['2026-03-01'], end='2026-03-03')
+        self.assertEqual(result['2026-03-01'].loc['000001', 'inst_netbuy'], 30)
+        self.assertAlmostEqual(result['2026-03-01'].loc['000001', 'return'], 10.0)
+
+    def test_empty_window(self):
+        result = self.totals(['2026-04-01'], end='2026-04-03')
+        self.assertTrue(result['2026-04-01'].empty)
+
+@unittest.skipUnless(hasattr(os, 'register_at_fork'), 'fork only')
+class TestForkedWorker(unittest.TestCase):
+
+    def test_sync_in_forked_worker_after_parent_used_pool(self):
+        """A forked backtest worker must not inherit the parent's fetch pool, whose threads do not exist there."""
+        # warm every worker thread so an inherited pool could not spawn new ones in the child
+        pool = logic_ratelimit.get_fetch_pool()
+        logic_ratelimit.map_parallel(lambda x: time.sleep(0.05), range(pool._max_workers * 2))
+        self.assertEqual(len(pool._threads), pool._max_workers)
+
+        context = multiprocessing.get_context('fork')
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=context)
+        try:
+            result = executor.submit(_sync_in_child, tempfile.mkdtemp()).result(timeout=20)
+        finally:
+            # a hung worker would otherwise block the test run on shutdown
+            for process in list(executor._processes.values()):
+                process.terminate()
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.assertEqual(result, (5, 5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from logic_streak import rank_panel, streak_lengths, entered_top, top_streaks
+
+class TestTrendStreaks(unittest.TestCase):
+
+    def test_rank_panel_skips_missing(self):
+        ranks = rank_panel(np.array([[3.0, np.nan, 5.0, -1.0]]))
+        self.assertEqual(ranks.tolist(), [[2, 0, 1, 3]])
+
+    def test_streak_lengths_reset_on_false(self):
+        mask = np.array([[1, 0], [1, 1], [0, 1], [1, 1]], dtype=bool)
+        self.assertEqual(streak_lengths(mask).tolist(), [[1, 0], [2, 1], [0, 2], [1, 3]])
+
+    def test_entered_top_today(self):
+        ranks = np.array([[1, 2, 3], [1, 3, 2]])
+        self.assertEqual(entered_top(ranks, 2).tolist(), [False, False, True])
+
+    def test_top_streaks_orders_by_length(self):
+        """Only streaks still running on the last day count, longest first."""
+        netbuy = np.array([[5, 1, -1], [5, 1, 2], [5, -1, 2]], dtype=float)
+        idx, lengths = top_streaks(netbuy > 0, limit=5, min_length=2)
+        self.assertEqual(idx.tolist(), [0, 2])
+        self.assertEqual(lengths.tolist(), [3, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,676 @@
+# -*- coding: utf-8 -*-
+"""
+7split_checklist_21 Plugin - Trend Engine
+기관/외국인 매매 동향 분석 엔진 (플러그인 모듈과 독립 실행 CLI 공용)
+
+데이터는 로컬 저장소(종목 마스터, 일별 순매수 FlowStore, 거래일 캘린더)를 통해서만 조회하므로
+웹 모듈과 CLI(kospi_kosdaq_review.py)가 같은 데이터 디렉터리를 쓰면 같은 날을 두 번 수집하지 않습니다.
+DB나 플러그인 설정에는 의존하지 않습니다.
+"""
+import traceback
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .setup import P
+except ImportError:  # FlaskFarm 밖(독립 실행 CLI)에서 import한 경우
+    from .standalone import P
+from .logic_calendar import get_calendar
+from .logic_discord import send_now
+from .logic_embed import pack_fields, pack_lines, FIELD_VALUE_LIMIT
+from .logic_store import get_ticker_master, get_flow_store, get_sector_flow_store
+from .logic_streak import rank_panel, entered_top, top_streaks, daily_returns
+
+logger = P.logger
+
+def load_period_frames(market, end_date, start_dates):
+    """
+    여러 기간의 누적 순매수/시가총액/종가/수익률을 로컬 일별 저장소에서 한 번에 집계
+
+    일별 값은 FlowStore에 하루 한 번만 수집되며, 기간 집계는 네트워크 호출 없이 계산됩니다.
+
+    Returns:
+        dict: {start_date: DataFrame(index=티커, columns=['기관합계', '외국인', '시가총액', '조회일 종가', '수익률'])}
+    """
+    first = min(start_dates)
+    dates = get_calendar().trading_days(first, end_date)
+    tickers = get_ticker_master().frame(market=market, date=end_date).index
+    totals = get_flow_store().period_totals(end_date, list(start_dates), dates=dates, tickers=tickers)
+
+    frames = {}
+    for start_date, df in totals.items():
+        if not df.empty:
+            df = df.rename(columns={
+                'inst_netbuy': '기관합계',
+                'fgn_netbuy': '외국인',
+                'market_cap': '시가총액',
+                'close': '조회일 종가',
+                'return': '수익률',
+            })
+            df.index.name = '티커'
+        frames[start_date] = df
+    return frames
+
+
+def get_consecutive_ror_insight(market, end_date, day_ago, week_ago, month_ago, top_n,
+                                market_map_df, show_market_column, period_frames=None):
+    """
+    (Modified) Analyze top performers based on consecutive returns
+    """
+    logger.info(f"\\n🚀 Analyzing top performers for returns insight...")
+    logger.info(f" (Market: {market} / 1-day: {day_ago} / 1-week: {week_ago} / 1-month: {month_ago} ~ {end_date})")
+    logger.info("-" * 60)
+    
+    try:
+        if period_frames is None:
+            period_frames = load_period_frames(market, end_date, [day_ago, week_ago, month_ago])
+        df_1d, df_1w, df_1m = (
+            period_frames[start].rename(columns={'수익률': '등락률'}) for start in (day_ago, week_ago, month_ago)
+        )
+        if df_1d.empty or df_1w.empty or df_1m.empty:
+            logger.info(f"[{market}] No period return data available.")
+            return None
+
+        top_1d_tickers = set(df_1d.nlargest(top_n, '등락률').index)
+        top_1w_tickers = set(df_1w.nlargest(top_n, '등락률').index)
+        top_1m_tickers = set(df_1m.nlargest(top_n, '등락률').index)
+
+        consecutive_top_tickers = list(top_1d_tickers & top_1w_tickers & top_1m_tickers)
+        
+        if not consecutive_top_tickers:
+            logger.info(f"[{market}] No consecutive Top {top_n} return performers found.")
+            return None
+
+        logger.info(f"✅ Found consecutive top performers: {consecutive_top_tickers}")
+
+        content = ""
+        merged_df = pd.DataFrame(index=consecutive_top_tickers)
+        merged_df['종목명'] = get_ticker_master().names(merged_df.index)
+        merged_df['ror_1d'] = df_1d.loc[consecutive_top_tickers, '등락률']
+        merged_df['ror_1w'] = df_1w.loc[consecutive_top_tickers, '등락률']
+        merged_df['ror_1m'] = df_1m.loc[consecutive_top_tickers, '등락률']
+        
+        # Join the market classification map
+        if not market_map_df.empty:
+            merged_df = merged_df.join(market_map_df, how='left')
+            merged_df['시장구분'].fillna('기타', inplace=True)
+            
+        merged_df.sort_values(by='ror_1m', ascending=False, inplace=True)
+
+        for ticker, row in merged_df.iterrows():
+            # Show market classification based on show_market_column setting
+            market_str = ""
+            if show_market_column and '시장구분' in row and pd.notna(row['시장구분']):
+                market_str = f" / {row['시장구분']}"
+                
+            content += (
+                f"- **{row['종목명']}** ({ticker}{market_str}): "
+                f"`1-day {row['ror_1d']:+.1f}%` / "
+                f"`1-week {row['ror_1w']:+.1f}%` / "
+                f"`1-month {row['ror_1m']:+.1f}%`\\n"
+            )
+
+
+        insight_field = {
+            "name": f"📈 Top performers (1-day/1-week/1-month Top {top_n})",
+            "value": content,
+            "inline": False
+        }
+        return insight_field
+
+    except Exception as e:
+        logger.error(f"[Error] Error in continuous returns analysis: {e}")
+        traceback.print_exc()
+        return None
+
+
+def get_top_netbuy_by_period(market, start_date, end_date, top_n, market_map_df, period_frame=None):
+    """
+    (Modified) Get top net purchases by period
+
+    period_frame: load_period_frames()로 미리 집계한 해당 기간 데이터 (없으면 여기서 집계)
+    """
+    try:
+        # 1. Tickers and names (from the cached ticker master)
+        tickers_df = get_ticker_master().frame(market=market, date=end_date)[['name']]
+        if tickers_df.empty:
+            logger.info(f"[{end_date}] Could not retrieve tickers for {market}")
+            return None, None
+        tickers_df = tickers_df.rename(columns={'name': '종목명'})
+        tickers_df.index.name = '티커'
+
+        # 2~4. Period net purchases, market cap/close and returns (from the local daily flow store)
+        if period_frame is None:
+            period_frame = load_period_frames(market, end_date, [start_date])[start_date]
+        if period_frame.empty:
+            logger.info(f"  [{market}] No institutional/foreign net purchase data found."); return None, None
+
+        df = period_frame[['기관합계', '외국인']]
+        marcap_df = period_frame[['시가총액', '조회일 종가']].dropna().astype(np.int64)
+        if marcap_df.empty:
+            logger.info(f"[{end_date}] Could not retrieve market cap data for {market}."); return None, None
+        df_ror = period_frame[['수익률']]
+
+        # 5. All data merge
+        merged_df = tickers_df.join(df, how='inner').join(marcap_df, how='inner').join(df_ror, how='left')
+        merged_df['수익률'] = merged_df['수익률'].fillna(0.0) 
+        merged_df.dropna(inplace=True) 
+        if merged_df.empty:
+            logger.info(f"Data merge result is empty (Period: {start_date}~{end_date})."); return None, None
+        
+        # Join the market classification map
+        if not market_map_df.empty:
+            merged_df = merged_df.join(market_map_df, how='left')
+            merged_df['시장구분'].fillna('기타', inplace=True)
+        else:
+            merged_df['시장구분'] = 'N/A'
+            
+        # Select top N for each investor type
+        final_inst_df = merged_df.nlargest(top_n, '기관합계')
+        final_fgn_df = merged_df.nlargest(top_n, '외국인')
+        
+        logger.info(f"✅ Processed {market} data for {start_date}~{end_date}.")
+        return final_inst_df, final_fgn_df
+
+    except Exception as e:
+        logger.error(f"[Error] in get_top_netbuy_by_period function: {e}")
+        traceback.print_exc()
+        return None, None
+
+
+def get_streak_insight(market, end_date, top_n, lookback_days=60, min_days=3, show_market_column=True):
+    """
+    저장된 일별 순매수/종가 이력에서 연속 순매수 종목과 오늘 새로 상위권에 진입한 종목 탐색
+
+    네트워크 호출 없이(누락 일자만 동기화) 임의 길이의 이력을 한 번의 구간 조회와 벡터 연산으로 계산합니다.
+
+    Args:
+        end_date (str): 기준 영업일 (YYYYMMDD)
+        top_n (int): 항목별 최대 종목 수 / 상위권 기준
+        lookback_days (int): 조회할 거래일 수 (연속 기록의 최대 길이)
+        min_days (int): 연속 순매수 최소 일수
+
+    Returns:
+        dict: {'foreign_streak', 'institutional_streak', 'new_foreign_top', 'new_return_top'} 각 항목은
+              [{'code', 'name', 'market', 'days', 'netbuy', 'ror'}, ...] (데이터가 없으면 None)
+    """
+    try:
+        calendar = get_calendar()
+        start = calendar.previous(end_date, offset=max(int(lookback_days) - 1, 1))
+        if start is None:
+            return None
+        dates = calendar.trading_days(start, end_date)
+
+        master = get_ticker_master()
+        tickers = master.frame(market=market, date=end_date)
+        flow = get_flow_store()
+        flow.sync(start, end_date, dates=dates)
+        days, codes, panel = flow.window(start, end_date, tickers=tickers.index)
+        if len(days) < 2:
+            logger.info(f"[{market}] Not enough stored flow history for streak analysis.")
+            return None
+
+        names = master.names(codes).to_numpy()
+        markets = tickers['market'].reindex(codes).fillna('').to_numpy()
+        returns = daily_returns(panel['close'])
+
+        def records(idx, lengths, netbuy):
+            # 연속 구간 합계 = 누적합 차이
+            cumsum = np.concatenate([np.zeros((1, len(codes))), np.nancumsum(netbuy, axis=0)])
+            items = []
+            for col, length in zip(idx.tolist(), lengths.tolist()):
+                item = {
+                    'code': str(codes[col]),
+                    'name': str(names[col]),
+                    'days': int(length),
+                    'netbuy': f"{(cumsum[-1, col] - cumsum[-1 - length, col]) / 1_0000_0000:,.1f}",
+                    'ror': f"{returns[-1, col]:+.2f}" if np.isfinite(returns[-1, col]) else '-',
+                }
+                if show_market_column:
+                    item['market'] = str(markets[col]) or 'N/A'
+                items.append(item)
+            return items
+
+        result = {}
+        for key, field in (('foreign_streak', 'fgn_netbuy'), ('institutional_streak', 'inst_netbuy')):
+            netbuy = panel[field].astype(np.float64)
+            idx, lengths = top_streaks(netbuy > 0, top_n, min_length=min_days)
+            result[key] = records(idx, lengths, netbuy)
+
+        # 오늘 처음 상위 top_n에 들어온 종목 (외국인 순매수 / 일간 수익률)
+        fgn = panel['fgn_netbuy'].astype(np.float64)
+        for key, values, field in (('new_foreign_top', fgn, fgn), ('new_return_top', returns, fgn)):
+            ranks = rank_panel(values[-2:])
+            idx = np.flatnonzero(entered_top(ranks, top_n))
+            idx = idx[np.argsort(ranks[-1, idx], kind='stable')]
+            result[key] = records(idx, np.ones(len(idx), dtype=np.int64), field)
+        return result
+
+    except Exception as e:
+        logger.error(f"[Error] Error in streak analysis: {e}")
+        traceback.print_exc()
+        return None
+
+
+def get_sector_rotation(market, end_date, period_starts):
+    """
+    업종별 기관/외국인 순매수 합계와 시가총액 가중 수익률 (업종 로테이션)
+
+    업종 집계는 SectorFlowStore에 일자별로 저장되어 있으므로 기간 집계만 계산합니다.
+
+    Args:
+        end_date (str): 기준 영업일 (YYYYMMDD)
+        period_starts (dict): {기간 라벨: 시작일} (예: {'1-day': day_ago, ...})
+
+    Returns:
+        list: [{'sector', 'market', 'market_cap', 'periods': {라벨: {'inst', 'fgn', 'ret'}}}, ...]
+              마지막 기간의 기관+외국인 순매수 합계 내림차순 (데이터가 없으면 None)
+    """
+    try:
+        dates = get_calendar().trading_days(min(period_starts.values()), end_date)
+        totals = get_sector_flow_store().period_totals(
+            end_date, list(period_starts.values()), dates=dates, market=market
+        )
+        frames = {label: totals[start] for label, start in period_starts.items()}
+        if any(df.empty for df in frames.values()):
+            return None
+
+        last = frames[list(period_starts)[-1]]
+        order = (last['inst_netbuy'] + last['fgn_netbuy']).sort_values(ascending=False).index
+        records = []
+        for key in order:
+            sector_market, _, sector = str(key).partition(':')
+            records.append({
+                'sector': sector,
+                'market': sector_market,
+                'market_cap': f"{last.at[key, 'market_cap'] / 1_0000_0000_0000:,.1f}",
+                'periods': {
+                    label: {
+                        'inst': f"{df.at[key, 'inst_netbuy'] / 1_0000_0000:,.1f}",
+                        'fgn': f"{df.at[key, 'fgn_netbuy'] / 1_0000_0000:,.1f}",
+                        'ret': f"{df.at[key, 'return']:+.2f}" if np.isfinite(df.at[key, 'return']) else '-',
+                    }
+                    for label, df in frames.items()
+                },
+            })
+        return records
+
+    except Exception as e:
+        logger.error(f"[Error] Error in sector rotation analysis: {e}")
+        traceback.print_exc()
+        return None
+
+
+def format_streak_for_discord(streaks, top_n):
+    """
+    연속 기록 결과 -> Discord embed 필드 목록
+    """
+    titles = {
+        'foreign_streak': "🌍 Foreign net buying streak",
+        'institutional_streak': "💎 Institution net buying streak",
+        'new_foreign_top': f"🆕 New in foreign net buy Top {top_n}",
+        'new_return_top': f"🆕 New in daily return Top {top_n}",
+    }
+    fields = []
+    for key, title in titles.items():
+        items = streaks.get(key) or []
+        lines = [
+            f"- **{item['name']}** ({item['code']}): `{item['days']} days` / `{item['netbuy']}B` / `{item['ror']}%`\\n"
+            for item in items
+        ]
+        content = "".join(lines) or "None"
+        fields.append({"name": title, "value": content, "inline": False})
+    return fields
+
+
+_WEB_FIELDS = ('rank', 'market', 'name', 'price', 'netbuy', 'cap_ratio', 'ror')
+
+_DISCORD_HEADER = {
+    True: (
+        "| Rank | Market | Name | Price | Net Buy(B) | Cap Ratio(%) | Return(%) |\\n"
+        "|:---:|:------|:------|-------:|---------:|----------:|----------:|\\n"
+    ),
+    False: (
+        "| Rank | Name | Price | Net Buy(B) | Cap Ratio(%) | Return(%) |\\n"
+        "|:---:|:------|-------:|---------:|----------:|----------:|\\n"
+    ),
+}
+
+
+def format_columns(df, investor_type, rank_start=1, show_market_column=True):
+    """
+    표시용 문자열 열을 열 단위로 한 번에 생성 (입력 DataFrame은 수정/복사하지 않음)
+
+    Returns:
+        dict: {'rank', ('market'), 'name', 'price', 'netbuy', 'cap_ratio', 'ror'} -> 같은 길이의 리스트
+    """
+    amount = df[investor_type].to_numpy(dtype=np.float64)
+    market_cap = df['시가총액'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cap_ratio = amount / market_cap * 100
+    cap_ratio[np.isinf(cap_ratio)] = 0
+
+    columns = {
+        'rank': list(range(rank_start, rank_start + len(df))),
+        'name': df['종목명'].astype(str).tolist(),
+        'price': [f"{v:,}" for v in df['조회일 종가'].tolist()],
+        'netbuy': [f"{v:,.1f}" for v in (amount / 1_0000_0000).tolist()],
+        'cap_ratio': [f"{v:.3f}" for v in cap_ratio.tolist()],
+        'ror': [f"{v:+.2f}" for v in df['수익률'].tolist()],
+    }
+    if show_market_column:
+        columns['market'] = df['시장구분'].tolist() if '시장구분' in df.columns else ['N/A'] * len(df)
+    return columns
+
+
+def format_discord_rows(df, investor_type, rank_start=1, show_market_column=True):
+    """
+    Discord Markdown 표의 행 문자열 리스트 (헤더 제외)
+    """
+    columns = format_columns(df, investor_type, rank_start, show_market_column)
+    fields = [f for f in _WEB_FIELDS if f in columns]
+    return ["| " + " | ".join(str(v) for v in values) + " |\\n" for values in zip(*(columns[f] for f in fields))]
+
+
+def format_data_for_web(df, investor_type, rank_start=1, show_market_column=True):
+    """
+    Format data for web display
+    """
+    if df is None or df.empty:
+        return []
+    
+    try:
+        if investor_type not in df.columns:
+            logger.error(f"[Format Error] '{investor_type}' column not found in DataFrame.")
+            return []
+
+        # Include market column based on show_market_column setting
+        columns = format_columns(df, investor_type, rank_start, show_market_column)
+        fields = [f for f in _WEB_FIELDS if f in columns]
+        return [dict(zip(fields, values)) for values in zip(*(columns[f] for f in fields))]
+
+    except Exception as e:
+        logger.error(f"[Error] in format_data_for_web function: {e}")
+        traceback.print_exc()
+        return []
+
+
+def format_data_for_discord(df, investor_type, rank_start=1, show_market_column=True, rows=None):
+    """
+    (Modified) Format data for Discord with option to include market column
+
+    rows: format_discord_rows()로 미리 만든 행 문자열 (전체 표를 한 번만 포맷하고 구간별로 잘라 쓸 때)
+    """
+    if rows is None and (df is None or df.empty):
+        if rank_start > 1: return "" 
+        return f"No top {investor_type} purchase data found."
+    
+    try:
+        if rows is None:
+            if investor_type not in df.columns:
+                logger.error(f"[Format Error] '{investor_type}' column not found in DataFrame.")
+                return f"Error formatting {investor_type} data."
+            rows = format_discord_rows(df, investor_type, rank_start, show_market_column)
+
+        header = _DISCORD_HEADER[bool(show_market_column)] if rank_start == 1 else ""
+        # 1024자 제한은 전송 시 pack_lines/split_field로 나누므로 여기서는 자르지 않음
+        return header + "".join(rows)
+
+    except Exception as e:
+        logger.error(f"[Error] in format_data_for_discord function: {e}")
+        traceback.print_exc()
+        return f"Error formatting {investor_type} data: {e}"
+
+
+def format_table_fields(df, investor_type, title, top_n, show_market_column=True):
+    """
+    순매수 표 -> Discord 필드 목록 (행 경계에서 1024자 이하로 나누고 필드 이름에 순위 구간 표시)
+    """
+    if df is None or df.empty:
+        content = format_data_for_discord(None, investor_type, rank_start=1, show_market_column=show_market_column)
+        return [{"name": f"{title} Top {top_n}", "value": content, "inline": False}]
+
+    # Format every row once, then slice the rendered rows per field
+    rows = format_discord_rows(df, investor_type, show_market_column=show_market_column)
+    header = _DISCORD_HEADER[bool(show_market_column)]
+    fields = []
+    for start, stop in pack_lines(rows, FIELD_VALUE_LIMIT, header):
+        content = format_data_for_discord(
+            None, investor_type, rank_start=start + 1, show_market_column=show_market_column, rows=rows[start:stop]
+        )
+        fields.append({"name": f"{title} Top {start + 1}-{stop}", "value": content, "inline": False})
+    return fields
+
+
+_REPORTER = {
+    "username": "Stock Market Reporter",
+    "avatar_url": "https://i.imgur.com/v0e4vXw.png",
+}
+
+
+def build_report_embeds(embed_fields, title, footer_text):
+    """
+    필드 목록 -> Discord 제한에 맞게 나눈 리포트 임베드 목록 (긴 필드 값은 이어지는 필드로 분할)
+    """
+    return pack_fields(
+        embed_fields, title=title, footer=footer_text,
+        color=5814783, timestamp=datetime.utcnow().isoformat()
+    )
+
+
+def send_embeds(webhook_url, embeds, deliver=None):
+    """
+    임베드 목록을 하나의 알림으로 전달 (전송 시 가장 적은 수의 메시지로 나뉨)
+
+    deliver(webhook_url, payload, kind) performs the actual delivery: the plugin passes the
+    outbox enqueue function, the standalone CLI defaults to an immediate rate-limit aware send.
+
+    Returns:
+        bool: 전달 성공 여부
+    """
+    if not webhook_url or "discord.com/api/webhooks/" not in webhook_url:
+        logger.error("[Error] Discord webhook URL is invalid. Check DISCORD_WEBHOOK_URL.")
+        return False
+
+    if not embeds:
+        logger.info("[Info] No data to send to Discord.")
+        return False
+
+    try:
+        # 메시지 제한에 맞춘 분할(과 묶음 전송)은 deliver 쪽에서 처리
+        data = dict(_REPORTER, embeds=embeds)
+        if (deliver or send_now)(webhook_url, data, 'trend'):
+            logger.info(f"\\n🚀 Handed report ({len(embeds)} embeds) to Discord delivery.")
+            return True
+        logger.error(f"[Error] Discord delivery failed. ({len(embeds)} embeds)")
+    except Exception as e:
+        logger.error(f"[Error] in send_embeds function: {e}")
+        traceback.print_exc()
+    return False
+
+
+def send_to_discord(webhook_url, embed_fields, title, footer_text, deliver=None):
+    """
+    Send formatted message (Embed) to Discord webhook.
+    """
+    if not embed_fields:
+        logger.info("[Info] No data to send to Discord.")
+        return
+    send_embeds(webhook_url, build_report_embeds(embed_fields, title, footer_text), deliver=deliver)
+
+
+def run_trend_report(market='ALL', top_n=30, send_discord=False, webhook_url='', show_market_column=True,
+                     send_insight=True, send_1day=True, send_1week=True, send_1month=True,
+                     send_streak=True, streak_lookback=60, streak_min_days=3, deliver=None):
+    """
+    매매 동향 리포트 생성 (필요 시 Discord 전송)
+
+    Args:
+        market (str): KOSPI, KOSDAQ, ALL
+        top_n (int): 상위 종목 수
+        send_discord (bool): Discord 전송 여부
+        webhook_url (str): Discord 웹훅 URL
+        show_market_column (bool): 시장 구분 열 표시
+        send_insight/send_1day/send_1week/send_1month/send_streak (bool): 항목별 포함 여부
+        streak_lookback (int): 연속 기록 조회 거래일 수
+        streak_min_days (int): 연속 순매수 최소 일수
+        deliver (callable): Discord 전달 함수 (webhook_url, payload, kind) - 기본은 즉시 전송
+
+    Returns:
+        dict: {'date', 'insights', 'periods_data', ('streaks')} (실패 시 None)
+    """
+    report_embeds = []
+    try:
+        logger.info("="*60)
+        logger.info(f"📈 Analyzing {market} market trends...")
+        
+        # 1. Calculate reference dates (common) from the cached trading calendar
+        calendar = get_calendar()
+        # 장중에는 당일 수급이 잠정치이므로 확정된 마지막 거래일 기준
+        end_date_str = calendar.last_closed_day()
+        end_date_obj = datetime.strptime(end_date_str, "%Y%m%d")
+        
+        day_ago = calendar.nearest_business_day(end_date_obj - timedelta(days=1))
+        week_ago = calendar.nearest_business_day(end_date_obj - timedelta(days=7))
+        month_ago = calendar.nearest_business_day(end_date_obj - timedelta(days=30))
+        
+        footer_date_str = end_date_obj.strftime('%Y-%m-%d')
+        logger.info(f" (Data reference date: {end_date_obj.strftime('%Y-%m-%d')})")
+        
+        # Create KOSPI/KOSDAQ/KONEX ticker map (using Full Name)
+        logger.info(" (Creating KOSPI/KOSDAQ/KONEX market classification map...)")
+        try:
+            ticker_master = get_ticker_master()
+            ticker_master.refresh(end_date_str)
+            market_map_df = ticker_master.market_map()
+            counts = market_map_df['시장구분'].value_counts()
+            logger.info(f" (Market map created: KOSPI {counts.get('KOSPI', 0)}, KOSDAQ {counts.get('KOSDAQ', 0)}, KONEX {counts.get('KONEX', 0)})")
+        except Exception as e:
+            logger.error(f"[Error] Failed to create market classification map: {e}. Proceeding without market classification.")
+            market_map_df = pd.DataFrame(columns=['시장구분']) # Create empty map
+        logger.info("="*60)
+
+        results = {
+            'date': end_date_obj.strftime('%Y-%m-%d'),
+            'insights': [],
+            'periods_data': {}
+        }
+
+        # Aggregate every requested period from the local daily store in one pass
+        period_starts = [day_ago, week_ago, month_ago]
+        period_frames = load_period_frames(market, end_date_str, period_starts)
+
+        # 2. Continuous return top performers insight
+        if send_insight:
+            ror_insight_field = get_consecutive_ror_insight(
+                market,
+                end_date_str, day_ago, week_ago, month_ago,
+                top_n,
+                market_map_df,
+                show_market_column,
+                period_frames=period_frames
+            )
+            if ror_insight_field:
+                insight_title = f"📈 {market} Top Performers (Top {top_n})"
+                insight_footer = f"pykrx analysis bot | Data reference: {footer_date_str}"
+                
+                if send_discord:
+                    report_embeds += build_report_embeds([ror_insight_field], insight_title, insight_footer)
+                    
+                results['insights'].append({
+                    'title': insight_title,
+                    'data': ror_insight_field
+                })
+
+        # 2-1. Multi-day streaks from the stored daily history
+        if send_streak:
+            streaks = get_streak_insight(
+                market, end_date_str, top_n,
+                lookback_days=streak_lookback,
+                min_days=streak_min_days,
+                show_market_column=show_market_column
+            )
+            if streaks:
+                results['streaks'] = streaks
+                if send_discord:
+                    report_embeds += build_report_embeds(
+                        format_streak_for_discord(streaks, top_n),
+                        f"🔥 {market} Net Buying Streaks",
+                        f"pykrx analysis bot | Data reference: {footer_date_str}"
+                    )
+
+        # 2-2. Sector rotation (web only; aggregated incrementally in the sector store)
+        sectors = get_sector_rotation(
+            market, end_date_str, {"1-day": day_ago, "1-week": week_ago, "1-month": month_ago}
+        )
+        if sectors:
+            results['sectors'] = sectors
+
+        # 3. Periodic net buy reports
+        
+        periods_to_run = {}
+        if send_1day: periods_to_run["1-day"] = day_ago
+        if send_1week: periods_to_run["1-week"] = week_ago
+        if send_1month: periods_to_run["1-month"] = month_ago
+
+        for period_label, start_date_str in periods_to_run.items():
+            
+            logger.info(f"\\n📅 {period_label} ({start_date_str} ~ {end_date_str}) net buy data retrieval...")
+            logger.info("-"*60)
+            
+            # (B-1) Data retrieval (Top N)
+            inst_df_full, fgn_df_full = get_top_netbuy_by_period(
+                market, start_date_str, end_date_str, top_n,
+                market_map_df, period_frame=period_frames[start_date_str]
+            )
+            
+            # Format for web display
+            inst_data = format_data_for_web(
+                inst_df_full, "기관합계", rank_start=1, show_market_column=show_market_column
+            )
+            fgn_data = format_data_for_web(
+                fgn_df_full, "외국인", rank_start=1, show_market_column=show_market_column
+            )
+            
+            results['periods_data'][period_label] = {
+                'institutional': inst_data,
+                'foreign': fgn_data
+            }
+            
+            if not send_discord:
+                continue
+                
+            # Format for Discord (each table split on row boundaries to fit the field limit)
+            period_embed_fields = (
+                format_table_fields(inst_df_full, "기관합계", f"💎 Institution ({period_label})", top_n, show_market_column)
+                + format_table_fields(fgn_df_full, "외국인", f"🌍 Foreign ({period_label})", top_n, show_market_column)
+            )
+            
+            period_title = f"📊 {market} {period_label} Net Buy Report"
+            period_footer = f"pykrx analysis bot | Period: {start_date_str} ~ {end_date_str}"
+            report_embeds += build_report_embeds(period_embed_fields, period_title, period_footer)
+
+        # (B-4) Send the whole report in as few messages as the Discord limits allow
+        if send_discord:
+            send_embeds(webhook_url, report_embeds, deliver=deliver)
+
+        logger.info("\\n" + "="*60)
+        logger.info("✅ All tasks completed.")
+
+        return results
+
+    except Exception as e:
+        logger.error(f"[Fatal Error] Critical error in analysis: {e}")
+        traceback.print_exc()
+        try:
+            error_title = "🚨 Script execution error"
+            error_footer = f"Time: {datetime.now().isoformat()}"
+            error_field = [{"name": "Error details", "value": f"```\n{e}\n```", "inline": False}]
+            # Deliver whatever was already built together with the error report
+            send_embeds(webhook_url, report_embeds + build_report_embeds(error_field, error_title, error_footer),
+                        deliver=deliver)
+        except:
+            pass
+        return None